@@ -4,12 +4,13 @@ import streamlit as st
 
 from lib.ui import hero_portada, inject_base_style, sidebar_title_and_nav
 from lib.tournament import (
-    DATA_DIR, load_config, list_round_files, is_published, round_file,
-    last_modified, planned_rounds, format_with_cfg,
+    DATA_DIR, load_config, list_round_files, is_published,
+    round_last_modified, planned_rounds, format_with_cfg,
 )
 
 # 👇 NUEVO: helpers de auth (modo profesor/alumno)
-from lib.ui2 import login_widget, is_teacher
+from lib.ui2 import login_widget, is_teacher, auto_refresh
+from lib.data_watcher import ensure_data_watcher
 
 st.set_page_config(page_title="Inicio", page_icon="♟️", layout="wide", initial_sidebar_state="expanded")
 inject_base_style()
@@ -33,6 +34,8 @@ sidebar_title_and_nav(extras=True, items=nav_items)
 
 # -------- Config y contexto --------
 cfg = load_config()
+auto_refresh(cfg, key="inicio")  # relanza solo si cambia la versión del torneo
+ensure_data_watcher(cfg)         # vigilante de data/ (si config lo activa)
 titulo  = cfg.get("titulo", "Ajedrez en los recreos")
 nivel   = cfg.get("nivel", "Todos")
 anio    = cfg.get("anio", "")
@@ -57,7 +60,7 @@ def _last_mod_text():
     target = ronda_actual if ronda_actual is not None else (round_nums[-1] if round_nums else None)
     if target is None:
         return "—"
-    return last_modified(round_file(target))
+    return round_last_modified(target)
 
 last_mod = _last_mod_text()
 
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de arranque en frío: tiempo de imports de app.py y de cada página.
+
+Para cada script se extraen (AST) sus imports de nivel superior y se ejecutan en
+un proceso Python nuevo, sin ejecutar el resto de la página (no hace falta servidor
+de Streamlit). Se repite N veces y se da la mediana, junto con qué dependencias
+pesadas quedaron cargadas (reportlab, fpdf, altair, networkx...).
+
+Uso:
+  python chequeos/bench_import.py
+  python chequeos/bench_import.py --repeat 7 pages/20_Clasificacion.py
+"""
+
+import argparse
+import ast
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+HEAVY = ["reportlab", "fpdf", "altair", "networkx", "numpy", "pandas", "streamlit"]
+
+# Se ejecuta en el proceso hijo: cada import por separado (uno que falte no corta el resto)
+_CHILD = r"""
+import json, sys, time
+sys.path.insert(0, {root!r})
+stmts = {stmts!r}
+errors = []
+t0 = time.perf_counter()
+for s in stmts:
+    try:
+        exec(s, {{}})
+    except Exception as e:
+        errors.append(f"{{s.splitlines()[0]}} -> {{type(e).__name__}}: {{e}}")
+dt = time.perf_counter() - t0
+heavy = {heavy!r}
+print(json.dumps({{"t": dt, "loaded": [m for m in heavy if m in sys.modules], "errors": errors}}))
+"""
+
+
+def top_level_imports(path: str) -> list:
+    """Imports a nivel de módulo (también dentro de try/if/with de primer nivel)."""
+    with open(path, encoding="utf-8") as f:
+        src = f.read()
+    tree = ast.parse(src)
+    out = []
+
+    def visit(nodes):
+        for n in nodes:
+            if isinstance(n, (ast.Import, ast.ImportFrom)):
+                if isinstance(n, ast.ImportFrom) and n.module == "__future__":
+                    continue
+                out.append(ast.get_source_segment(src, n))
+            elif isinstance(n, (ast.Try, ast.If, ast.With)):
+                visit(getattr(n, "body", []))
+                for h in getattr(n, "handlers", []):
+                    visit(h.body)
+                visit(getattr(n, "orelse", []))
+                visit(getattr(n, "finalbody", []))
+
+    visit(tree.body)
+    return out
+
+
+def measure(path: str, repeat: int) -> dict:
+    code = _CHILD.format(root=ROOT, stmts=top_level_imports(path), heavy=HEAVY)
+    times, last = [], {}
+    for _ in range(repeat):
+        res = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+        try:
+            last = json.loads(res.stdout.strip().splitlines()[-1])
+        except Exception:
+            last = {"t": float("nan"), "loaded": [], "errors": [res.stderr.strip()[-300:]]}
+        times.append(last["t"])
+    return {"median": statistics.median(times), "min": min(times), "loaded": last.get("loaded", []),
+            "errors": last.get("errors", [])}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Tiempo de imports en frío de app.py y las páginas")
+    ap.add_argument("scripts", nargs="*", help="scripts a medir (por defecto app.py y pages/*.py)")
+    ap.add_argument("--repeat", type=int, default=5, help="procesos por script (se da la mediana)")
+    args = ap.parse_args()
+
+    scripts = args.scripts or (["app.py"] + sorted(glob.glob(os.path.join("pages", "*.py"), root_dir=ROOT)))
+    print(f"{'script':32} {'mediana':>9} {'mín':>9}  cargados")
+    print("-" * 90)
+    for rel in scripts:
+        r = measure(os.path.join(ROOT, rel), max(1, args.repeat))
+        print(f"{rel:32} {r['median']*1000:8.0f}ms {r['min']*1000:8.0f}ms  {', '.join(r['loaded']) or '-'}")
+        for e in r["errors"]:
+            print(f"{'':32}   ! {e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
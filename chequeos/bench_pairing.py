@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de los emparejadores suizos (heurístico vs peso máximo).
+
+Atajo sobre lib.simulator (sin tocar data/): los jugadores sintéticos, los
+resultados y las métricas de calidad son los del simulador. Por motor muestra:
+- tiempo máximo y total de emparejamiento por ronda
+- rivales repetidos, suma de diferencias de puntos entre rivales
+- violaciones de color (tercer color igual seguido), BYE repetidos
+
+Uso:
+  python chequeos/bench_pairing.py --players 1000 --rounds 7
+  python chequeos/bench_pairing.py --players 40 200 1000 --rounds 7 --limit 1.0
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from lib.simulator import simulate  # noqa: E402
+from lib.tournament import PAIRING_ENGINES  # noqa: E402
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark de emparejadores suizos")
+    ap.add_argument("--players", type=int, nargs="+", default=[40, 200, 1000])
+    ap.add_argument("--rounds", type=int, default=7)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--engines", nargs="+", default=["greedy", "mwm"], choices=list(PAIRING_ENGINES))
+    ap.add_argument("--limit", type=float, default=1.0, help="Segundos máximos por ronda para 'mwm' (0 = sin límite)")
+    args = ap.parse_args()
+
+    # Calentar import de networkx para no contarlo en la primera ronda
+    simulate(4, rounds=1, engine="mwm", seed=args.seed)
+
+    print(f"{'motor':<8}{'jug.':>6}{'máx s':>9}{'total s':>9}{'repet.':>8}{'Δpuntos':>9}{'color':>7}{'BYE rep':>8}")
+    failed = False
+    for n in args.players:
+        for engine in args.engines:
+            s = simulate(n, rounds=args.rounds, engine=engine, seed=args.seed)["summary"]
+            print(f"{engine:<8}{n:>6}{s['t_pair_max_s']:>9.3f}{s['t_pair_total_s']:>9.3f}{s['rematches']:>8}"
+                  f"{s['score_diff']:>9.1f}{s['color_violations']:>7}{s['repeat_bye']:>8}")
+            if engine == "mwm" and args.limit and s["t_pair_max_s"] > args.limit:
+                failed = True
+    if failed:
+        print(f"[!] 'mwm' supera {args.limit:.2f}s en alguna ronda")
+        return 1
+    print("[OK] Benchmark completado")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
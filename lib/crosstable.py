@@ -0,0 +1,260 @@
+# lib/crosstable.py
+# -*- coding: utf-8 -*-
+"""
+Motor del cuadro del torneo (doble entrada).
+
+La matriz es de enteros (int8, N×N) indexada por el orden estable de jugadores;
+los textos ("1", "½", "0", "+", "-") solo se generan al pintar (to_frame).
+- Construcción con indexado "fancy" de NumPy a partir de las partidas.
+- Los reencuentros (misma pareja más de una vez) van a `extras`: la celda
+  guarda el primero y el resto se añade al pintar como "1 / ½".
+- Si cambia una ronda, solo se recalculan las parejas con partidas distintas
+  (set_round).
+- by_round(): vista dispersa "rivales por ronda" (N×R) para torneos grandes.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from lib.results import decode_results
+from lib.tournament import read_round, round_sig
+
+# Códigos de celda
+EMPTY, LOSS, DRAW, WIN, FF_LOSS, FF_WIN = 0, 1, 2, 3, 4, 5
+CODE_LABELS = np.array(["", "0", "½", "1", "-", "+"], dtype=object)
+
+_CT_LOCK = threading.Lock()
+_CT_CACHE: Dict[Tuple[str, Tuple[int, ...]], "CrossTable"] = {}
+_CT_MAX = 4  # conjuntos de rondas vivos por conjunto de jugadores
+
+# ============================================================
+# Partidas -> códigos
+# ============================================================
+def _round_games(dfp: Optional[pd.DataFrame], round_no: int) -> pd.DataFrame:
+    """Partidas con resultado de una ronda: round, white_id, black_id, wc, bc (sin BYE ni vacías)."""
+    cols = ["round", "white_id", "black_id", "wc", "bc"]
+    if dfp is None or dfp.empty or "resultado" not in dfp.columns:
+        return pd.DataFrame(columns=cols)
+    wid = dfp.get("blancas_id", pd.Series("", index=dfp.index)).fillna("").astype(str).str.strip()
+    bid = dfp.get("negras_id", pd.Series("", index=dfp.index)).fillna("").astype(str).str.strip()
+    dec = decode_results(dfp["resultado"], is_bye=bid.str.upper().eq("BYE"))
+    ok = (dec["decided"] & ~dec["is_bye"] & wid.ne("") & bid.ne("")).to_numpy()
+    w_pts = dec["white_pts"].to_numpy()[ok]
+    b_pts = dec["black_pts"].to_numpy()[ok]
+    ff = dec["is_forfeit"].to_numpy()[ok]
+    # 1 -> WIN, 0.5 -> DRAW, 0 -> LOSS; incomparecencia -> FF_*
+    wc = np.where(ff, np.where(w_pts > 0, FF_WIN, FF_LOSS), (w_pts * 2).astype(np.int8) + 1).astype(np.int8)
+    bc = np.where(ff, np.where(b_pts > 0, FF_WIN, FF_LOSS), (b_pts * 2).astype(np.int8) + 1).astype(np.int8)
+    return pd.DataFrame({
+        "round": int(round_no),
+        "white_id": wid.to_numpy()[ok],
+        "black_id": bid.to_numpy()[ok],
+        "wc": wc,
+        "bc": bc,
+    })[cols]
+
+# ============================================================
+# Matriz
+# ============================================================
+class CrossTable:
+    """Cuadro de un conjunto fijo de jugadores (ids) sobre un conjunto de rondas."""
+
+    def __init__(self, ids: Sequence[str]):
+        self.ids: List[str] = [str(x) for x in ids]
+        self.index: Dict[str, int] = {pid: k for k, pid in enumerate(self.ids)}
+        n = len(self.ids)
+        self.codes = np.zeros((n, n), dtype=np.int8)
+        self.extras: Dict[Tuple[int, int], List[int]] = {}  # (fila, col) -> códigos de reencuentros
+        self.round_sigs: Dict[int, object] = {}
+        # partidas (arrays paralelos, ordenadas por ronda)
+        self.g_round = np.zeros(0, dtype=np.int32)
+        self.g_w = np.zeros(0, dtype=np.int32)
+        self.g_b = np.zeros(0, dtype=np.int32)
+        self.g_wc = np.zeros(0, dtype=np.int8)
+        self.g_bc = np.zeros(0, dtype=np.int8)
+
+    # ---------- partidas ----------
+    def _encode(self, games: pd.DataFrame) -> Tuple[np.ndarray, ...]:
+        """Filtra partidas de jugadores conocidos y las pasa a índices."""
+        if games is None or games.empty:
+            z = np.zeros(0, dtype=np.int32)
+            return z, z, z, z.astype(np.int8), z.astype(np.int8)
+        w = games["white_id"].map(self.index)
+        b = games["black_id"].map(self.index)
+        ok = (w.notna() & b.notna()).to_numpy()
+        return (
+            games["round"].to_numpy(dtype=np.int32)[ok],
+            w.to_numpy()[ok].astype(np.int32),
+            b.to_numpy()[ok].astype(np.int32),
+            games["wc"].to_numpy(dtype=np.int8)[ok],
+            games["bc"].to_numpy(dtype=np.int8)[ok],
+        )
+
+    def _pair_keys(self, w: np.ndarray, b: np.ndarray) -> np.ndarray:
+        n = max(1, len(self.ids))
+        lo, hi = np.minimum(w, b), np.maximum(w, b)
+        return lo.astype(np.int64) * n + hi
+
+    def _apply(self, sel: np.ndarray) -> None:
+        """(Re)aplica las partidas `sel` (máscara): primera de cada pareja en la celda, resto a extras."""
+        idx = np.flatnonzero(sel)
+        if idx.size == 0:
+            return
+        order = idx[np.lexsort((idx, self.g_round[idx]))]  # por ronda (estable)
+        w, b = self.g_w[order], self.g_b[order]
+        wc, bc = self.g_wc[order], self.g_bc[order]
+        _, first = np.unique(self._pair_keys(w, b), return_index=True)
+        self.codes[w[first], b[first]] = wc[first]
+        self.codes[b[first], w[first]] = bc[first]
+        rest = np.setdiff1d(np.arange(order.size), first)
+        for k in rest:  # solo reencuentros (pocos)
+            self.extras.setdefault((int(w[k]), int(b[k])), []).append(int(wc[k]))
+            self.extras.setdefault((int(b[k]), int(w[k])), []).append(int(bc[k]))
+
+    def _reset_pairs(self, keys: np.ndarray) -> np.ndarray:
+        """Vacía las celdas de las parejas `keys` y devuelve la máscara de sus partidas."""
+        n = max(1, len(self.ids))
+        lo, hi = keys // n, keys % n
+        self.codes[lo, hi] = EMPTY
+        self.codes[hi, lo] = EMPTY
+        if self.extras:
+            ks = set(int(k) for k in keys)
+            for cell in [c for c in self.extras if min(c) * n + max(c) in ks]:
+                del self.extras[cell]
+        return np.isin(self._pair_keys(self.g_w, self.g_b), keys)
+
+    def copy(self) -> "CrossTable":
+        """Copia independiente (matriz, reencuentros, partidas y firmas)."""
+        ct = CrossTable.__new__(CrossTable)
+        ct.ids = list(self.ids)
+        ct.index = dict(self.index)
+        ct.codes = self.codes.copy()
+        ct.extras = {cell: list(more) for cell, more in self.extras.items()}
+        ct.round_sigs = dict(self.round_sigs)
+        for a in ("g_round", "g_w", "g_b", "g_wc", "g_bc"):
+            setattr(ct, a, getattr(self, a).copy())
+        return ct
+
+    def rebuild(self) -> None:
+        self.codes[:] = EMPTY
+        self.extras = {}
+        self._apply(np.ones(self.g_round.size, dtype=bool))
+
+    # ---------- actualización ----------
+    def set_round(self, round_no: int, games: pd.DataFrame, sig=None) -> int:
+        """
+        Sustituye las partidas de la ronda y recalcula solo las parejas afectadas.
+        Devuelve el número de parejas recalculadas.
+        """
+        r, w, b, wc, bc = self._encode(games)
+        old = self.g_round == int(round_no)
+        # parejas cuyo contenido cambia (diferencia simétrica de (w, b, wc, bc))
+        old_rows = set(zip(self.g_w[old].tolist(), self.g_b[old].tolist(), self.g_wc[old].tolist(), self.g_bc[old].tolist()))
+        new_rows = set(zip(w.tolist(), b.tolist(), wc.tolist(), bc.tolist()))
+        changed = old_rows ^ new_rows
+        keep = ~old
+        self.g_round = np.concatenate([self.g_round[keep], np.full(w.size, int(round_no), dtype=np.int32)])
+        self.g_w = np.concatenate([self.g_w[keep], w])
+        self.g_b = np.concatenate([self.g_b[keep], b])
+        self.g_wc = np.concatenate([self.g_wc[keep], wc])
+        self.g_bc = np.concatenate([self.g_bc[keep], bc])
+        self.round_sigs[int(round_no)] = sig
+        if not changed:
+            return 0
+        cw = np.array([c[0] for c in changed], dtype=np.int32)
+        cb = np.array([c[1] for c in changed], dtype=np.int32)
+        keys = np.unique(self._pair_keys(cw, cb))
+        self._apply(self._reset_pairs(keys))
+        return int(keys.size)
+
+    def drop_round(self, round_no: int) -> None:
+        self.set_round(round_no, pd.DataFrame(columns=["round", "white_id", "black_id", "wc", "bc"]))
+        self.round_sigs.pop(int(round_no), None)
+
+    # ---------- pintado ----------
+    def labels(self, order: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Matriz de textos (object) en el orden dado de índices; diagonal '—'."""
+        order = np.arange(len(self.ids)) if order is None else np.asarray(order, dtype=np.int64)
+        out = CODE_LABELS[self.codes[np.ix_(order, order)]]
+        pos = {int(o): k for k, o in enumerate(order)}
+        for (i, j), more in self.extras.items():
+            if i in pos and j in pos:
+                out[pos[i], pos[j]] = " / ".join([out[pos[i], pos[j]]] + [CODE_LABELS[c] for c in more])
+        np.fill_diagonal(out, "—")
+        return out
+
+    def by_round(self, order_ids: Sequence[str], labels: Sequence, rounds: Sequence[int]) -> pd.DataFrame:
+        """
+        Vista dispersa (rivales por ronda): una fila por jugador y una columna por ronda,
+        p. ej. "12b1" = contra el 12, con blancas, gana. Solo N×R celdas, sin matriz N×N.
+        """
+        rows = np.asarray([self.index[str(pid)] for pid in order_ids], dtype=np.int64)
+        rounds = [int(r) for r in rounds]
+        row_of = np.full(len(self.ids), -1, dtype=np.int64)
+        row_of[rows] = np.arange(rows.size)
+        lab = np.asarray([str(x) for x in labels], dtype=object)
+        col_of = pd.Series(np.arange(len(rounds)), index=rounds)
+        rc = pd.Series(self.g_round).map(col_of).fillna(-1).to_numpy(dtype=np.int64)
+        out = np.full((rows.size, len(rounds)), "", dtype=object)
+        for me, opp, code, tag in ((self.g_w, self.g_b, self.g_wc, "b"), (self.g_b, self.g_w, self.g_bc, "n")):
+            ok = (rc >= 0) & (row_of[me] >= 0) & (row_of[opp] >= 0)
+            if not ok.any():
+                continue
+            txt = pd.Series(lab[row_of[opp[ok]]]) + tag + pd.Series(CODE_LABELS[code[ok]])
+            out[row_of[me[ok]], rc[ok]] = txt.to_numpy()
+        return pd.DataFrame(out, index=list(labels), columns=[f"R{r}" for r in rounds])
+
+    def to_frame(self, order_ids: Sequence[str], labels: Sequence) -> pd.DataFrame:
+        """DataFrame para pantalla/PDF: filas y columnas en `order_ids`, rotuladas con `labels`."""
+        order = [self.index[str(pid)] for pid in order_ids]
+        return pd.DataFrame(self.labels(order), index=list(labels), columns=list(labels))
+
+# ============================================================
+# Cuadro cacheado por rondas
+# ============================================================
+def crosstable_for(ids: Sequence[str], rounds: Sequence[int]) -> CrossTable:
+    """
+    Cuadro de los jugadores `ids` tras `rounds`. Se cachea por (jugadores, rondas):
+    solo se relee/recalcula la ronda cuya firma haya cambiado, y un conjunto de rondas
+    nuevo parte de otro ya calculado. Las entradas de la caché no se modifican nunca:
+    el candado solo protege buscar/guardar y el recálculo se hace sobre una copia.
+    Devuelve una copia propia del llamador.
+    """
+    ids = tuple(str(x) for x in ids)
+    rounds = tuple(sorted(int(r) for r in (rounds or [])))
+    key = (ids, rounds)
+    with _CT_LOCK:
+        base = _CT_CACHE.get(key)
+        if base is None:
+            same = [ct for k, ct in _CT_CACHE.items() if k[0] == ids]
+            base = same[-1] if same else None
+
+    sigs = {r: round_sig(r) for r in rounds}
+    def fresh(ct: CrossTable, r: int) -> bool:
+        return r in ct.round_sigs and sigs[r] is not None and ct.round_sigs[r] == sigs[r]
+
+    if base is not None and set(base.round_sigs) == set(rounds) and all(fresh(base, r) for r in rounds):
+        return base.copy()
+
+    ct = base.copy() if base is not None else CrossTable(ids)
+    for r in [r for r in ct.round_sigs if r not in rounds]:
+        ct.drop_round(r)
+    for r in rounds:
+        if not fresh(ct, r):
+            ct.set_round(r, _round_games(read_round(r), r), sigs[r])
+
+    with _CT_LOCK:
+        for k in [k for k in _CT_CACHE if k[0] != ids or k == key]:
+            del _CT_CACHE[k]  # un único conjunto de jugadores vivo
+        while len(_CT_CACHE) >= _CT_MAX:
+            del _CT_CACHE[next(iter(_CT_CACHE))]
+        _CT_CACHE[key] = ct  # al final: el más reciente
+    return ct.copy()
+
+def clear_crosstable_cache() -> None:
+    with _CT_LOCK:
+        _CT_CACHE.clear()
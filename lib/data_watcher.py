@@ -0,0 +1,142 @@
+# lib/data_watcher.py
+# -*- coding: utf-8 -*-
+"""
+Vigilante opcional de data/ (config.json -> "data_watcher": true).
+
+Un hilo de fondo (uno por proceso) repasa DATA_DIR cada "data_watcher_seconds"
+(2 s por defecto) y, si cambia a mano o por una subida alguno de
+
+  pairings_R*.csv, published_R*.flag, meta.json, jugadores.csv
+
+sube la versión del estado del torneo (bump_state_version) marcando las rondas
+afectadas, con lo que todas las cachés derivadas se invalidan, y lo anota en
+admin_log.csv (acción "invalidar_cache", actor "vigilante").
+
+No se vigilan state_version.json, los .tmp ni data/cache/. Los cambios hechos por
+la propia aplicación ya suben la versión al escribir: si el fichero es anterior a
+la última subida de versión, se ignora (no hay doble invalidación).
+
+Solo biblioteca estándar: sondeo con os.scandir (mtime, tamaño), sin inotify.
+"""
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from lib.tournament import DATA_DIR, STATE_VERSION_PATH, add_log, bump_state_version, file_sig
+
+WATCH_SECONDS_DEFAULT = 2.0
+WATCH_PATTERN = re.compile(r"^(pairings_R(\d+)\.csv|published_R(\d+)\.flag|meta\.json|jugadores\.csv)$")
+
+_WATCH_LOCK = threading.Lock()
+_WATCHER: Dict[str, object] = {"thread": None, "stop": None, "seconds": WATCH_SECONDS_DEFAULT}
+_EVENTS: deque = deque(maxlen=50)  # últimas invalidaciones (para Administración)
+
+# ============================================================
+# Sondeo
+# ============================================================
+def scan_data_dir(data_dir: Optional[str] = None) -> Dict[str, Tuple[int, int]]:
+    """Fichero vigilado -> (mtime_ns, tamaño)."""
+    out: Dict[str, Tuple[int, int]] = {}
+    try:
+        with os.scandir(data_dir or DATA_DIR) as it:
+            for e in it:
+                if not WATCH_PATTERN.match(e.name):
+                    continue
+                try:
+                    st_ = e.stat()
+                    out[e.name] = (st_.st_mtime_ns, st_.st_size)
+                except OSError:
+                    pass
+    except OSError:
+        pass
+    return out
+
+def diff_scans(before: Dict[str, tuple], after: Dict[str, tuple]) -> Dict[str, str]:
+    """Fichero -> 'nuevo' / 'modificado' / 'borrado'."""
+    out = {n: "borrado" for n in before if n not in after}
+    for n, sig in after.items():
+        if n not in before:
+            out[n] = "nuevo"
+        elif before[n] != sig:
+            out[n] = "modificado"
+    return out
+
+def _round_of(name: str) -> Optional[int]:
+    m = WATCH_PATTERN.match(name)
+    if not m:
+        return None
+    r = m.group(2) or m.group(3)
+    return int(r) if r else None
+
+def apply_changes(changes: Dict[str, str], after: Dict[str, tuple]) -> Optional[int]:
+    """
+    Sube la versión por los cambios externos de `changes` (los anteriores a la última
+    subida de versión ya están contados). Devuelve la nueva versión o None si no hacía falta.
+    """
+    last = (file_sig(STATE_VERSION_PATH) or (0, 0))[0]
+    external = {n: what for n, what in changes.items() if what == "borrado" or after[n][0] > last}
+    if not external:
+        return None
+    rounds = sorted({r for r in map(_round_of, external) if r is not None})
+    players = "jugadores.csv" in external
+    version = bump_state_version(rounds, players=players)
+    msg = ", ".join(f"{n} {what}" for n, what in sorted(external.items()))
+    _EVENTS.append({"version": version, "ficheros": msg})
+    add_log("invalidar_cache", rounds[0] if len(rounds) == 1 else None, "vigilante", f"v{version}: {msg}")
+    return version
+
+def _run(stop: threading.Event) -> None:
+    before = scan_data_dir()
+    while not stop.wait(float(_WATCHER["seconds"])):
+        try:
+            after = scan_data_dir()
+            changes = diff_scans(before, after)
+            if changes:
+                apply_changes(changes, after)
+            before = after
+        except Exception:
+            pass
+
+# ============================================================
+# Arranque y estado
+# ============================================================
+def ensure_data_watcher(cfg: Optional[dict] = None) -> bool:
+    """
+    Arranca (o para) el vigilante según config.json. Idempotente: se puede llamar
+    en cada página. Devuelve True si queda en marcha.
+    """
+    cfg = cfg or {}
+    enabled = bool(cfg.get("data_watcher", False))
+    try:
+        seconds = max(0.5, float(cfg.get("data_watcher_seconds", WATCH_SECONDS_DEFAULT)))
+    except Exception:
+        seconds = WATCH_SECONDS_DEFAULT
+    with _WATCH_LOCK:
+        _WATCHER["seconds"] = seconds
+        th = _WATCHER["thread"]
+        alive = th is not None and th.is_alive()
+        if enabled and not alive:
+            stop = threading.Event()
+            th = threading.Thread(target=_run, args=(stop,), name="data-watcher", daemon=True)
+            _WATCHER["thread"], _WATCHER["stop"] = th, stop
+            th.start()
+            return True
+        if not enabled and alive:
+            _WATCHER["stop"].set()
+            _WATCHER["thread"] = None
+            return False
+        return alive
+
+def watcher_status() -> dict:
+    """En marcha, intervalo y últimas invalidaciones (más reciente primero)."""
+    with _WATCH_LOCK:
+        th = _WATCHER["thread"]
+        return {
+            "activo": bool(th is not None and th.is_alive()),
+            "segundos": _WATCHER["seconds"],
+            "eventos": list(reversed(_EVENTS)),
+        }
@@ -0,0 +1,169 @@
+# lib/export_cache.py
+# -*- coding: utf-8 -*-
+"""
+Caché en disco de exportaciones (PDF de rondas, clasificación y cuadro).
+
+Cada fichero se guarda en data/cache/exports/<clave>.pdf, donde la clave es un
+hash del contenido de la tabla de entrada, de las claves de config que afectan
+al aspecto (pdf_*, titulo, anio, nivel), del tamaño de papel y de los extras
+que pase quien llama (fecha de la ronda, con/sin resultados...).
+
+Si nada de eso cambia se sirve el fichero sin ejecutar reportlab. El tamaño
+total está acotado (config "export_cache_mb", 64 MB por defecto) y al superarlo
+se borran los ficheros usados hace más tiempo (LRU por mtime: cada acierto
+"toca" el fichero).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from lib.tournament import DATA_DIR, BASE_DIR
+
+EXPORT_CACHE_DIR = os.path.join(DATA_DIR, "cache", "exports")
+EXPORT_CACHE_MB_DEFAULT = 64
+# Subir si cambia el aspecto de los builders (invalida todo lo anterior)
+EXPORT_CACHE_VERSION = 3
+
+_CFG_KEYS = ("titulo", "anio", "nivel")
+_LOCK = threading.Lock()
+
+# ============================================================
+# Clave
+# ============================================================
+def _table_digest(h, df: Optional[pd.DataFrame]) -> None:
+    """Añade al hash columnas, índice y valores (como texto) de la tabla."""
+    if df is None:
+        h.update(b"<none>")
+        return
+    h.update(json.dumps([str(c) for c in df.columns], ensure_ascii=False).encode("utf-8"))
+    h.update(str(len(df)).encode())
+    if len(df):
+        vals = pd.util.hash_pandas_object(df.astype(str), index=True).to_numpy()
+        h.update(vals.tobytes())
+
+def _fonts_digest() -> str:
+    """Las TTF disponibles cambian el resultado (fallback a Times/Helvetica)."""
+    try:
+        return ",".join(sorted(os.listdir(os.path.join(BASE_DIR, "assets", "fonts"))))
+    except Exception:
+        return ""
+
+def source_sig(*paths: str) -> list:
+    """Firma (mtime_ns, tamaño) de ficheros que lee el builder por su cuenta (p. ej. jugadores.csv)."""
+    out = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+            out.append([int(st.st_mtime_ns), int(st.st_size)])
+        except Exception:
+            out.append(None)
+    return out
+
+def export_key(kind: str, table_df: Optional[pd.DataFrame], cfg: Optional[dict],
+               paper: str = "A4", extra: Optional[dict] = None) -> str:
+    """Clave estable para una exportación."""
+    cfg = cfg or {}
+    cfg_part = {k: cfg.get(k) for k in sorted(cfg) if str(k).startswith("pdf_") or k in _CFG_KEYS}
+    h = hashlib.sha256()
+    head = {
+        "v": EXPORT_CACHE_VERSION,
+        "kind": kind,
+        "paper": paper,
+        "cfg": cfg_part,
+        "extra": extra or {},
+        "fonts": _fonts_digest(),
+    }
+    h.update(json.dumps(head, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8"))
+    _table_digest(h, table_df)
+    return h.hexdigest()[:40]
+
+# ============================================================
+# Almacén
+# ============================================================
+def _path_for(key: str) -> str:
+    return os.path.join(EXPORT_CACHE_DIR, f"{key}.pdf")
+
+def _max_bytes(cfg: Optional[dict]) -> int:
+    try:
+        mb = float((cfg or {}).get("export_cache_mb", EXPORT_CACHE_MB_DEFAULT))
+    except Exception:
+        mb = EXPORT_CACHE_MB_DEFAULT
+    return max(0, int(mb * 1024 * 1024))
+
+def get_cached(key: str) -> Optional[bytes]:
+    """Bytes guardados para la clave (y marca el uso para el LRU) o None."""
+    path = _path_for(key)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except Exception:
+        return None
+    try:
+        os.utime(path, None)
+    except Exception:
+        pass
+    return data or None
+
+def put_cached(key: str, data: bytes, cfg: Optional[dict] = None) -> None:
+    """Guarda de forma atómica y aplica el límite de tamaño."""
+    if not data:
+        return
+    limit = _max_bytes(cfg)
+    if limit <= 0 or len(data) > limit:
+        return
+    try:
+        os.makedirs(EXPORT_CACHE_DIR, exist_ok=True)
+        path = _path_for(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except Exception:
+        return
+    _evict(limit)
+
+def _entries() -> Iterable[tuple]:
+    try:
+        with os.scandir(EXPORT_CACHE_DIR) as it:
+            for e in it:
+                if e.is_file() and e.name.endswith(".pdf"):
+                    st = e.stat()
+                    yield (st.st_mtime_ns, st.st_size, e.path)
+    except Exception:
+        return
+
+def _evict(limit: int) -> None:
+    """Borra los ficheros menos usados hasta quedar por debajo de `limit` bytes."""
+    with _LOCK:
+        entries = sorted(_entries())
+        total = sum(sz for _, sz, _ in entries)
+        for _, sz, path in entries:
+            if total <= limit:
+                break
+            try:
+                os.remove(path)
+                total -= sz
+            except Exception:
+                pass
+
+def clear_export_cache() -> int:
+    """Vacía la caché; devuelve el número de ficheros borrados."""
+    n = 0
+    with _LOCK:
+        for _, _, path in list(_entries()):
+            try:
+                os.remove(path)
+                n += 1
+            except Exception:
+                pass
+    return n
+
+def export_cache_stats() -> dict:
+    entries = list(_entries())
+    return {"files": len(entries), "bytes": sum(sz for _, sz, _ in entries), "dir": EXPORT_CACHE_DIR}
@@ -0,0 +1,167 @@
+# lib/export_jobs.py
+# -*- coding: utf-8 -*-
+"""
+Trabajos de exportación en segundo plano (PDF/CSV).
+
+Las páginas piden un PDF con request_export(...) y siguen pintando sus tablas:
+- si ya está en la caché de disco (lib/export_cache.py) se devuelve al momento;
+- si no, se encola en un ThreadPool acotado (config "export_workers", 2 por
+  defecto) y se devuelve el trabajo con su estado y progreso;
+- peticiones idénticas (misma clave) mientras hay una en curso comparten el
+  mismo trabajo, no se renderiza dos veces.
+
+En una ejecución posterior del script el trabajo ya está "listo" y sus bytes
+van directos al botón de descarga.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+from lib.export_cache import export_key, get_cached, put_cached
+
+EXPORT_WORKERS_DEFAULT = 2
+_MAX_FINISHED = 32  # trabajos terminados que se recuerdan (los bytes también quedan en disco)
+_ERROR_RETRY_S = 60  # un trabajo fallido no se relanza antes de este tiempo
+
+PENDIENTE, EN_CURSO, LISTO, ERROR = "pendiente", "en curso", "listo", "error"
+
+_LOCK = threading.Lock()
+_POOL: Optional[ThreadPoolExecutor] = None
+_POOL_SIZE = 0
+_JOBS: Dict[str, "ExportJob"] = {}
+_CURRENT = threading.local()
+
+
+class ExportJob:
+    """Estado de un trabajo (lo leen las páginas; lo escribe el hilo del pool)."""
+    __slots__ = ("key", "kind", "status", "progress", "data", "error", "created", "finished")
+
+    def __init__(self, key: str, kind: str):
+        self.key = key
+        self.kind = kind
+        self.status = PENDIENTE
+        self.progress = 0.0
+        self.data: Optional[bytes] = None
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.finished: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (LISTO, ERROR)
+
+    @property
+    def ok(self) -> bool:
+        return self.status == LISTO and bool(self.data)
+
+    def __repr__(self) -> str:
+        return f"ExportJob({self.kind!r}, {self.status!r}, {self.progress:.0%})"
+
+
+# ============================================================
+# Pool
+# ============================================================
+def _workers(cfg: Optional[dict]) -> int:
+    try:
+        return max(1, int((cfg or {}).get("export_workers", EXPORT_WORKERS_DEFAULT)))
+    except Exception:
+        return EXPORT_WORKERS_DEFAULT
+
+def _pool(cfg: Optional[dict]) -> ThreadPoolExecutor:
+    """Pool único del proceso (se crea la primera vez; el tamaño lo fija esa llamada)."""
+    global _POOL, _POOL_SIZE
+    if _POOL is None:
+        _POOL_SIZE = _workers(cfg)
+        _POOL = ThreadPoolExecutor(max_workers=_POOL_SIZE, thread_name_prefix="export")
+    return _POOL
+
+def export_progress(frac: float) -> None:
+    """Los builders pueden llamarla (0..1) para informar del avance del trabajo actual."""
+    job = getattr(_CURRENT, "job", None)
+    if job is not None:
+        try:
+            job.progress = min(0.99, max(job.progress, float(frac)))
+        except Exception:
+            pass
+
+def _run(job: ExportJob, build: Callable[[], Optional[bytes]], cfg: Optional[dict]) -> None:
+    _CURRENT.job = job
+    job.status = EN_CURSO
+    job.progress = 0.05
+    try:
+        data = build()
+        if isinstance(data, (bytes, bytearray)) and data:
+            job.data = bytes(data)
+            put_cached(job.key, job.data, cfg)
+            job.status = LISTO
+        else:
+            job.status = ERROR
+            job.error = "El generador no devolvió datos (¿falta reportlab/fpdf2?)."
+    except Exception as e:
+        job.status = ERROR
+        job.error = str(e)
+    finally:
+        job.progress = 1.0
+        job.finished = time.time()
+        _CURRENT.job = None
+        _prune()
+
+def _prune() -> None:
+    """Olvida los trabajos terminados más antiguos por encima de _MAX_FINISHED."""
+    with _LOCK:
+        finished = sorted((j for j in _JOBS.values() if j.done), key=lambda j: j.finished or 0)
+        for j in finished[:max(0, len(finished) - _MAX_FINISHED)]:
+            _JOBS.pop(j.key, None)
+
+# ============================================================
+# API
+# ============================================================
+def _reusable(job: Optional[ExportJob]) -> bool:
+    if job is None:
+        return False
+    return job.status != ERROR or (time.time() - (job.finished or 0)) < _ERROR_RETRY_S
+
+def request_export(kind: str, table_df: Optional[pd.DataFrame], cfg: Optional[dict],
+                   build: Callable[[], Optional[bytes]], paper: str = "A4",
+                   extra: Optional[dict] = None) -> ExportJob:
+    """
+    Devuelve el trabajo para esta exportación (misma clave que la caché de disco):
+    listo al instante si está en caché; si no, encolado o ya en curso.
+    Un trabajo con error se relanza pasado _ERROR_RETRY_S.
+    """
+    key = export_key(kind, table_df, cfg, paper=paper, extra=extra)
+    with _LOCK:
+        job = _JOBS.get(key)
+        if _reusable(job):
+            return job
+    data = get_cached(key)
+    with _LOCK:
+        job = _JOBS.get(key)
+        if _reusable(job):
+            return job
+        job = ExportJob(key, kind)
+        _JOBS[key] = job
+        if data is not None:
+            job.data, job.status, job.progress, job.finished = data, LISTO, 1.0, time.time()
+            return job
+        _pool(cfg).submit(_run, job, build, cfg)
+    return job
+
+def get_job(key: str) -> Optional[ExportJob]:
+    with _LOCK:
+        return _JOBS.get(key)
+
+def export_jobs_status() -> list[dict]:
+    """Resumen de los trabajos conocidos (para diagnóstico en Administración)."""
+    with _LOCK:
+        jobs = list(_JOBS.values())
+    return [
+        {"tipo": j.kind, "estado": j.status, "progreso": round(j.progress, 2),
+         "bytes": len(j.data or b""), "error": j.error or ""}
+        for j in sorted(jobs, key=lambda j: j.created)
+    ]
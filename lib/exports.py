@@ -0,0 +1,943 @@
+# lib/exports.py
+# -*- coding: utf-8 -*-
+"""
+Generadores de exportaciones (PDF/CSV) compartidos por las páginas y por el
+dossier del torneo de Administración:
+
+- build_round_pdf            → PDF de una ronda (con o sin resultados)
+- build_standings_pdf        → PDF de la clasificación (A4/A3)
+- build_crosstable_df_positions / build_crosstable_pdf → cuadro por posiciones
+- build_crosstable_sparse    → cuadro "rivales por ronda" (torneos grandes)
+- build_player_sheet_pdf     → ficha con el historial de un jugador
+- build_dossier_zip          → todo lo anterior en un ZIP, renderizado en paralelo
+
+Todos devuelven bytes o None (si falta reportlab/fpdf2), nunca lanzan.
+"""
+from __future__ import annotations
+
+import io
+import json
+import os
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from lib.tournament import (
+    DATA_DIR,
+    read_csv_safe,
+    read_round,
+    get_round_date,
+    format_date_es,
+    now_madrid,
+    standings_from_rounds,
+    add_log,
+)
+from lib.results import canonical_results, decode_results, points_label
+from lib.export_cache import export_key, get_cached, put_cached, source_sig
+from lib.export_jobs import export_progress
+from lib.crosstable import crosstable_for
+from lib.pdf_resources import pdf_styles, header_table_cmds
+
+from lib.lazy import reportlab_names
+
+
+def _use_reportlab() -> SimpleNamespace:
+    """
+    Carga perezosa de reportlab (solo al generar un PDF): devuelve sus nombres como
+    espacio de nombres (rl.A4, rl.Table, rl.colors...). Sin reportlab lanza ImportError:
+    los builders de clasificación/cuadro devuelven None y el de rondas usa fpdf2.
+    """
+    names = reportlab_names()
+    if not names:
+        raise ImportError("reportlab no está instalado")
+    return SimpleNamespace(**names)
+
+JUG_PATH = os.path.join(DATA_DIR, "jugadores.csv")
+
+# ============================================================
+# Utilidades
+# ============================================================
+def slugify(s: str) -> str:
+    s = re.sub(r"\s+", "_", str(s or "").strip())
+    s = re.sub(r"[^A-Za-z0-9_\-]+", "", s)
+    return s or "torneo"
+
+def prepare_round_tables(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    A partir del CSV de una ronda devuelve (safe_df, show_df):
+      safe_df: columnas básicas, ordenado por mesa, resultados canónicos (para CSV)
+      show_df: además 'resultado_mostrar' ('—' si vacío, badge en BYE) para pantalla/PDF
+    """
+    safe_df = df.copy()
+    if "seleccionar" in safe_df.columns:  # columna solo usada en admin
+        safe_df = safe_df.drop(columns=["seleccionar"])
+
+    # asegurar columnas básicas
+    for col in ["mesa", "blancas_id", "blancas_nombre", "negras_id", "negras_nombre", "resultado"]:
+        if col not in safe_df.columns:
+            safe_df[col] = ""
+
+    # ordenar por mesa (para vista y export)
+    try:
+        safe_df["mesa"] = pd.to_numeric(safe_df["mesa"], errors="coerce")
+    except Exception:
+        pass
+    safe_df = safe_df.sort_values(by=["mesa"], na_position="last")
+
+    # ---- BYE y resultado mostrado (badge en RESULTADO) ----
+    bye_mask = (
+        safe_df["blancas_id"].astype(str).str.upper().eq("BYE")
+        | safe_df["blancas_nombre"].astype(str).str.upper().eq("BYE")
+        | safe_df["negras_id"].astype(str).str.upper().eq("BYE")
+        | safe_df["negras_nombre"].astype(str).str.upper().eq("BYE")
+    )
+
+    show_df = safe_df.copy()
+    show_df["resultado_mostrar"] = canonical_results(show_df["resultado"])
+    show_df.loc[show_df["resultado_mostrar"] == "", "resultado_mostrar"] = "—"
+    show_df.loc[bye_mask, "resultado_mostrar"] = show_df["resultado_mostrar"] + "  🟨 BYE"
+
+    # normalizar resultados crudos para export
+    safe_df["resultado"] = canonical_results(safe_df["resultado"])
+    return safe_df, show_df
+
+def round_pdf_extra(i: int) -> dict:
+    """Extras de la clave de caché del PDF de ronda (fecha y jugadores.csv los lee el builder)."""
+    return {"ronda": i, "fecha": get_round_date(i), "jugadores": source_sig(JUG_PATH)}
+
+# ============================================================
+# PDF de ronda
+# ============================================================
+def build_round_pdf(i: int, table_df: pd.DataFrame, cfg: dict, include_results: bool = True) -> bytes | None:
+    """
+    PDF con estética afinada:
+    - Old Standard / Playfair si hay TTFs (fallback a Times/Helvetica)
+    - Cabeceras centradas (hasta 'Lista de emparejamientos')
+    - Resultado en el centro (Mesa | Blancas | RESULTADO | Negras)
+    - Doble línea real bajo la cabecera de tabla
+    - Marco exterior, sin numeración
+    - Nombres con (curso grupo) enriqueciendo desde data/jugadores.csv
+    """
+    # ---------- enriquecer (curso/grupo) desde jugadores.csv ----------
+    def _pick(cols, row):
+        for c in cols:
+            if c in row and str(row[c]).strip():
+                return str(row[c]).strip()
+        return ""
+
+    def _guess_id_col(df: pd.DataFrame):
+        for c in ["id", "ID", "Id", "jugador_id", "player_id", "n"]:
+            if c in df.columns:
+                return c
+        return None
+
+    cg_map = {}
+    jdf = read_csv_safe(JUG_PATH)
+    if jdf is not None and not jdf.empty:
+        jdf = jdf.copy()
+        idcol = _guess_id_col(jdf)
+        if idcol:
+            for _, r in jdf.iterrows():
+                pid = str(r.get(idcol, "")).strip()
+                if not pid:
+                    continue
+                curso = _pick(["curso", "nivel", "grado", "anio_curso"], r)
+                grupo = _pick(["grupo", "clase", "seccion", "grupo_letra"], r)
+                cg_map[pid] = " ".join([p for p in [curso, grupo] if p]).strip()
+
+    base = table_df.copy().fillna("")
+    def _name_with_cg(side: str, row: pd.Series) -> str:
+        name = str(row.get(f"{side}_nombre", "")).strip()
+        if name.upper() == "BYE":
+            return name
+        # ronda -> columnas propias
+        cg_in_row = _pick([f"{side}_curso_grupo", f"{side}_nivel_grupo"], row)
+        if not cg_in_row:
+            curso = _pick([f"{side}_curso", f"{side}_nivel"], row)
+            grupo = _pick([f"{side}_grupo", f"{side}_clase"], row)
+            cg_in_row = " ".join([p for p in [curso, grupo] if p]).strip()
+        if not cg_in_row:
+            pid = str(row.get(f"{side}_id", "")).strip()
+            cg_in_row = cg_map.get(pid, "")
+        return f"{name} ({cg_in_row})" if cg_in_row else name
+
+    base["blancas_nombre_pdf"] = base.apply(lambda r: _name_with_cg("blancas", r), axis=1)
+    base["negras_nombre_pdf"]  = base.apply(lambda r: _name_with_cg("negras",  r), axis=1)
+
+    # Orden de columnas con resultado en el centro
+    tbl = base[["mesa", "blancas_nombre_pdf", "resultado_mostrar", "negras_nombre_pdf"]].copy()
+    tbl = tbl.fillna("")
+    if not include_results:
+        tbl["resultado_mostrar"] = ":"
+
+    # ---------- ReportLab principal ----------
+    try:
+        rl = _use_reportlab()
+
+        # Paleta (aprox. plantilla)
+        VERDE     = rl.colors.HexColor("#d9ead3")
+        MELOCOTON = rl.colors.HexColor("#f7e1d5")
+        AZUL      = rl.colors.HexColor("#cfe2f3")
+
+        # Fuentes registradas una vez por proceso + estilos precalculados (pdf_*)
+        S = pdf_styles(cfg)
+        H1, H3, BODY, RES = S.H1, S.H3, S.BODY, S.RES
+
+        buf = io.BytesIO()
+        # Márgenes algo más “editoriales”
+        doc = rl.SimpleDocTemplate(
+            buf, pagesize=rl.A4,
+            leftMargin=17*rl.mm, rightMargin=17*rl.mm,
+            topMargin=14*rl.mm, bottomMargin=14*rl.mm
+        )
+
+        # Marco exterior (sin numeración)
+        def _draw_frame(canvas, d):
+            canvas.saveState()
+            canvas.setStrokeColor(rl.colors.black)
+            canvas.setLineWidth(1.1)
+            x = doc.leftMargin - 5*rl.mm
+            y = doc.bottomMargin - 5*rl.mm
+            w = doc.width + 10*rl.mm
+            h = doc.height + 10*rl.mm
+            canvas.rect(x, y, w, h)
+            canvas.restoreState()
+
+        titulo = (cfg.get("titulo") or "").strip() 
+        anio = (cfg.get("anio") or "").strip()
+        nivel = (cfg.get("nivel") or "").strip()
+        linea_fecha = (cfg.get("pdf_fecha") or "").strip()
+        linea_hora  = (cfg.get("pdf_hora_lugar") or "").strip()
+        # Fecha específica de la ronda (solo PDF sin resultados)
+        if not include_results:
+            try:
+                _iso = get_round_date(i)
+                if _iso:
+                    _fmt = format_date_es(_iso)
+                    if _fmt:
+                        linea_fecha = _fmt
+            except Exception:
+                pass
+
+        # Bandas
+        band1 = rl.Table([[rl.Paragraph(f"{titulo} {anio}" if titulo and anio else "TORNEO DE AJEDREZ", H1)]],
+                      colWidths=[doc.width])
+        band1.setStyle(rl.TableStyle([
+            ("BACKGROUND", (0,0), (-1,-1), VERDE),
+            ("ALIGN", (0,0), (-1,-1), "CENTER"),
+            ("BOTTOMPADDING", (0,0), (-1,-1), 6),
+            ("TOPPADDING", (0,0), (-1,-1), 6),
+        ]))
+
+        band2 = rl.Table([[rl.Paragraph(f"RONDA {i}", S.H_ROUND)]], colWidths=[doc.width])
+        band2.setStyle(rl.TableStyle([
+            ("BACKGROUND", (0,0), (-1,-1), MELOCOTON),
+            ("ALIGN", (0,0), (-1,-1), "CENTER"),
+            ("BOTTOMPADDING", (0,0), (-1,-1), 12),
+            ("TOPPADDING", (0,0), (-1,-1), 12),
+        ]))
+
+        cab_lines = []
+        if nivel:
+            cab_lines.append(f"<b>{nivel}</b>")
+        if not include_results:
+            meta_line = (f"{linea_fecha} — {linea_hora}" if (linea_fecha and linea_hora) else (linea_fecha or linea_hora))
+            if meta_line:
+                cab_lines.append(f"<font size={S.META_SIZE:g}>{meta_line}</font>")
+        cab_text = "<br/>".join(cab_lines) if cab_lines else ""
+        cab = rl.Table([[rl.Paragraph(cab_text, S.CAB)]],
+                    colWidths=[doc.width])
+        cab.setStyle(rl.TableStyle([
+            ("BACKGROUND", (0,0), (-1,-1), AZUL),
+            ("BOX", (0,0), (-1,-1), 0.5, rl.colors.black),
+            ("VALIGN", (0,0), (-1,-1), "MIDDLE"),
+            ("LEFTPADDING", (0,0), (-1,-1), 10),
+            ("RIGHTPADDING", (0,0), (-1,-1), 10),
+            ("TOPPADDING", (0,0), (-1,-1), 10),
+            ("BOTTOMPADDING", (0,0), (-1,-1), 10),
+        ]))
+
+        titulo_lista = rl.Table([[rl.Paragraph("RESULTADOS" if include_results else "Lista de emparejamientos", H3)]], colWidths=[doc.width])
+        titulo_lista.setStyle(rl.TableStyle([
+            ("ALIGN", (0,0), (-1,-1), "CENTER"),
+            ("BOTTOMPADDING", (0,0), (-1,-1), 6),
+            ("TOPPADDING", (0,0), (-1,-1), 6),
+        ]))
+
+        # Construir filas: usar Paragraph en nombres para buena ruptura de línea + sangría/padding
+        rows = []
+        for _, r in tbl.iterrows():
+            mesa = str(r["mesa"])
+            b = rl.Paragraph(str(r["blancas_nombre_pdf"]), BODY)
+            res = rl.Paragraph(str(r["resultado_mostrar"]), RES)  # centrado
+            n = rl.Paragraph(str(r["negras_nombre_pdf"]), BODY)
+            rows.append([mesa, b, res, n])
+
+        data = [["Nº MESA", "BLANCAS", "RESULTADO", "NEGRAS"], ["", "", "", ""]] + rows
+        widths = [20*rl.mm, (doc.width - 40*rl.mm)/2, 20*rl.mm, (doc.width - 40*rl.mm)/2]
+
+        t = rl.Table(data, colWidths=widths, repeatRows=2)  # repite cabecera si salta de página
+        # cabecera + doble línea real (cabecera → cuerpo) + fila separadora “fantasma”
+        t.setStyle(rl.TableStyle(header_table_cmds(S) + [
+            # cuerpo: padding y alineaciones
+            ("LEFTPADDING", (0,2), (-1,-1), 6),
+            ("RIGHTPADDING", (0,2), (-1,-1), 6),
+            ("ALIGN", (0,2), (0,-1), "CENTER"),
+            ("ALIGN", (2,2), (2,-1), "CENTER"),
+            ("VALIGN", (0,2), (-1,-1), "MIDDLE"),
+
+            # rejilla suave
+            ("GRID", (0,2), (-1,-1), 0.4, S.GRID),
+        ]))
+
+        story = [band1, band2, cab, rl.Spacer(1, 6), titulo_lista, t]
+        doc.build(story, onFirstPage=_draw_frame, onLaterPages=_draw_frame)
+        return buf.getvalue()
+
+    except Exception:
+        # ---------- FPDF fallback (simple, sin números) ----------
+        try:
+            from fpdf import FPDF
+            pdf = FPDF(orientation="P", unit="mm", format="A4")
+            pdf.set_auto_page_break(auto=True, margin=15)
+            pdf.add_page()
+
+            anio = (cfg.get("anio") or "").strip()
+            nivel = (cfg.get("nivel") or "").strip()
+            linea_fecha = (cfg.get("pdf_fecha") or "").strip()
+            linea_hora  = (cfg.get("pdf_hora_lugar") or "").strip()
+
+            # Fecha específica de la ronda (solo PDF sin resultados)
+            if not include_results:
+                try:
+                    _iso = get_round_date(i)
+                    if _iso:
+                        _fmt = format_date_es(_iso)
+                        if _fmt:
+                            linea_fecha = _fmt
+                except Exception:
+                    pass
+            # cabeceras centradas
+            pdf.set_font("Helvetica", "B", 18); pdf.cell(0, 10, f"TORNEO DE AJEDREZ {anio}" if anio else "TORNEO DE AJEDREZ", ln=1, align="C")
+            pdf.set_font("Helvetica", "B", 24); pdf.cell(0, 10, f"RONDA {i}", ln=1, align="C")
+            # Nivel (igual)
+            if nivel:
+                pdf.set_font("Helvetica", "B", 18)
+                pdf.cell(0, 8, nivel, ln=1, align="C")
+            # Meta: solo si NO incluimos resultados, en una sola línea y un poco menor
+            if not include_results:
+                meta_line = (f"{linea_fecha} — {linea_hora}" if (linea_fecha and linea_hora) else (linea_fecha or linea_hora))
+                if meta_line:
+                    pdf.set_font("Helvetica", "B", 13)
+                    pdf.cell(0, 7, meta_line, ln=1, align="C")
+            pdf.ln(2)
+            pdf.set_font("Helvetica", "B", 16); pdf.cell(0, 8, "RESULTADOS" if include_results else "Lista de emparejamientos", ln=1, align="C"); pdf.ln(1)
+
+            headers = ["Nº MESA", "BLANCAS", "RESULTADO", "NEGRAS"]
+            widths = [20, 85, 20, 85]  # un poco más anchas las columnas de nombres
+            pdf.set_font("Helvetica", "B", 11)
+            x0 = pdf.get_x()
+            for h, w in zip(headers, widths): pdf.cell(w, 8, h, border=1, align="C")
+            pdf.ln(8)
+            # doble línea
+            x1 = x0 + sum(widths); y1 = pdf.get_y()
+            pdf.set_draw_color(0,0,0); pdf.set_line_width(0.6); pdf.line(x0, y1, x1, y1)
+            pdf.set_line_width(0.2); pdf.line(x0, y1 + 1.2, x1, y1 + 1.2)
+
+            pdf.set_font("Helvetica", "", 11)
+            for _, r in tbl.iterrows():
+                cells = [str(r["mesa"]), str(r["blancas_nombre_pdf"]), str(r["resultado_mostrar"]), str(r["negras_nombre_pdf"])]
+                aligns = ["C", "L", "C", "L"]
+                for c, w, a in zip(cells, widths, aligns):
+                    pdf.cell(w, 7, c[:64], border=1, align=a)
+                pdf.ln(7)
+
+            return bytes(pdf.output(dest="S"))
+        except Exception:
+            return None
+
+# ============================================================
+# Clasificación y cuadro
+# ============================================================
+def build_standings_pdf(
+    df_st: pd.DataFrame,
+    cfg: dict,
+    ronda_actual: int | None,
+    show_bh: bool = True,
+    include_stats: bool = False,
+    paper: str = "A4"
+) -> bytes | None:
+    'Genera PDF con tu estética; si include_stats=True añade Progreso/Victorias/Blancas/Negras/Performance. Selector A4/A3.'
+    try:
+        rl = _use_reportlab()
+        S = pdf_styles(cfg)
+
+        PAPER_RL = {"A4": rl.A4, "A3": rl.A3}
+        page_size = PAPER_RL.get(paper, rl.A4)
+
+        buf = io.BytesIO()
+        doc = rl.SimpleDocTemplate(
+            buf, pagesize=page_size,
+            leftMargin=17*rl.mm, rightMargin=17*rl.mm,
+            topMargin=14*rl.mm, bottomMargin=14*rl.mm
+        )
+
+        def _draw_frame(canvas, d):
+            canvas.saveState()
+            canvas.setStrokeColor(rl.colors.black)
+            canvas.setLineWidth(1.1)
+            x = doc.leftMargin - 5*rl.mm
+            y = doc.bottomMargin - 5*rl.mm
+            w = doc.width + 10*rl.mm
+            h = doc.height + 10*rl.mm
+            canvas.rect(x, y, w, h)
+            canvas.restoreState()
+
+        H1, H3, CELL, CELL_L = S.H1, S.H3, S.CELL, S.CELL_L
+
+        titulo = (cfg.get("titulo") or "TORNEO DE AJEDREZ").strip()
+        anio   = (cfg.get("anio") or "").strip()
+        nivel  = (cfg.get("nivel") or "").strip()
+
+        # Bandas cabecera
+        band1 = rl.Table([[rl.Paragraph(f"{titulo} {anio}".strip(), H1)]], colWidths=[doc.width])
+        band1.setStyle(rl.TableStyle([
+            ("BACKGROUND", (0,0), (-1,-1), S.BAND_BG),
+            ("ALIGN", (0,0), (-1,-1), "CENTER"),
+            ("BOTTOMPADDING", (0,0), (-1,-1), 6),
+            ("TOPPADDING", (0,0), (-1,-1), 6),
+        ]))
+        band2 = rl.Table([[rl.Paragraph(nivel or "", H1)]], colWidths=[doc.width])
+        band2.setStyle(rl.TableStyle([
+            ("BACKGROUND", (0,0), (-1,-1), S.BAND_BG),
+            ("ALIGN", (0,0), (-1,-1), "CENTER"),
+            ("BOTTOMPADDING", (0,0), (-1,-1), 12),
+            ("TOPPADDING", (0,0), (-1,-1), 12),
+        ]))
+        linea = f"CLASIFICACIÓN DEL TORNEO (tras ronda {ronda_actual})" if ronda_actual else "CLASIFICACIÓN DEL TORNEO"
+        titulo_lista = rl.Table([[rl.Paragraph(linea, H3)]], colWidths=[doc.width])
+        titulo_lista.setStyle(rl.TableStyle([
+            ("ALIGN", (0,0), (-1,-1), "CENTER"),
+            ("BOTTOMPADDING", (0,0), (-1,-1), 6),
+            ("TOPPADDING", (0,0), (-1,-1), 6),
+        ]))
+
+        # --- Cabecera de columnas ---
+        base_cols = ["POS", "JUGADOR/A", "CURSO", "GRUPO", "PTS"]
+        if show_bh and ("buchholz" in df_st.columns):
+            base_cols += ["BUCHHOLZ"]
+        base_cols += ["PJ"]
+
+        stat_cols = []
+        if include_stats:
+            if "Progreso 📈" in df_st.columns: stat_cols.append("PROG.")
+            if "Victorias 🏆" in df_st.columns: stat_cols.append("V")
+            if "⚪ Blancas" in df_st.columns:    stat_cols.append("B")
+            if "⚫ Negras" in df_st.columns:     stat_cols.append("N")
+            if "🎯 Performance" in df_st.columns: stat_cols.append("%")
+
+        head = base_cols + stat_cols
+        data = [head, [""] * len(head)]
+
+        # --- Filas ---
+        for _, r in df_st.iterrows():
+            row = [
+                rl.Paragraph(str(r.get("pos","")), CELL),
+                rl.Paragraph(str(r.get("nombre","")), CELL_L),
+                rl.Paragraph(str(r.get("curso","")), CELL),
+                rl.Paragraph(str(r.get("grupo","")), CELL),
+                rl.Paragraph(str(r.get("puntos","")), CELL),
+            ]
+            if "BUCHHOLZ" in head:
+                row.append(rl.Paragraph(str(r.get("buchholz","")), CELL))
+            row.append(rl.Paragraph(str(r.get("pj","")), CELL))
+
+            if include_stats:
+                if "PROG." in head: row.append(rl.Paragraph(str(r.get("Progreso 📈","")), CELL))
+                if "V" in head:     row.append(rl.Paragraph(str(r.get("Victorias 🏆","")), CELL))
+                if "B" in head:     row.append(rl.Paragraph(str(r.get("⚪ Blancas","")), CELL))
+                if "N" in head:     row.append(rl.Paragraph(str(r.get("⚫ Negras","")), CELL))
+                if "%" in head:     row.append(rl.Paragraph(str(r.get("🎯 Performance","")), CELL))
+
+            data.append(row)
+
+        # --- Anchos ---
+        w_pos, w_jug, w_cur, w_grp, w_pts = 14*rl.mm, 72*rl.mm, 20*rl.mm, 20*rl.mm, 16*rl.mm
+        widths = [w_pos, w_jug, w_cur, w_grp, w_pts]
+        if "BUCHHOLZ" in head:
+            widths.append(26*rl.mm)
+        widths.append(12*rl.mm)  # PJ
+        if include_stats:
+            if "PROG." in head: widths.append(32*rl.mm)
+            if "V" in head:     widths.append(10*rl.mm)
+            if "B" in head:     widths.append(10*rl.mm)
+            if "N" in head:     widths.append(10*rl.mm)
+            if "%" in head:     widths.append(12*rl.mm)
+
+        t = rl.Table(data, colWidths=widths, repeatRows=2)
+        t.setStyle(rl.TableStyle(header_table_cmds(S) + [
+            ("LEFTPADDING", (0,2), (-1,-1), 6),
+            ("RIGHTPADDING", (0,2), (-1,-1), 6),
+            ("ALIGN", (0,2), (0,-1), "CENTER"),
+            ("ALIGN", (1,2), (1,-1), "LEFT"),
+            ("ALIGN", (2,2), (-1,-1), "CENTER"),
+            ("VALIGN", (0,2), (-1,-1), "MIDDLE"),
+            ("GRID", (0,2), (-1,-1), 0.4, S.GRID),
+        ]))
+
+        story = [band1, band2, titulo_lista, t]
+        doc.build(story, onFirstPage=_draw_frame, onLaterPages=_draw_frame)
+        return buf.getvalue()
+    except Exception:
+        return None
+
+
+def build_crosstable_df_positions(df_st: pd.DataFrame, publicadas: list[int]) -> pd.DataFrame:
+    'Cuadro doble entrada por POSICIONES (matriz de códigos en lib.crosstable; textos al pintar).'
+    ids = df_st["id"].astype(str).tolist() if "id" in df_st.columns else []
+    positions = df_st["pos"].astype(int).tolist() if ids else []
+    if not ids:
+        return pd.DataFrame()
+    ct = crosstable_for(sorted(ids), publicadas or [])
+    order = sorted(range(len(ids)), key=lambda k: positions[k])
+    return ct.to_frame([ids[k] for k in order], [positions[k] for k in order])
+
+
+# Por encima de este número de jugadores se usa la vista "rivales por ronda"
+CROSSTABLE_DENSE_MAX = 60
+
+def crosstable_dense_max(cfg: Optional[dict] = None) -> int:
+    try:
+        return max(2, int((cfg or {}).get("crosstable_dense_max", CROSSTABLE_DENSE_MAX)))
+    except Exception:
+        return CROSSTABLE_DENSE_MAX
+
+def build_crosstable_sparse(df_st: pd.DataFrame, publicadas: list[int]) -> pd.DataFrame:
+    """
+    Cuadro disperso por POSICIONES: Jugador, R1..Rn ("12b1" = rival 12, blancas, gana;
+    "n" = negras) y Pts. Solo N×R celdas: sirve para cientos o miles de jugadores.
+    """
+    if "id" not in df_st.columns or df_st.empty:
+        return pd.DataFrame()
+    ids = df_st["id"].astype(str).tolist()
+    positions = df_st["pos"].astype(int).tolist()
+    rounds = sorted(int(r) for r in (publicadas or []))
+    ct = crosstable_for(sorted(ids), rounds)
+    order = sorted(range(len(ids)), key=lambda k: positions[k])
+    out = ct.by_round([ids[k] for k in order], [positions[k] for k in order], rounds)
+    names = df_st.get("nombre", pd.Series("", index=df_st.index)).fillna("").astype(str).tolist()
+    out.insert(0, "Jugador", [names[k] for k in order])
+    if "puntos" in df_st.columns:
+        pts = df_st["puntos"].tolist()
+        out["Pts"] = [f"{float(pts[k]):g}" if pd.notna(pts[k]) else "" for k in order]
+    out.index.name = "POS"
+    return out
+
+
+def build_crosstable_pdf(ct_df: pd.DataFrame, cfg: dict, paper: str = "A4") -> bytes | None:
+    """
+    Selector A4/A3. Vale para el cuadro de doble entrada y para el disperso
+    (columna "Jugador"). Si las columnas no caben se reparten en varias
+    "hojas" seguidas, repitiendo POS (y Jugador) en cada una.
+    """
+    try:
+        rl = _use_reportlab()
+        S = pdf_styles(cfg)
+
+        buf = io.BytesIO()
+        PAPER_RL = {"A4": rl.A4, "A3": rl.A3}
+        page_size = rl.landscape(PAPER_RL.get(paper, rl.A4))
+        doc = rl.SimpleDocTemplate(
+            buf, pagesize=page_size,
+            leftMargin=14*rl.mm, rightMargin=14*rl.mm,
+            topMargin=12*rl.mm, bottomMargin=12*rl.mm
+        )
+
+        def _draw_frame(canvas, d):
+            canvas.saveState()
+            canvas.setStrokeColor(rl.colors.black)
+            canvas.setLineWidth(1.1)
+            x = doc.leftMargin - 5*rl.mm
+            y = doc.bottomMargin - 5*rl.mm
+            w = doc.width + 10*rl.mm
+            h = doc.height + 10*rl.mm
+            canvas.rect(x, y, w, h)
+            canvas.restoreState()
+
+        H1, H3 = S.H1, S.H3
+
+        titulo = (cfg.get("titulo") or "TORNEO DE AJEDREZ").strip()
+        anio   = (cfg.get("anio") or "").strip()
+        nivel  = (cfg.get("nivel") or "").strip()
+
+        band1 = rl.Table([[rl.Paragraph(f"{titulo} {anio}".strip(), H1)]], colWidths=[doc.width])
+        band1.setStyle(rl.TableStyle([
+            ("BACKGROUND", (0,0), (-1,-1), S.BAND_BG),
+            ("ALIGN", (0,0), (-1,-1), "CENTER"),
+            ("BOTTOMPADDING", (0,0), (-1,-1), 6),
+            ("TOPPADDING", (0,0), (-1,-1), 6),
+        ]))
+        band2 = rl.Table([[rl.Paragraph(nivel or "", H1)]], colWidths=[doc.width])
+        band2.setStyle(rl.TableStyle([
+            ("BACKGROUND", (0,0), (-1,-1), S.BAND_BG),
+            ("ALIGN", (0,0), (-1,-1), "CENTER"),
+            ("BOTTOMPADDING", (0,0), (-1,-1), 10),
+            ("TOPPADDING", (0,0), (-1,-1), 10),
+        ]))
+
+        sparse = "Jugador" in ct_df.columns
+        fixed = ["Jugador"] if sparse else []
+        tiled = [c for c in ct_df.columns if c not in fixed]
+        first_w = 16*rl.mm
+        fixed_w = 60*rl.mm if sparse else 0
+        min_w, max_w = (15*rl.mm, 24*rl.mm) if sparse else (8*rl.mm, 12*rl.mm)
+        avail = doc.width - first_w - fixed_w
+        per = max(1, int(avail // min_w))
+        chunks = [tiled[i:i + per] for i in range(0, len(tiled), per)] or [[]]
+
+        subtitle = "CUADRO DEL TORNEO (rivales por ronda)" if sparse else "CUADRO DEL TORNEO (por posiciones)"
+        index = [str(i) for i in ct_df.index]
+        names = ct_df["Jugador"].astype(str).tolist() if sparse else []
+        total = max(1, len(ct_df) * len(chunks))
+        story = [band1, band2]
+        for ci, chunk in enumerate(chunks):
+            cols = fixed + chunk
+            part = f" — columnas {chunk[0]}–{chunk[-1]} ({ci + 1}/{len(chunks)})" if len(chunks) > 1 and chunk else ""
+            titulo_lista = rl.Table([[rl.Paragraph(subtitle + part, H3)]], colWidths=[doc.width])
+            titulo_lista.setStyle(rl.TableStyle([
+                ("ALIGN", (0,0), (-1,-1), "CENTER"),
+                ("BOTTOMPADDING", (0,0), (-1,-1), 6),
+                ("TOPPADDING", (0,0), (-1,-1), 6),
+            ]))
+
+            header = ["POS"] + [str(c) for c in cols]
+            data = [header, [""] * len(header)]
+            block = ct_df[chunk].to_numpy(dtype=object) if chunk else None
+            for k in range(len(ct_df)):
+                row = [str(x) if x is not None else "" for x in block[k]] if chunk else []
+                data.append([index[k]] + ([rl.Paragraph(names[k], S.CELL_L)] if sparse else []) + row)
+                if k % 50 == 0:
+                    export_progress(0.1 + 0.3 * (ci * len(ct_df) + k) / total)
+
+            if chunk:
+                rest_w = max(min_w, min(max_w, avail / len(chunk)))
+                widths = [first_w] + ([fixed_w] if sparse else []) + [rest_w] * len(chunk)
+            else:
+                widths = [first_w] + ([fixed_w] if sparse else [])
+
+            t = rl.Table(data, colWidths=widths, repeatRows=2)
+            t.setStyle(rl.TableStyle(header_table_cmds(S, rule=1.2) + [
+                ("LEFTPADDING", (0,2), (-1,-1), 4),
+                ("RIGHTPADDING", (0,2), (-1,-1), 4),
+                ("ALIGN", (0,2), (0,-1), "CENTER"),
+                ("ALIGN", (1,2), (-1,-1), "CENTER"),
+                ("VALIGN", (0,2), (-1,-1), "MIDDLE"),
+                ("GRID", (0,2), (-1,-1), 0.35, S.GRID),
+            ]))
+            if ci:
+                story.append(rl.PageBreak())
+            story += [titulo_lista, t]
+
+        doc.build(story, onFirstPage=_draw_frame, onLaterPages=_draw_frame)
+        return buf.getvalue()
+    except Exception:
+        return None
+
+# ============================================================
+# Fichas por jugador
+# ============================================================
+def player_histories(frames: Dict[int, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    Historial de cada jugador (por id) a partir de los CSV de rondas:
+    ronda, mesa, color, rival, resultado, puntos (None si no hay resultado).
+    """
+    cols = ["ronda", "mesa", "color", "rival", "resultado", "puntos"]
+    parts = []
+    for rnd, dfp in sorted(frames.items()):
+        if dfp is None or dfp.empty:
+            continue
+        d = dfp.copy()
+        for c in ["mesa", "blancas_id", "blancas_nombre", "negras_id", "negras_nombre", "resultado"]:
+            if c not in d.columns:
+                d[c] = ""
+        d["ronda"] = rnd
+        parts.append(d)
+    if not parts:
+        return {}
+    df = pd.concat(parts, ignore_index=True)
+    wid = df["blancas_id"].fillna("").astype(str).str.strip()
+    bid = df["negras_id"].fillna("").astype(str).str.strip()
+    dec = decode_results(df["resultado"], is_bye=bid.str.upper().eq("BYE"))
+    res = canonical_results(df["resultado"])
+
+    white = pd.DataFrame({
+        "id": wid, "ronda": df["ronda"], "mesa": df["mesa"], "color": "Blancas",
+        "rival": df["negras_nombre"].fillna("").astype(str), "resultado": res,
+        "puntos": dec["white_pts"].where(dec["decided"]),
+    })
+    black = pd.DataFrame({
+        "id": bid, "ronda": df["ronda"], "mesa": df["mesa"], "color": "Negras",
+        "rival": df["blancas_nombre"].fillna("").astype(str), "resultado": res,
+        "puntos": dec["black_pts"].where(dec["decided"]),
+    })[~dec["is_bye"]]
+    allh = pd.concat([white, black], ignore_index=True)
+    allh = allh[allh["id"] != ""].sort_values(["id", "ronda"])
+    return {pid: g[cols].reset_index(drop=True) for pid, g in allh.groupby("id", sort=False)}
+
+def build_player_sheet_pdf(player: dict, hist_df: pd.DataFrame, cfg: dict) -> bytes | None:
+    """Ficha A4 de un jugador: cabecera del torneo, datos del jugador y sus partidas."""
+    try:
+        rl = _use_reportlab()
+        S = pdf_styles(cfg)
+
+        buf = io.BytesIO()
+        doc = rl.SimpleDocTemplate(
+            buf, pagesize=rl.A4,
+            leftMargin=17*rl.mm, rightMargin=17*rl.mm,
+            topMargin=14*rl.mm, bottomMargin=14*rl.mm
+        )
+
+        def _draw_frame(canvas, d):
+            canvas.saveState()
+            canvas.setStrokeColor(rl.colors.black)
+            canvas.setLineWidth(1.1)
+            canvas.rect(doc.leftMargin - 5*rl.mm, doc.bottomMargin - 5*rl.mm, doc.width + 10*rl.mm, doc.height + 10*rl.mm)
+            canvas.restoreState()
+
+        H1, H3, CELL, CELL_L = S.H1, S.H3, S.CELL, S.CELL_L
+
+        titulo = (cfg.get("titulo") or "TORNEO DE AJEDREZ").strip()
+        anio   = (cfg.get("anio") or "").strip()
+        nivel  = (cfg.get("nivel") or "").strip()
+
+        band1 = rl.Table([[rl.Paragraph(f"{titulo} {anio}".strip(), H1)]], colWidths=[doc.width])
+        band1.setStyle(rl.TableStyle([
+            ("BACKGROUND", (0,0), (-1,-1), S.BAND_BG),
+            ("ALIGN", (0,0), (-1,-1), "CENTER"),
+            ("BOTTOMPADDING", (0,0), (-1,-1), 6),
+            ("TOPPADDING", (0,0), (-1,-1), 6),
+        ]))
+        nombre = str(player.get("nombre", "")).strip()
+        cg = " ".join(p for p in [str(player.get("curso", "")).strip(), str(player.get("grupo", "")).strip()] if p)
+        linea = f"{nombre} ({cg})" if cg else nombre
+        band2 = rl.Table([[rl.Paragraph(linea, H1)]], colWidths=[doc.width])
+        band2.setStyle(rl.TableStyle([
+            ("BACKGROUND", (0,0), (-1,-1), S.BAND_BG),
+            ("ALIGN", (0,0), (-1,-1), "CENTER"),
+            ("BOTTOMPADDING", (0,0), (-1,-1), 10),
+            ("TOPPADDING", (0,0), (-1,-1), 10),
+        ]))
+        resumen = f"{nivel} · Posición {player.get('pos', '')} · {player.get('puntos', '')} puntos".strip(" ·")
+        sub = rl.Table([[rl.Paragraph(resumen, H3)]], colWidths=[doc.width])
+
+        data = [["RONDA", "MESA", "COLOR", "RIVAL", "RESULTADO", "PUNTOS"], [""] * 6]
+        acum = 0.0
+        for _, r in (hist_df if hist_df is not None else pd.DataFrame()).iterrows():
+            pts = r.get("puntos")
+            if pts is not None and not pd.isna(pts):
+                acum += float(pts)
+            mesa = r.get("mesa", "")
+            data.append([
+                rl.Paragraph(str(r.get("ronda", "")), CELL),
+                rl.Paragraph("" if pd.isna(mesa) else str(mesa), CELL),
+                rl.Paragraph(str(r.get("color", "")), CELL),
+                rl.Paragraph(str(r.get("rival", "")), CELL_L),
+                rl.Paragraph(str(r.get("resultado", "")) or "—", CELL),
+                rl.Paragraph(points_label(pts) if pts is not None and not pd.isna(pts) else "—", CELL),
+            ])
+        data.append(["", "", "", rl.Paragraph("<b>Total</b>", CELL_L), "", rl.Paragraph(f"<b>{points_label(acum)}</b>", CELL)])
+
+        widths = [16*rl.mm, 14*rl.mm, 20*rl.mm, doc.width - 90*rl.mm, 22*rl.mm, 18*rl.mm]
+        t = rl.Table(data, colWidths=widths, repeatRows=2)
+        t.setStyle(rl.TableStyle(header_table_cmds(S) + [
+            ("LEFTPADDING", (0,2), (-1,-1), 6),
+            ("RIGHTPADDING", (0,2), (-1,-1), 6),
+            ("VALIGN", (0,2), (-1,-1), "MIDDLE"),
+            ("GRID", (0,2), (-1,-2), 0.4, S.GRID),
+            ("LINEABOVE", (0,-1), (-1,-1), 0.8, rl.colors.black),
+        ]))
+
+        story = [band1, band2, sub, t]
+        doc.build(story, onFirstPage=_draw_frame, onLaterPages=_draw_frame)
+        return buf.getvalue()
+    except Exception:
+        return None
+
+# ============================================================
+# Dossier del torneo (ZIP renderizado en paralelo)
+# ============================================================
+_BUILDERS: Dict[str, Callable[..., Optional[bytes]]] = {}
+
+def _render_task(kind: str, args: tuple) -> Optional[bytes]:
+    """Punto de entrada de los procesos del pool (función de módulo: se puede serializar)."""
+    try:
+        return _BUILDERS[kind](*args)
+    except Exception:
+        return None
+
+def _pool_workers(workers: Optional[int]) -> int:
+    return max(1, int(workers or min(4, os.cpu_count() or 1)))
+
+def _make_pool(workers: Optional[int]):
+    """ProcessPool (spawn: no hereda hilos de Streamlit); si no se puede crear, ThreadPool."""
+    from concurrent.futures import ProcessPoolExecutor
+    workers = _pool_workers(workers)
+    try:
+        import multiprocessing as mp
+        return ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"))
+    except Exception:
+        return ThreadPoolExecutor(max_workers=workers)
+
+def build_dossier_zip(
+    rounds: List[int],
+    cfg: dict,
+    paper: str = "A4",
+    players_path: Optional[str] = None,
+    bye_points: float = 1.0,
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int, str], None]] = None,
+) -> bytes:
+    """
+    ZIP con todo el torneo tras `rounds` (normalmente las publicadas):
+      rondas/ronda_N.csv, rondas/ronda_N_resultados.pdf, rondas/ronda_N_en_blanco.pdf
+      clasificacion.csv, clasificacion_<papel>.pdf, cuadro.csv, cuadro_<papel>.pdf
+        (cuadro disperso "rivales por ronda" si hay más de crosstable_dense_max jugadores)
+      jugadores/<pos>_<nombre>.pdf (ficha con el historial)
+      dossier.json (qué se generó y qué no)
+    Los PDF se renderizan en un pool de procesos y se escriben en el ZIP según terminan;
+    los que ya están en la caché de exportaciones no se vuelven a generar.
+    `progress(hechos, total, fichero)` se llama desde el hilo que invoca.
+    """
+    rounds = sorted(int(r) for r in (rounds or []))
+    players_path = players_path or JUG_PATH
+    frames = {r: read_round(r) for r in rounds}
+    st_df = standings_from_rounds(rounds, players_path, bye_points=bye_points)
+    ronda_actual = max(rounds) if rounds else None
+    if len(st_df) > crosstable_dense_max(cfg):
+        ct_df = build_crosstable_sparse(st_df, rounds)
+    else:
+        ct_df = build_crosstable_df_positions(st_df, rounds)
+    hists = player_histories(frames)
+
+    base = f"{slugify(cfg.get('nivel', ''))}_{slugify(cfg.get('anio', ''))}"
+    std_cols = [c for c in ["pos", "nombre", "curso", "grupo", "puntos", "buchholz", "pj"] if c in st_df.columns]
+
+    # (fichero, tipo, args, tabla para la clave de caché, papel, extras)
+    tasks = []
+    csvs: Dict[str, bytes] = {}
+    for r in rounds:
+        dfp = frames.get(r)
+        if dfp is None or dfp.empty:
+            continue
+        safe_df, show_df = prepare_round_tables(dfp)
+        cols = ["mesa", "blancas_id", "blancas_nombre", "negras_id", "negras_nombre", "resultado"]
+        csvs[f"rondas/ronda_{r}.csv"] = safe_df[cols].to_csv(index=False).encode("utf-8")
+        extra = round_pdf_extra(r)
+        tasks.append((f"rondas/ronda_{r}_resultados.pdf", "ronda_resultados", (r, show_df, cfg, True), show_df, "A4", extra))
+        tasks.append((f"rondas/ronda_{r}_en_blanco.pdf", "ronda_blanco", (r, show_df, cfg, False), show_df, "A4", extra))
+
+    csvs["clasificacion.csv"] = st_df[std_cols].to_csv(index=False).encode("utf-8")
+    csvs["cuadro.csv"] = ct_df.to_csv(index=True).encode("utf-8")
+    tasks.append((f"clasificacion_{paper}.pdf", "clasificacion", (st_df[std_cols], cfg, ronda_actual, True, False, paper),
+                  st_df[std_cols], paper, {"ronda": ronda_actual, "bh": True, "stats": False}))
+    tasks.append((f"cuadro_{paper}.pdf", "cuadro", (ct_df, cfg, paper), ct_df, paper, None))
+
+    for _, row in st_df.iterrows():
+        pid = str(row.get("id", ""))
+        info = {k: row.get(k, "") for k in ["pos", "nombre", "curso", "grupo", "puntos"]}
+        hist = hists.get(pid, pd.DataFrame(columns=["ronda", "mesa", "color", "rival", "resultado", "puntos"]))
+        name = f"jugadores/{int(row.get('pos', 0)):03d}_{slugify(row.get('nombre', pid))}.pdf"
+        tasks.append((name, "ficha", (info, hist, cfg), hist, "A4", {"jugador": info}))
+
+    total = len(tasks)
+    done = 0
+    generated, missing = [], []
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, data in csvs.items():
+            zf.writestr(f"{base}/{name}", data)
+
+        # Primero lo que ya está en caché
+        pending = []
+        for name, kind, args, table, pap, extra in tasks:
+            key = export_key(kind, table, cfg, paper=pap, extra=extra)
+            data = get_cached(key)
+            if data is None:
+                pending.append((name, kind, args, key))
+                continue
+            zf.writestr(f"{base}/{name}", data)
+            generated.append(name)
+            done += 1
+            if progress:
+                progress(done, total, name)
+
+        def _store(name: str, key: str, data: Optional[bytes]) -> None:
+            nonlocal done
+            if data:
+                zf.writestr(f"{base}/{name}", data)
+                put_cached(key, data, cfg)
+                generated.append(name)
+            else:
+                missing.append(name)
+            done += 1
+            if progress:
+                progress(done, total, name)
+
+        if pending:
+            left = {name: (name, kind, args, key) for name, kind, args, key in pending}
+            try:
+                with _make_pool(workers) as pool:
+                    futs = {pool.submit(_render_task, _TASK_BUILDER[kind], args): (name, key) for name, kind, args, key in pending}
+                    for fut in as_completed(futs):
+                        name, key = futs[fut]
+                        try:
+                            data = fut.result()
+                        except BrokenProcessPool:
+                            raise
+                        except Exception:
+                            data = None
+                        left.pop(name, None)
+                        _store(name, key, data)
+            except BrokenProcessPool as e:
+                # El pool de procesos se ha roto (worker muerto, __main__ no importable…):
+                # lo que falte se renderiza con hilos en este proceso.
+                add_log("dossier", None, "exportar", f"pool de procesos roto ({e}); {len(left)} PDF con hilos")
+                with ThreadPoolExecutor(max_workers=_pool_workers(workers)) as pool:
+                    futs = {pool.submit(_render_task, _TASK_BUILDER[kind], args): (name, key) for name, kind, args, key in left.values()}
+                    for fut in as_completed(futs):
+                        name, key = futs[fut]
+                        try:
+                            data = fut.result()
+                        except Exception:
+                            data = None
+                        _store(name, key, data)
+
+        manifest = {
+            "generado": now_madrid(),
+            "rondas": rounds,
+            "papel": paper,
+            "ficheros": sorted(generated) + sorted(csvs),
+            "no_generados": sorted(missing),
+        }
+        zf.writestr(f"{base}/dossier.json", json.dumps(manifest, ensure_ascii=False, indent=2))
+    return out.getvalue()
+
+# tipo de tarea -> builder
+_BUILDERS.update({
+    "round": build_round_pdf,
+    "standings": build_standings_pdf,
+    "crosstable": build_crosstable_pdf,
+    "player": build_player_sheet_pdf,
+})
+_TASK_BUILDER = {
+    "ronda_resultados": "round",
+    "ronda_blanco": "round",
+    "clasificacion": "standings",
+    "cuadro": "crosstable",
+    "ficha": "player",
+}
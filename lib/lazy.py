@@ -0,0 +1,94 @@
+# lib/lazy.py
+# -*- coding: utf-8 -*-
+"""
+Carga perezosa de dependencias pesadas de exportación y gráficos
+(reportlab, fpdf2, altair).
+
+Las páginas importan lib.exports / lib.lazy sin pagar nada: el módulo real se
+importa la primera vez que se usa (al generar un PDF o pintar un gráfico).
+
+  from lib.lazy import altair as alt        # proxy; importa altair en alt.Chart(...)
+  rl = reportlab_names()                    # dict con A4, Table, colors... (o {} si falta)
+  if available("reportlab"): ...            # sin importar nada
+"""
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import threading
+import types
+from typing import Dict, Optional
+
+_LOCK = threading.RLock()
+
+
+class LazyModule(types.ModuleType):
+    """Proxy de módulo: el import real ocurre en el primer acceso a un atributo."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = None
+
+    def _load(self) -> types.ModuleType:
+        mod = self.__dict__["_lazy_target"]
+        if mod is None:
+            with _LOCK:
+                mod = self.__dict__["_lazy_target"]
+                if mod is None:
+                    mod = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_target"] = mod
+        return mod
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "cargado" if self.__dict__["_lazy_target"] is not None else "sin cargar"
+        return f"<módulo perezoso {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
+
+def available(name: str) -> bool:
+    """¿Está instalado el paquete? (no lo importa)."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except Exception:
+        return False
+
+
+altair = lazy_import("altair")
+
+# ============================================================
+# reportlab: nombres que usan los builders de lib/exports.py
+# ============================================================
+_RL_NAMES: Optional[Dict[str, object]] = None
+
+def reportlab_names() -> Dict[str, object]:
+    """
+    Importa (una vez) la parte de reportlab que usan los builders y devuelve sus nombres.
+    Si reportlab no está instalado devuelve {} (los builders caen a fpdf2 o a None).
+    """
+    global _RL_NAMES
+    if _RL_NAMES is not None:
+        return _RL_NAMES
+    with _LOCK:
+        if _RL_NAMES is not None:
+            return _RL_NAMES
+        try:
+            from reportlab.lib.pagesizes import A4, A3, landscape
+            from reportlab.lib import colors
+            from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle, Spacer, PageBreak
+            from reportlab.lib.units import mm
+            _RL_NAMES = {
+                "A4": A4, "A3": A3, "landscape": landscape, "colors": colors,
+                "SimpleDocTemplate": SimpleDocTemplate, "Paragraph": Paragraph, "Table": Table,
+                "TableStyle": TableStyle, "Spacer": Spacer, "PageBreak": PageBreak, "mm": mm,
+            }
+        except Exception:
+            _RL_NAMES = {}
+        return _RL_NAMES
@@ -0,0 +1,201 @@
+# lib/pdf_resources.py
+# -*- coding: utf-8 -*-
+"""
+Recursos compartidos de los PDF (reportlab):
+
+- register_fonts(): registra UNA vez por proceso (con cerrojo, idempotente) las
+  familias TTF de assets/fonts. Parsear un TTF cuesta; antes se hacía en cada PDF.
+- pdf_styles(cfg): ParagraphStyle / colores / comandos de TableStyle derivados de
+  las claves pdf_* de config.json, calculados una vez por configuración.
+
+Claves de config usadas (todas opcionales; sin ellas se mantiene el aspecto clásico):
+  pdf_font            familia del texto de tablas (Atkinson, Lexend, NotoSans, OldStd, Playfair)
+  pdf_title_size      tamaño del título del torneo (18)
+  pdf_round_size      tamaño de la banda "RONDA N" (18)
+  pdf_meta_size       tamaño de la línea fecha/hora/lugar (14)
+  pdf_header_bg       fondo de la cabecera de las tablas (whitesmoke)
+  pdf_header_border   color de la rejilla de las tablas (lightgrey)
+  pdf_meta_bg         fondo de las bandas de título de clasificación/cuadro/fichas (whitesmoke)
+"""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from lib.tournament import BASE_DIR
+
+FONTS_DIR = os.path.join(BASE_DIR, "assets", "fonts")
+
+# alias -> (regular, negrita); solo TTF (reportlab no carga OTF/CFF)
+FONT_FAMILIES: Dict[str, Tuple[str, str]] = {
+    "OldStd": ("OldStandard-Regular.ttf", "OldStandard-Bold.ttf"),
+    "Playfair": ("PlayfairDisplay-Regular.ttf", "PlayfairDisplay-Bold.ttf"),
+    "Atkinson": ("Atkinson-Hyperlegible-Regular.ttf", "Atkinson-Hyperlegible-Bold.ttf"),
+    "Lexend": ("Lexend-Regular.ttf", "Lexend-Bold.ttf"),
+    "NotoSans": ("NotoSans-Regular.ttf", "NotoSans-Bold.ttf"),
+}
+
+_FONTS_LOCK = threading.Lock()
+_FONTS: Optional[Dict[str, Tuple[str, str]]] = None  # alias -> (nombre regular, nombre negrita)
+
+_STYLES_LOCK = threading.Lock()
+_STYLES: Dict[tuple, "PdfStyles"] = {}
+
+# ============================================================
+# Fuentes
+# ============================================================
+def register_fonts() -> Dict[str, Tuple[str, str]]:
+    """
+    Registra las familias disponibles (una sola vez por proceso) y devuelve
+    alias -> (fuente regular, fuente negrita). Si no hay negrita se usa la regular.
+    """
+    global _FONTS
+    if _FONTS is not None:
+        return _FONTS
+    with _FONTS_LOCK:
+        if _FONTS is not None:
+            return _FONTS
+        out: Dict[str, Tuple[str, str]] = {}
+        try:
+            from reportlab.pdfbase import pdfmetrics
+            from reportlab.pdfbase.ttfonts import TTFont
+            from reportlab.lib.fonts import addMapping
+        except Exception:
+            _FONTS = out
+            return out
+        for alias, (reg, bold) in FONT_FAMILIES.items():
+            reg_p, bold_p = os.path.join(FONTS_DIR, reg), os.path.join(FONTS_DIR, bold)
+            try:
+                if not os.path.exists(reg_p):
+                    continue
+                pdfmetrics.registerFont(TTFont(alias, reg_p))
+                bname = alias
+                if os.path.exists(bold_p):
+                    bname = f"{alias}-B"
+                    pdfmetrics.registerFont(TTFont(bname, bold_p))
+                # <b> dentro de Paragraph -> negrita de la familia
+                addMapping(alias, 0, 0, alias)
+                addMapping(alias, 1, 0, bname)
+                addMapping(alias, 0, 1, alias)
+                addMapping(alias, 1, 1, bname)
+                out[alias] = (alias, bname)
+            except Exception:
+                continue
+        _FONTS = out
+        return out
+
+def _family(name: Optional[str], fonts: Dict[str, Tuple[str, str]]) -> Optional[Tuple[str, str]]:
+    """'atkinson', 'Atkinson Hyperlegible', 'OldStd'... -> par registrado (o None)."""
+    key = "".join(ch for ch in str(name or "").lower() if ch.isalnum())
+    if not key:
+        return None
+    for alias, pair in fonts.items():
+        a = alias.lower()
+        if key == a or key.startswith(a) or a.startswith(key):
+            return pair
+    return None
+
+# ============================================================
+# Estilos
+# ============================================================
+class PdfStyles(NamedTuple):
+    SERIF: str
+    SERIF_B: str
+    DISPLAY: str
+    TEXT: str
+    TEXT_B: str
+    H1: object        # título del torneo / bandas
+    H_ROUND: object   # banda "RONDA N"
+    H2: object
+    H3: object
+    CAB: object       # cabecera azul de la ronda (nivel + fecha)
+    BODY: object      # nombres en el PDF de ronda
+    RES: object       # resultado centrado en el PDF de ronda
+    CELL: object      # celdas centradas (clasificación, fichas)
+    CELL_L: object    # celdas alineadas a la izquierda
+    META_SIZE: float
+    HEADER_BG: object
+    GRID: object
+    BAND_BG: object
+
+def _num(cfg: dict, key: str, default: float) -> float:
+    try:
+        v = float(cfg.get(key, default))
+        return v if v > 0 else default
+    except Exception:
+        return default
+
+def _color(cfg: dict, key: str, default):
+    from reportlab.lib import colors
+    v = cfg.get(key)
+    if not v:
+        return default
+    try:
+        return colors.HexColor(str(v)) if str(v).startswith("#") else getattr(colors, str(v))
+    except Exception:
+        return default
+
+def pdf_styles(cfg: Optional[dict] = None) -> PdfStyles:
+    """Estilos para la config dada (cacheados por el valor de sus claves pdf_*). Requiere reportlab."""
+    cfg = cfg or {}
+    key = tuple(sorted((k, str(v)) for k, v in cfg.items() if str(k).startswith("pdf_")))
+    got = _STYLES.get(key)
+    if got is not None:
+        return got
+    with _STYLES_LOCK:
+        got = _STYLES.get(key)
+        if got is not None:
+            return got
+        got = _STYLES[key] = _build_styles(cfg)
+        return got
+
+def _build_styles(cfg: dict) -> PdfStyles:
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+    fonts = register_fonts()
+    SERIF, SERIF_B = fonts.get("OldStd", ("Times-Roman", "Times-Bold"))
+    DISPLAY = fonts["Playfair"][1] if "Playfair" in fonts else SERIF_B
+    TEXT, TEXT_B = _family(cfg.get("pdf_font"), fonts) or (SERIF, SERIF_B)
+
+    title = _num(cfg, "pdf_title_size", 18)
+    rnd = _num(cfg, "pdf_round_size", 18)
+    normal = getSampleStyleSheet()["Normal"]
+
+    H1 = ParagraphStyle("H1", parent=normal, fontName=SERIF_B, fontSize=title, leading=title + 4, alignment=1, spaceAfter=2)
+    H_ROUND = ParagraphStyle("H_ROUND", parent=H1, fontSize=rnd, leading=rnd + 4)
+    H2 = ParagraphStyle("H2", parent=normal, fontName=DISPLAY, fontSize=28, leading=32, alignment=1, spaceAfter=4)
+    H3 = ParagraphStyle("H3", parent=normal, fontName=SERIF_B, fontSize=16, leading=20, alignment=1, spaceBefore=2, spaceAfter=4)
+    CAB = ParagraphStyle("CAB", fontName=SERIF_B, fontSize=20, leading=24, alignment=1)
+    BODY = ParagraphStyle("BODY", parent=normal, fontName=TEXT, fontSize=11.5, leading=14.2, leftIndent=0)
+    RES = ParagraphStyle("RES", parent=BODY, alignment=1)
+    CELL = ParagraphStyle("CELL", parent=normal, fontName=TEXT, fontSize=10.5, leading=13, alignment=1)
+    CELL_L = ParagraphStyle("CELL_L", parent=normal, fontName=TEXT, fontSize=10.5, leading=13, alignment=0)
+
+    return PdfStyles(
+        SERIF=SERIF, SERIF_B=SERIF_B, DISPLAY=DISPLAY, TEXT=TEXT, TEXT_B=TEXT_B,
+        H1=H1, H_ROUND=H_ROUND, H2=H2, H3=H3, CAB=CAB, BODY=BODY, RES=RES, CELL=CELL, CELL_L=CELL_L,
+        META_SIZE=_num(cfg, "pdf_meta_size", 14),
+        HEADER_BG=_color(cfg, "pdf_header_bg", colors.whitesmoke),
+        GRID=_color(cfg, "pdf_header_border", colors.lightgrey),
+        BAND_BG=_color(cfg, "pdf_meta_bg", colors.whitesmoke),
+    )
+
+def header_table_cmds(s: PdfStyles, font_size: float = 11.5, rule: float = 1.3) -> list:
+    """Comandos de TableStyle comunes: cabecera + doble línea + fila separadora 'fantasma'."""
+    from reportlab.lib import colors
+    return [
+        ("FONT", (0,0), (-1,0), s.SERIF_B, font_size),
+        ("BACKGROUND", (0,0), (-1,0), s.HEADER_BG),
+        ("ALIGN", (0,0), (-1,0), "CENTER"),
+        ("VALIGN", (0,0), (-1,0), "MIDDLE"),
+        ("BOTTOMPADDING", (0,0), (-1,0), 6),
+        ("TOPPADDING", (0,0), (-1,0), 6),
+        ("LINEBELOW", (0,0), (-1,0), rule, colors.black),
+        ("LINEBELOW", (0,1), (-1,1), 0.6, colors.black),
+        ("TOPPADDING", (0,1), (-1,1), 0),
+        ("BOTTOMPADDING", (0,1), (-1,1), 0),
+        ("FONTSIZE", (0,1), (-1,1), 1),
+        ("ROWHEIGHTS", (0,1), (-1,1), 2),
+    ]
@@ -0,0 +1,143 @@
+# lib/player_index.py
+# -*- coding: utf-8 -*-
+"""
+Índice de jugadores sobre las rondas publicadas (historial en Rondas).
+
+Se construye UNA vez por estado del torneo (firmas de las rondas) y da:
+- games: todas las partidas en un DataFrame (ronda, mesa, ids, nombres, resultado,
+  puntos de cada color ya decodificados);
+- id -> posiciones de fila como blancas / como negras;
+- token de nombre "plegado" (sin tildes, minúsculas) y sus prefijos -> ids.
+
+Así buscar por id o por parte del nombre cuesta O(aciertos), sin recorrer
+todas las partidas en cada pulsación.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from lib.results import canonical_results, decode_results
+from lib.tournament import read_round, round_sig
+
+GAME_COLS = ["ronda", "mesa", "blancas_id", "blancas_nombre", "negras_id", "negras_nombre", "resultado"]
+HIST_COLS = ["ronda", "mesa", "color", "rival", "resultado", "puntos"]
+
+_IDX_LOCK = threading.Lock()
+_IDX_CACHE: Dict[str, object] = {"key": None, "index": None}
+
+# ============================================================
+# Texto
+# ============================================================
+def fold_text(s: object) -> str:
+    """'Lucía  GARCÍA' -> 'lucia  garcia' (NFKD sin marcas diacríticas, minúsculas)."""
+    t = unicodedata.normalize("NFKD", str(s or ""))
+    return "".join(ch for ch in t if not unicodedata.combining(ch)).lower()
+
+def name_tokens(s: object) -> List[str]:
+    return [t for t in re.split(r"[^0-9a-z]+", fold_text(s)) if t]
+
+# ============================================================
+# Índice
+# ============================================================
+class PlayerIndex:
+    def __init__(self, games: pd.DataFrame):
+        self.games = games
+        self.white_rows: Dict[str, np.ndarray] = {}
+        self.black_rows: Dict[str, np.ndarray] = {}
+        self.prefixes: Dict[str, Set[str]] = {}
+        if games.empty:
+            return
+        wid = games["blancas_id"].astype(str).str.strip()
+        bid = games["negras_id"].astype(str).str.strip()
+        pos = pd.Series(np.arange(len(games)))
+        self.white_rows = {k: v for k, v in pos.groupby(wid.to_numpy()).indices.items() if k and k.upper() != "BYE"}
+        self.black_rows = {k: v for k, v in pos.groupby(bid.to_numpy()).indices.items() if k and k.upper() != "BYE"}
+        # nombre -> id (un nombre distinto por id y color basta)
+        pairs = pd.concat([
+            pd.DataFrame({"id": wid, "nombre": games["blancas_nombre"].astype(str)}),
+            pd.DataFrame({"id": bid, "nombre": games["negras_nombre"].astype(str)}),
+        ]).drop_duplicates()
+        for pid, nombre in zip(pairs["id"], pairs["nombre"]):
+            if not pid or pid.upper() == "BYE":
+                continue
+            for tok in name_tokens(nombre):
+                for k in range(1, len(tok) + 1):
+                    self.prefixes.setdefault(tok[:k], set()).add(pid)
+
+    def ids_for_name(self, query: Optional[str]) -> Set[str]:
+        """Ids cuyo nombre tiene, para cada palabra de la consulta, un token que empieza por ella."""
+        toks = name_tokens(query)
+        if not toks:
+            return set()
+        hits = [self.prefixes.get(t, set()) for t in toks]
+        out = set(min(hits, key=len))
+        for h in hits:
+            out &= h
+        return out
+
+    def rows_for(self, ids: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Posiciones de fila (como blancas, como negras) de los ids dados."""
+        ids = [str(i).strip() for i in ids if str(i).strip()]
+        empty = np.zeros(0, dtype=np.int64)
+        w = [self.white_rows[i] for i in ids if i in self.white_rows]
+        b = [self.black_rows[i] for i in ids if i in self.black_rows]
+        return (np.unique(np.concatenate(w)) if w else empty,
+                np.unique(np.concatenate(b)) if b else empty)
+
+    def history(self, player_id: Optional[str], player_name: Optional[str]) -> pd.DataFrame:
+        """Partidas del jugador (por id y/o parte del nombre): ronda, mesa, color, rival, resultado, puntos."""
+        ids = set(self.ids_for_name(player_name)) if (player_name or "").strip() else set()
+        if (player_id or "").strip():
+            ids.add(str(player_id).strip())
+        w_rows, b_rows = self.rows_for(ids)
+        if w_rows.size == 0 and b_rows.size == 0:
+            return pd.DataFrame(columns=HIST_COLS)
+        g = self.games
+        as_white = g.iloc[w_rows].assign(color="Blancas", rival=lambda d: d["negras_nombre"].astype(str), puntos=lambda d: d["pts_blancas"])
+        as_black = g.iloc[b_rows].assign(color="Negras", rival=lambda d: d["blancas_nombre"].astype(str), puntos=lambda d: d["pts_negras"])
+        hist = pd.concat([as_white, as_black], ignore_index=True)
+        return hist[HIST_COLS].sort_values(by=["ronda", "mesa"])
+
+def _load_games(rounds: List[int]) -> pd.DataFrame:
+    parts = []
+    for r in rounds:
+        df_r = read_round(r)
+        if df_r is None or df_r.empty:
+            continue
+        df_r = df_r.copy()
+        for col in GAME_COLS[1:]:
+            if col not in df_r.columns:
+                df_r[col] = ""
+        df_r["ronda"] = r
+        parts.append(df_r[GAME_COLS])
+    if not parts:
+        return pd.DataFrame(columns=GAME_COLS + ["pts_blancas", "pts_negras"])
+    out = pd.concat(parts, ignore_index=True)
+    out["resultado"] = canonical_results(out["resultado"])
+    # puntos con el mismo códec que la clasificación (vacío / no reconocido -> None)
+    dec = decode_results(out["resultado"], is_bye=out["negras_id"].astype(str).str.strip().str.upper().eq("BYE"))
+    out["pts_blancas"] = dec["white_pts"].where(dec["decided"])
+    out["pts_negras"] = dec["black_pts"].where(dec["decided"])
+    return out
+
+def player_index(rounds: Iterable[int]) -> PlayerIndex:
+    """Índice para estas rondas; se reconstruye solo si cambia alguna (firma de ronda)."""
+    rounds = sorted(int(r) for r in (rounds or []))
+    key = repr([(r, round_sig(r)) for r in rounds])
+    with _IDX_LOCK:
+        if _IDX_CACHE["key"] == key and _IDX_CACHE["index"] is not None:
+            return _IDX_CACHE["index"]
+    idx = PlayerIndex(_load_games(rounds))
+    with _IDX_LOCK:
+        _IDX_CACHE["key"], _IDX_CACHE["index"] = key, idx
+    return idx
+
+def clear_player_index() -> None:
+    with _IDX_LOCK:
+        _IDX_CACHE["key"] = _IDX_CACHE["index"] = None
@@ -0,0 +1,188 @@
+# lib/player_search.py
+# -*- coding: utf-8 -*-
+"""
+Búsqueda de jugadores en jugadores.csv (selector de Rondas, bye forzado en Administración).
+
+- Texto plegado (NFKD sin tildes, minúsculas): "Lucia" encuentra "Lucía".
+- Los tokens de nombre / apellido1 / apellido2 van a un trie de prefijos;
+  cada palabra de la consulta puede ser el principio de cualquiera de ellos,
+  en cualquier orden ("garcia luc" encuentra "Lucía García Martínez").
+- Si una palabra no es prefijo de nada se buscan tokens a distancia de edición
+  pequeña (erratas: "garica" -> "garcia").
+- Se ordena por coste total (exacto < prefijo < errata) y se devuelven los k mejores.
+
+El índice se reconstruye solo si cambia el fichero (mtime, tamaño).
+"""
+from __future__ import annotations
+
+import heapq
+import os
+import threading
+from typing import Dict, List, Optional, Set
+
+import pandas as pd
+
+from lib.player_index import fold_text, name_tokens
+from lib.tournament import DATA_DIR, file_sig, read_csv_safe
+
+JUG_PATH = os.path.join(DATA_DIR, "jugadores.csv")
+
+PREFIX_COST = 0.25   # la palabra es principio de un token (no el token entero)
+MISSING_COST = 3.0   # la palabra no aparece en el jugador
+
+_SEARCH_LOCK = threading.Lock()
+_SEARCH_CACHE: Dict[str, tuple] = {}  # ruta -> (firma, PlayerSearch)
+
+# ============================================================
+# Distancia de edición
+# ============================================================
+def edit_distance(a: str, b: str, max_d: int = 2) -> int:
+    """
+    Distancia de edición (con transposición de dos letras contiguas, "garica" -> "garcia" = 1),
+    acotada: devuelve max_d + 1 en cuanto se sabe que la supera.
+    """
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > max_d:
+        return max_d + 1
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > max_d:
+            return max_d + 1
+        prev2, prev = prev, cur
+    return min(prev[-1], max_d + 1)
+
+def _max_typos(tok: str) -> int:
+    return 0 if len(tok) <= 2 else (1 if len(tok) <= 5 else 2)
+
+# ============================================================
+# Trie
+# ============================================================
+class _Node:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.ids: Set[int] = set()  # jugadores con algún token que pasa por este nodo
+
+class PlayerSearch:
+    """Catálogo + trie de tokens. Las filas se identifican por su posición en `catalog`."""
+
+    def __init__(self, df: Optional[pd.DataFrame]):
+        self.catalog = _catalog(df)
+        self.root = _Node()
+        self.tokens: List[Set[str]] = []
+        self.vocab: Dict[int, Dict[str, Set[int]]] = {}  # longitud -> token -> filas
+        cols = [self.catalog[c].tolist() for c in ("nombre", "apellido1", "apellido2")]
+        for row, parts in enumerate(zip(*cols)):
+            toks = set(t for p in parts for t in name_tokens(p))
+            self.tokens.append(toks)
+            for tok in toks:
+                self.vocab.setdefault(len(tok), {}).setdefault(tok, set()).add(row)
+                node = self.root
+                for ch in tok:
+                    node = node.children.setdefault(ch, _Node())
+                    node.ids.add(row)
+        self.by_id = {pid: row for row, pid in enumerate(self.catalog["id"].tolist())}
+        self.orden: List[str] = self.catalog["orden"].tolist()
+
+    def _prefix(self, tok: str) -> Set[int]:
+        node = self.root
+        for ch in tok:
+            node = node.children.get(ch)
+            if node is None:
+                return set()
+        return node.ids
+
+    def _costs(self, tok: str) -> Dict[int, float]:
+        """Fila -> coste de la palabra `tok` (0 exacto, PREFIX_COST prefijo, distancia si errata)."""
+        out = {row: (0.0 if tok in self.tokens[row] else PREFIX_COST) for row in self._prefix(tok)}
+        if out:
+            return out
+        max_d = _max_typos(tok)
+        if not max_d:
+            return out
+        n = len(tok)
+        for length in range(max(1, n - max_d), n + max_d + 1):
+            for cand, rows in self.vocab.get(length, {}).items():
+                d = edit_distance(tok, cand, max_d)
+                if d > max_d:
+                    continue
+                for row in rows:
+                    if d < out.get(row, MISSING_COST):
+                        out[row] = float(d)
+        # errata en el principio de un token más largo ("garic" -> "garcia")
+        if not out:
+            for length, toks in self.vocab.items():
+                if length <= n + max_d:
+                    continue
+                for cand, rows in toks.items():
+                    d = edit_distance(tok, cand[:n], max_d)
+                    if d > max_d:
+                        continue
+                    for row in rows:
+                        out[row] = min(out.get(row, MISSING_COST), d + PREFIX_COST)
+        return out
+
+    def search(self, query: str, k: int = 10, active_only: bool = False) -> pd.DataFrame:
+        """Los k mejores jugadores para `query` (id exacto primero): columnas del catálogo + coste."""
+        q = str(query or "").strip()
+        if not q:
+            return self.catalog.iloc[0:0].assign(coste=[])
+        scores: Dict[int, float] = {}
+        if q in self.by_id:
+            scores[self.by_id[q]] = -1.0
+        toks = name_tokens(q)
+        per_tok = [self._costs(t) for t in toks]
+        rows: Set[int] = set()
+        for c in per_tok:
+            rows |= set(c)
+        for row in rows:
+            cost = sum(c.get(row, MISSING_COST) for c in per_tok)
+            if cost < scores.get(row, float("inf")):
+                scores[row] = cost
+        if active_only and scores:
+            activos = self.catalog["activo"].to_numpy()
+            scores = {r: s for r, s in scores.items() if activos[r]}
+        best = heapq.nsmallest(max(1, int(k)), scores.items(), key=lambda kv: (kv[1], self.orden[kv[0]]))
+        out = self.catalog.iloc[[r for r, _ in best]].copy()
+        out["coste"] = [s for _, s in best]
+        return out
+
+def _catalog(df: Optional[pd.DataFrame]) -> pd.DataFrame:
+    cols = ["id", "nombre", "apellido1", "apellido2", "nombre_completo", "curso_grupo", "activo", "orden", "etiqueta"]
+    if df is None or df.empty or "id" not in df.columns:
+        return pd.DataFrame(columns=cols)
+
+    def col(name):
+        return df[name].fillna("").astype(str).str.strip() if name in df.columns else pd.Series("", index=df.index)
+
+    out = pd.DataFrame({"id": col("id"), "nombre": col("nombre"), "apellido1": col("apellido1"), "apellido2": col("apellido2")})
+    out["nombre_completo"] = (out["nombre"] + " " + out["apellido1"] + " " + out["apellido2"]).str.replace(r"\s+", " ", regex=True).str.strip()
+    out["curso_grupo"] = (col("curso") + " " + col("grupo")).str.replace(r"\s+", " ", regex=True).str.strip()
+    out["activo"] = col("estado").str.lower().ne("retirado")
+    out["orden"] = out["nombre_completo"].map(fold_text)
+    out["etiqueta"] = out["id"] + " · " + out["nombre_completo"] + " (" + out["curso_grupo"] + ")"
+    return out[out["id"].ne("")].reset_index(drop=True)[cols]
+
+def player_search(path: Optional[str] = None) -> PlayerSearch:
+    """Servicio de búsqueda para jugadores.csv (cacheado por firma del fichero)."""
+    path = path or JUG_PATH
+    sig = file_sig(path)
+    with _SEARCH_LOCK:
+        got = _SEARCH_CACHE.get(path)
+        if got is not None and got[0] == sig:
+            return got[1]
+    svc = PlayerSearch(read_csv_safe(path) if sig is not None else None)
+    with _SEARCH_LOCK:
+        _SEARCH_CACHE[path] = (sig, svc)
+    return svc
+
+def search_players(query: str, k: int = 10, active_only: bool = False, path: Optional[str] = None) -> pd.DataFrame:
+    return player_search(path).search(query, k=k, active_only=active_only)
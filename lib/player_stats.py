@@ -0,0 +1,172 @@
+# lib/player_stats.py
+# -*- coding: utf-8 -*-
+"""
+Estadísticas por jugador materializadas en data/player_stats.csv (junto a standings.csv).
+
+Administración las reescribe al publicar/despublicar, al guardar resultados y al
+recalcular la clasificación; Clasificación solo las lee (y si faltan o están
+desfasadas las calcula en memoria, sin escribir).
+
+Columnas: id, partidas, victorias, tablas, derrotas, blancas, negras,
+inc_favor / inc_contra (incomparecencias a favor / en contra), byes, puntos,
+performance (% de puntos por partida jugada), media_rivales (puntos actuales
+medios de los rivales), rivales (ids separados por ';') y R1..Rn (puntos por ronda).
+
+Cada ronda se resume una sola vez por firma (round_sig): al cambiar un resultado
+solo se vuelve a leer esa ronda.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from lib.results import decode_results
+from lib.tournament import DATA_DIR, file_sig, read_round, round_sig, standings_from_rounds
+
+PLAYER_STATS_PATH = os.path.join(DATA_DIR, "player_stats.csv")
+PLAYER_STATS_KEY_PATH = os.path.join(DATA_DIR, "player_stats.key")  # firma de las rondas usadas
+JUG_PATH = os.path.join(DATA_DIR, "jugadores.csv")
+
+COUNT_COLS = ["partidas", "victorias", "tablas", "derrotas", "blancas", "negras", "inc_favor", "inc_contra", "byes"]
+STATS_COLS = ["id"] + COUNT_COLS + ["puntos", "performance", "media_rivales", "rivales"]
+
+_ROWS_LOCK = threading.Lock()
+_ROWS_CACHE: Dict[int, tuple] = {}  # ronda -> (clave, filas)
+
+# ============================================================
+# Resumen por ronda (una fila por jugador y partida)
+# ============================================================
+def _round_rows(r: int, bye_points: float) -> pd.DataFrame:
+    key = (round_sig(r), float(bye_points))
+    with _ROWS_LOCK:
+        hit = _ROWS_CACHE.get(r)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    rows = _rows_from_pairings(read_round(r), r, bye_points)
+    with _ROWS_LOCK:
+        _ROWS_CACHE[r] = (key, rows)
+    return rows
+
+def _rows_from_pairings(dfp: Optional[pd.DataFrame], r: int, bye_points: float) -> pd.DataFrame:
+    """Una fila por jugador emparejado; `decided` = hay resultado (las pendientes cuentan como rival)."""
+    cols = ["id", "ronda", "rival", "color", "pts", "decided", "bye", "ff"]
+    if dfp is None or dfp.empty or "resultado" not in dfp.columns:
+        return pd.DataFrame(columns=cols)
+    wid = dfp.get("blancas_id", pd.Series("", index=dfp.index)).fillna("").astype(str).str.strip()
+    bid = dfp.get("negras_id", pd.Series("", index=dfp.index)).fillna("").astype(str).str.strip()
+    dec = decode_results(dfp["resultado"], is_bye=bid.str.upper().eq("BYE"), bye_points=bye_points)
+    bye = dec["is_bye"]
+    ok = wid.ne("")
+    white = pd.DataFrame({
+        "id": wid[ok], "ronda": int(r), "rival": bid[ok].where(~bye[ok], ""),
+        "color": np.where(bye[ok], "", "b"), "pts": dec["white_pts"][ok].where(dec["decided"][ok]),
+        "decided": dec["decided"][ok], "bye": bye[ok], "ff": dec["is_forfeit"][ok],
+    })
+    okb = ok & ~bye & bid.ne("")
+    black = pd.DataFrame({
+        "id": bid[okb], "ronda": int(r), "rival": wid[okb], "color": "n",
+        "pts": dec["black_pts"][okb].where(dec["decided"][okb]),
+        "decided": dec["decided"][okb], "bye": False, "ff": dec["is_forfeit"][okb],
+    })
+    return pd.concat([white, black], ignore_index=True)[cols]
+
+# ============================================================
+# Tabla de estadísticas
+# ============================================================
+def build_player_stats(rounds: List[int], players_path: Optional[str] = None, bye_points: float = 1.0,
+                       standings: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Estadísticas de todos los jugadores de la clasificación tras `rounds`."""
+    rounds = sorted(int(r) for r in (rounds or []))
+    if standings is None:
+        standings = standings_from_rounds(rounds, players_path, bye_points=bye_points)
+    ids = standings["id"].astype(str) if "id" in standings.columns else pd.Series([], dtype=str)
+    out = pd.DataFrame({"id": ids.to_numpy()})
+    parts = [_round_rows(r, bye_points) for r in rounds]
+    parts = [p for p in parts if not p.empty]
+    g = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=["id", "ronda", "rival", "color", "pts", "decided", "bye", "ff"])
+
+    paired = g[~g["bye"].astype(bool)]                    # rivales (como en Buchholz)
+    played = paired[paired["decided"].astype(bool)]       # partidas con resultado
+    pts = played["pts"].astype(float)
+    ff = played["ff"].astype(bool)
+    counts = pd.DataFrame({
+        "partidas": played.groupby("id").size(),
+        "victorias": played[pts.eq(1.0)].groupby("id").size(),
+        "tablas": played[pts.eq(0.5)].groupby("id").size(),
+        "derrotas": played[pts.eq(0.0)].groupby("id").size(),
+        "blancas": played[played["color"].eq("b")].groupby("id").size(),
+        "negras": played[played["color"].eq("n")].groupby("id").size(),
+        "inc_favor": played[ff & pts.gt(0)].groupby("id").size(),
+        "inc_contra": played[ff & pts.eq(0)].groupby("id").size(),
+        "byes": g[g["bye"].astype(bool)].groupby("id").size(),
+    })
+    out = out.join(counts, on="id")
+    out[COUNT_COLS] = out[COUNT_COLS].fillna(0).astype(int)
+
+    st_pts = dict(zip(ids, pd.to_numeric(standings.get("puntos", 0.0), errors="coerce").fillna(0.0)))
+    st_pj = dict(zip(ids, pd.to_numeric(standings.get("pj", 0), errors="coerce").fillna(0)))
+    out["puntos"] = out["id"].map(st_pts).fillna(0.0).astype(float)
+    pj = out["id"].map(st_pj).fillna(0).astype(float)
+    out["performance"] = (out["puntos"] / pj.where(pj > 0) * 100).round(1).fillna(0.0)
+
+    # rivales y media de sus puntos actuales
+    riv = paired.assign(rival_pts=paired["rival"].map(st_pts).fillna(0.0).astype(float))
+    out["media_rivales"] = out["id"].map(riv.groupby("id")["rival_pts"].mean()).fillna(0.0).round(2)
+    out["rivales"] = out["id"].map(paired.sort_values("ronda").groupby("id")["rival"].agg(";".join)).fillna("")
+
+    # puntos por ronda (vacío si no jugó / sin resultado)
+    decided = g[g["decided"].astype(bool)]
+    if not decided.empty:
+        per_round = decided.pivot_table(index="id", columns="ronda", values="pts", aggfunc="sum")
+    else:
+        per_round = pd.DataFrame()
+    for r in rounds:
+        col = per_round[r] if r in per_round.columns else pd.Series(dtype=float)
+        out[f"R{r}"] = out["id"].map(col)
+    return out[STATS_COLS + [f"R{r}" for r in rounds]]
+
+def _stats_key(rounds: List[int], players_path: Optional[str], bye_points: float) -> str:
+    """Rondas + sus firmas + fichero de jugadores + puntos de BYE: si algo cambia, el CSV está desfasado."""
+    rounds = sorted(int(r) for r in (rounds or []))
+    path = players_path or JUG_PATH
+    return repr((rounds, [round_sig(r) for r in rounds], os.path.abspath(path), file_sig(path), float(bye_points)))
+
+def save_player_stats(rounds: List[int], players_path: Optional[str] = None, bye_points: float = 1.0,
+                      standings: Optional[pd.DataFrame] = None) -> Optional[str]:
+    """Recalcula y escribe data/player_stats.csv (atómico). Devuelve la ruta o None si falla."""
+    try:
+        df = build_player_stats(rounds, players_path, bye_points=bye_points, standings=standings)
+        tmp = PLAYER_STATS_PATH + ".tmp"
+        df.to_csv(tmp, index=False, encoding="utf-8")
+        os.replace(tmp, PLAYER_STATS_PATH)
+        with open(PLAYER_STATS_KEY_PATH + ".tmp", "w", encoding="utf-8") as f:
+            f.write(_stats_key(rounds, players_path, bye_points))
+        os.replace(PLAYER_STATS_KEY_PATH + ".tmp", PLAYER_STATS_KEY_PATH)
+        return PLAYER_STATS_PATH
+    except Exception:
+        return None
+
+def load_player_stats(rounds: List[int], players_path: Optional[str] = None,
+                      bye_points: float = 1.0) -> Optional[pd.DataFrame]:
+    """Lee data/player_stats.csv si corresponde a estas rondas (mismas firmas); si no, None."""
+    try:
+        with open(PLAYER_STATS_KEY_PATH, encoding="utf-8") as f:
+            if f.read().strip() != _stats_key(rounds, players_path, bye_points):
+                return None
+        df = pd.read_csv(PLAYER_STATS_PATH, dtype={"id": str, "rivales": str}, keep_default_na=False, na_values=[""])
+        df["rivales"] = df["rivales"].fillna("")
+        return df
+    except Exception:
+        return None
+
+def player_stats(rounds: List[int], players_path: Optional[str] = None, bye_points: float = 1.0,
+                 standings: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Para las páginas públicas: lo materializado si está al día; si no, cálculo en memoria."""
+    df = load_player_stats(rounds, players_path, bye_points=bye_points)
+    if df is not None:
+        return df
+    return build_player_stats(rounds, players_path, bye_points=bye_points, standings=standings)
@@ -0,0 +1,149 @@
+# lib/results.py
+# -*- coding: utf-8 -*-
+"""
+Códec único de resultados de partida.
+
+Convierte columnas de resultados "en bruto" (1-0, ½-½, 0,5-0,5, +/-, BYE0.5,
+guiones largos, espacios, None/nan...) en códigos canónicos y puntos, de forma
+vectorizada (una pasada por valores únicos, sin bucles por fila):
+
+  decode_results(s, is_bye=mask) -> code, white_pts, black_pts, is_forfeit, is_bye
+
+Códigos canónicos (categorías de RESULT_CODES):
+  ""         sin resultado
+  "1-0" "0-1" "1/2-1/2"
+  "+/-" "-/+"            incomparecencia (gana blancas / negras)
+  "BYE1.0" "BYE0.5" "BYE"
+  "?"        texto no reconocido
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+RESULT_CODES = ["", "1-0", "0-1", "1/2-1/2", "+/-", "-/+", "BYE1.0", "BYE0.5", "BYE", "?"]
+BYE_CODES = ("BYE1.0", "BYE0.5", "BYE")
+FORFEIT_CODES = ("+/-", "-/+")
+
+# Puntos (blancas, negras) por código en partida normal; "BYE" usa bye_points
+_POINTS = {
+    "1-0": (1.0, 0.0),
+    "0-1": (0.0, 1.0),
+    "1/2-1/2": (0.5, 0.5),
+    "+/-": (1.0, 0.0),
+    "-/+": (0.0, 1.0),
+    "BYE1.0": (1.0, 0.0),
+    "BYE0.5": (0.5, 0.0),
+}
+# Puntos del BYE (fila con negras = BYE) según el código; el resto usa bye_points
+_BYE_POINTS = {"BYE1.0": 1.0, "BYE0.5": 0.5}
+
+# Variantes aceptadas (ya en mayúsculas, sin espacios, '–'/'—' -> '-', '½' -> '1/2', ',' -> '.')
+_ALIASES = {
+    "1-0": "1-0", "1.0-0.0": "1-0", "1-0.0": "1-0", "1.0-0": "1-0",
+    "0-1": "0-1", "0.0-1.0": "0-1", "0-1.0": "0-1", "0.0-1": "0-1",
+    "1/2-1/2": "1/2-1/2", "0.5-0.5": "1/2-1/2", "=": "1/2-1/2", "=-=": "1/2-1/2", "TABLAS": "1/2-1/2",
+    "+/-": "+/-", "+-": "+/-", "1F-0F": "+/-", "1-0F": "+/-",
+    "-/+": "-/+", "-+": "-/+", "0F-1F": "-/+", "0-1F": "-/+",
+    "BYE1.0": "BYE1.0", "BYE1": "BYE1.0", "BYE(1)": "BYE1.0", "BYE+1": "BYE1.0",
+    "BYE0.5": "BYE0.5", "BYE1/2": "BYE0.5", "BYE.5": "BYE0.5", "BYE(0.5)": "BYE0.5", "BYE(1/2)": "BYE0.5",
+    "BYE": "BYE",
+}
+_NULL_LIKE = {"", "none", "nan", "n/a", "<na>", "null"}
+
+# ============================================================
+# Limpieza y normalización
+# ============================================================
+def clean_results(s: pd.Series) -> pd.Series:
+    """Recorta espacios y convierte None/nan/'None'/'nan'/'N/A' en ''. No reescribe el texto."""
+    if s is None:
+        return pd.Series([], dtype=object)
+    out = pd.Series(s, copy=False).astype(object).where(pd.notna(s), "").astype(str).str.strip()
+    return out.mask(out.str.lower().isin(_NULL_LIKE), "")
+
+def _canonical_map(values) -> dict:
+    """Código canónico para cada valor limpio (se aplica solo a los valores únicos)."""
+    out = {}
+    for v in values:
+        if v == "":
+            out[v] = ""
+            continue
+        t = (v.upper().replace(" ", "").replace("–", "-").replace("—", "-")
+              .replace("½", "1/2").replace(",", "."))
+        out[v] = _ALIASES.get(t, "?")
+    return out
+
+def result_codes(s: pd.Series) -> pd.Categorical:
+    """Códigos canónicos (Categorical con categorías RESULT_CODES; '?' = no reconocido)."""
+    clean = clean_results(s)
+    mapping = _canonical_map(clean.unique())
+    return pd.Categorical(clean.map(mapping), categories=RESULT_CODES)
+
+def canonical_results(s: pd.Series) -> pd.Series:
+    """Resultados reescritos en su forma canónica; el texto no reconocido se deja (limpio) tal cual."""
+    clean = clean_results(s)
+    mapping = _canonical_map(clean.unique())
+    codes = clean.map(mapping)
+    return codes.where(codes != "?", clean)
+
+def empty_count(s: Optional[pd.Series]) -> int:
+    """Número de resultados vacíos."""
+    if s is None:
+        return 0
+    return int((clean_results(s) == "").sum())
+
+# ============================================================
+# Decodificación vectorizada
+# ============================================================
+def decode_results(s: pd.Series, is_bye: Optional[pd.Series] = None, bye_points: float = 1.0) -> pd.DataFrame:
+    """
+    Decodifica una columna de resultados en un DataFrame (mismo índice):
+      code        Categorical con RESULT_CODES
+      white_pts   puntos de blancas (0.0 si no hay resultado)
+      black_pts   puntos de negras
+      is_forfeit  incomparecencia (+/-, -/+)
+      is_bye      fila de BYE (máscara `is_bye` si se da; si no, código BYE*)
+      decided     hay resultado que puntúa (o es BYE)
+
+    En filas de BYE, blancas reciben 1.0/0.5 según el código o `bye_points` si está vacío.
+    Un 'BYE' suelto en partida normal da `bye_points` a blancas (compatibilidad).
+    """
+    codes = result_codes(s)
+    idx = s.index if isinstance(s, pd.Series) else pd.RangeIndex(len(codes))
+    code_s = pd.Series(codes, index=idx)
+    cat_i = codes.codes  # posición en RESULT_CODES (-1 no aparece: todo mapea a una categoría)
+
+    w_tab = np.array([_POINTS.get(c, (0.0, 0.0))[0] for c in RESULT_CODES], dtype=float)
+    b_tab = np.array([_POINTS.get(c, (0.0, 0.0))[1] for c in RESULT_CODES], dtype=float)
+    w_tab[RESULT_CODES.index("BYE")] = float(bye_points)
+    w_pts = w_tab[cat_i]
+    b_pts = b_tab[cat_i]
+
+    if is_bye is None:
+        bye = code_s.isin(BYE_CODES).to_numpy()
+    else:
+        bye = pd.Series(is_bye, index=idx).fillna(False).astype(bool).to_numpy()
+    if bye.any():
+        bye_tab = np.array([_BYE_POINTS.get(c, float(bye_points)) for c in RESULT_CODES], dtype=float)
+        w_pts = np.where(bye, bye_tab[cat_i], w_pts)
+        b_pts = np.where(bye, 0.0, b_pts)
+
+    decided = (~code_s.isin(["", "?"])).to_numpy() | bye
+    return pd.DataFrame({
+        "code": code_s,
+        "white_pts": w_pts,
+        "black_pts": b_pts,
+        "is_forfeit": code_s.isin(FORFEIT_CODES).to_numpy(),
+        "is_bye": bye,
+        "decided": decided,
+    }, index=idx)
+
+def points_label(pts: float) -> str:
+    """1.0 -> '1', 0.5 -> '½', 0.0 -> '0' (para tablas y cuadros)."""
+    if pts is None or (isinstance(pts, float) and np.isnan(pts)):
+        return ""
+    if pts == 0.5:
+        return "½"
+    return str(int(pts)) if float(pts).is_integer() else str(pts)
@@ -0,0 +1,166 @@
+# lib/shared_cache.py
+# -*- coding: utf-8 -*-
+"""
+Caché compartida por TODAS las sesiones del servidor (nivel de proceso) para los
+artefactos derivados del estado del torneo: clasificación, estadísticas por jugador,
+cuadro del torneo y tabla de partidas de todas las rondas (Rondas).
+
+- Cada artefacto se guarda con la huella del estado (versión del torneo de
+  data/state_version.json + rondas publicadas + puntos de BYE + desempates): si la huella
+  no cambia, todas las sesiones reutilizan el mismo resultado sin mirar ningún CSV.
+- Cálculo de vuelo único: tras publicar, UNA sesión recalcula; las demás esperan a que
+  termine (hasta `wait` segundos) y, si se cansan, reciben la versión anterior.
+- Los DataFrames se devuelven copiados: las páginas pueden añadir columnas sin
+  ensuciar lo que ven las demás sesiones.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from lib.tournament import PLAYERS_PATH, state_version, tiebreak_order
+
+DEFAULT_WAIT = 30.0  # segundos que una sesión espera al cálculo de otra
+
+_SHARED_LOCK = threading.Lock()
+_SHARED: Dict[str, "_Slot"] = {}
+_STATS = {"hits": 0, "misses": 0, "waits": 0, "stale": 0}
+
+class _Slot:
+    """Último valor de un artefacto + cálculo en curso (si lo hay)."""
+    __slots__ = ("key", "value", "at", "pending_key", "done")
+
+    def __init__(self):
+        self.key: Any = None
+        self.value: Any = None
+        self.at: float = 0.0
+        self.pending_key: Any = None
+        self.done: Optional[threading.Event] = None
+
+# ============================================================
+# Huella del estado del torneo
+# ============================================================
+def state_fingerprint(rounds: Iterable[int], players_path: Optional[str] = None,
+                      bye_points: float = 1.0) -> tuple:
+    """
+    Lo que determina clasificación/estadísticas/cuadro: si no cambia, el resultado tampoco.
+    Cualquier escritura del torneo sube state_version(), así que basta una lectura de ese fichero.
+    """
+    rounds = sorted(int(r) for r in (rounds or []))
+    return (
+        state_version(),
+        tuple(rounds),
+        os.path.abspath(players_path or PLAYERS_PATH),
+        float(bye_points),
+        tuple(tiebreak_order()),
+    )
+
+# ============================================================
+# Vuelo único
+# ============================================================
+def shared_get(name: str, key: Any, compute: Callable[[], Any], wait: float = DEFAULT_WAIT) -> Any:
+    """
+    Valor de `name` para la huella `key`. Si falta, lo calcula UNA sola sesión; las que
+    llegan mientras tanto esperan su resultado. Si la espera supera `wait` y hay una
+    versión anterior, se sirve esa (y se vuelve a intentar en la siguiente ejecución).
+    """
+    with _SHARED_LOCK:
+        slot = _SHARED.setdefault(name, _Slot())
+        if slot.key == key:
+            _STATS["hits"] += 1
+            return slot.value
+        if slot.done is not None and slot.pending_key == key:
+            done, leader = slot.done, False
+        else:
+            done, leader = threading.Event(), True
+            slot.pending_key, slot.done = key, done
+            _STATS["misses"] += 1
+
+    if not leader:
+        with _SHARED_LOCK:
+            _STATS["waits"] += 1
+        done.wait(max(0.0, float(wait)))
+        with _SHARED_LOCK:
+            if slot.key == key:
+                return slot.value
+            if slot.value is not None and slot.key is not None:
+                _STATS["stale"] += 1
+                return slot.value
+        # sin versión anterior (o el cálculo falló): se calcula aquí, sin publicar
+        return compute()
+
+    try:
+        value = compute()
+    except Exception:
+        with _SHARED_LOCK:
+            if slot.done is done:
+                slot.pending_key, slot.done = None, None
+        done.set()
+        raise
+    with _SHARED_LOCK:
+        slot.key, slot.value, slot.at = key, value, time.time()
+        if slot.done is done:
+            slot.pending_key, slot.done = None, None
+    done.set()
+    return value
+
+def clear_shared_cache(name: Optional[str] = None) -> None:
+    """Olvida un artefacto (o todos). Los cálculos en curso terminan y se publican igualmente."""
+    with _SHARED_LOCK:
+        if name is None:
+            for slot in _SHARED.values():
+                slot.key = slot.value = None
+        elif name in _SHARED:
+            _SHARED[name].key = _SHARED[name].value = None
+
+def shared_cache_stats() -> dict:
+    """Aciertos / cálculos / esperas / versiones anteriores servidas y artefactos en memoria."""
+    with _SHARED_LOCK:
+        out = dict(_STATS)
+        out["items"] = {n: s.at for n, s in _SHARED.items() if s.key is not None}
+    return out
+
+def _copy(df: pd.DataFrame) -> pd.DataFrame:
+    return df.copy() if isinstance(df, pd.DataFrame) else df
+
+# ============================================================
+# Artefactos
+# ============================================================
+def shared_standings(rounds: List[int], players_path: Optional[str] = None, bye_points: float = 1.0) -> pd.DataFrame:
+    from lib.tournament import standings_from_rounds
+    key = state_fingerprint(rounds, players_path, bye_points)
+    return _copy(shared_get(f"standings:{players_path or PLAYERS_PATH}", key,
+                            lambda: standings_from_rounds(rounds, players_path, bye_points=bye_points)))
+
+def shared_rank_history(rounds: List[int], players_path: Optional[str] = None, bye_points: float = 1.0) -> pd.DataFrame:
+    from lib.tournament import rank_history
+    key = state_fingerprint(rounds, players_path, bye_points)
+    return _copy(shared_get(f"rank_history:{players_path or PLAYERS_PATH}", key,
+                            lambda: rank_history(rounds, players_path, bye_points=bye_points)))
+
+def shared_player_stats(rounds: List[int], players_path: Optional[str] = None, bye_points: float = 1.0,
+                        standings: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    from lib.player_stats import player_stats
+    key = state_fingerprint(rounds, players_path, bye_points)
+    return _copy(shared_get(f"player_stats:{players_path or PLAYERS_PATH}", key,
+                            lambda: player_stats(rounds, players_path, bye_points=bye_points, standings=standings)))
+
+def shared_crosstable(df_st: pd.DataFrame, rounds: List[int], sparse: bool = False,
+                      players_path: Optional[str] = None, bye_points: float = 1.0) -> pd.DataFrame:
+    """Cuadro por posiciones (doble entrada o rivales por ronda) de la clasificación `df_st`."""
+    from lib.exports import build_crosstable_df_positions, build_crosstable_sparse
+    build = build_crosstable_sparse if sparse else build_crosstable_df_positions
+    key = state_fingerprint(rounds, players_path, bye_points)
+    name = f"crosstable:{'sparse' if sparse else 'dense'}:{players_path or PLAYERS_PATH}"
+    return _copy(shared_get(name, key, lambda: build(df_st, rounds)))
+
+def shared_player_index(rounds: List[int]):
+    """Índice de jugadores / tabla de partidas de todas las rondas (solo lectura: no se copia)."""
+    from lib.player_index import player_index
+    rounds = sorted(int(r) for r in (rounds or []))
+    key = state_fingerprint(rounds)
+    return shared_get("player_index", key, lambda: player_index(rounds))
@@ -0,0 +1,281 @@
+# lib/simulator.py
+# -*- coding: utf-8 -*-
+"""
+Simulador de torneos suizos sin interfaz (no toca data/).
+
+- Genera N jugadores sintéticos con el esquema de jugadores.csv
+- Empareja R rondas con las funciones reales (pair_round: 'greedy' / 'mwm')
+- Sortea resultados con un modelo configurable ('aleatorio', 'elo', 'blancas')
+- Mide tiempos (emparejar, apply_results, compute_standings, motor columnar)
+  y calidad del emparejamiento (repeticiones, colores, flotantes, BYE repetidos)
+- Escribe informes JSON y CSV
+
+Uso (ejemplos):
+  python -m lib.simulator --players 20 200 1000 --engines greedy mwm
+  python -m lib.simulator --players 5000 --engines greedy --rounds 9 --model elo \
+      --json reports/sim.json --csv reports/sim_rounds.csv
+"""
+from __future__ import annotations
+
+import os
+import sys
+import csv
+import json
+import time
+import random
+import argparse
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from lib.tournament import (
+    read_players_from_csv, read_players_df, apply_results, compute_standings,
+    games_from_pairings, compute_standings_from_games, pair_round, recommended_rounds,
+    PAIRING_ENGINES, GAME_COLUMNS,
+)
+
+RESULT_MODELS = ("aleatorio", "elo", "blancas")
+
+_NOMBRES = ["Lucía", "Hugo", "Martina", "Mateo", "Sofía", "Leo", "Julia", "Daniel", "Paula", "Pablo",
+            "Valeria", "Álvaro", "Emma", "Manuel", "Carla", "Adrián", "Noa", "David", "Alba", "Mario"]
+_APELLIDOS = ["García", "Rodríguez", "González", "Fernández", "López", "Martínez", "Sánchez", "Pérez",
+              "Gómez", "Martín", "Jiménez", "Ruiz", "Hernández", "Díaz", "Moreno", "Muñoz", "Álvarez",
+              "Romero", "Alonso", "Gutiérrez"]
+
+# ============================================================
+# Jugadores sintéticos
+# ============================================================
+def make_players(n: int, seed: int = 1, retired_rate: float = 0.0) -> pd.DataFrame:
+    """DataFrame con el esquema de jugadores.csv (id,nombre,apellido1,apellido2,curso,grupo,estado)."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(1, int(n) + 1):
+        rows.append({
+            "id": str(i),
+            "nombre": rng.choice(_NOMBRES),
+            "apellido1": rng.choice(_APELLIDOS),
+            "apellido2": rng.choice(_APELLIDOS),
+            "curso": f"{rng.randint(1, 4)}º ESO",
+            "grupo": rng.choice("ABCD"),
+            "estado": "retirado" if rng.random() < retired_rate else "activo",
+        })
+    return pd.DataFrame(rows, columns=["id", "nombre", "apellido1", "apellido2", "curso", "grupo", "estado"])
+
+# ============================================================
+# Modelos de resultado
+# ============================================================
+def draw_result(model: str, rng: random.Random, white: dict, black: dict,
+                draw_rate: float = 0.1, forfeit_rate: float = 0.0) -> str:
+    """
+    Resultado de una partida según el modelo:
+      - aleatorio: victoria blancas/negras al 50% (descontadas tablas)
+      - blancas:   ventaja de blancas (55/45)
+      - elo:       esperanza de Elo con la fuerza oculta 'rating' de cada jugador
+    """
+    if forfeit_rate and rng.random() < forfeit_rate:
+        return rng.choice(["+/-", "-/+"])
+    if rng.random() < draw_rate:
+        return "1/2-1/2"
+    if model == "elo":
+        p_white = 1.0 / (1.0 + 10 ** ((black.get("rating", 1500) - white.get("rating", 1500)) / 400.0))
+    elif model == "blancas":
+        p_white = 0.55
+    else:
+        p_white = 0.5
+    return "1-0" if rng.random() < p_white else "0-1"
+
+# ============================================================
+# Métricas de calidad
+# ============================================================
+def pairing_metrics(players: Dict[str, dict], df_pairs: pd.DataFrame) -> dict:
+    """Calidad del emparejamiento respecto al estado previo a la ronda."""
+    rematches = floats = repeat_bye = color_violations = 0
+    score_diff = 0.0
+    for w, b in zip(df_pairs["blancas_id"].astype(str), df_pairs["negras_id"].astype(str)):
+        if b == "BYE":
+            repeat_bye += int(bool(players[w].get("had_bye", False)))
+            continue
+        pw, pb = players[w], players[b]
+        rematches += int(b in set(pw.get("opponents", [])))
+        d = abs(float(pw.get("points", 0.0)) - float(pb.get("points", 0.0)))
+        floats += int(d > 0)
+        score_diff += d
+        cw, cb = pw.get("colors", []), pb.get("colors", [])
+        color_violations += int(len(cw) >= 2 and cw[-1] == cw[-2] == "W")
+        color_violations += int(len(cb) >= 2 and cb[-1] == cb[-2] == "B")
+    return {
+        "rematches": rematches,
+        "color_violations": color_violations,
+        "floats": floats,
+        "score_diff": round(score_diff, 2),
+        "repeat_bye": repeat_bye,
+    }
+
+# ============================================================
+# Simulación
+# ============================================================
+def simulate(n_players: int, rounds: Optional[int] = None, engine: str = "mwm", model: str = "aleatorio",
+             draw_rate: float = 0.1, forfeit_rate: float = 0.0, seed: int = 1,
+             bye_points: float = 1.0, retired_rate: float = 0.0) -> dict:
+    """
+    Simula un torneo completo en un directorio temporal y devuelve
+    {"params": ..., "rounds": [métricas por ronda], "summary": ...}.
+    """
+    rounds = int(rounds or recommended_rounds(n_players))
+    rng = random.Random(seed)
+    random.seed(seed)  # los emparejadores barajan con el random global
+
+    tmpdir = tempfile.mkdtemp(prefix="sim_torneo_")
+    jug_path = os.path.join(tmpdir, "jugadores.csv")
+    make_players(n_players, seed=seed, retired_rate=retired_rate).to_csv(jug_path, index=False, encoding="utf-8")
+
+    state = read_players_from_csv(jug_path)
+    players_df = read_players_df(jug_path)
+    ratings = {pid: rng.gauss(1500, 200) for pid in state}
+    games_parts: List[pd.DataFrame] = []
+    per_round: List[dict] = []
+
+    for r in range(1, rounds + 1):
+        t0 = time.perf_counter()
+        df = pair_round(state, r, engine=engine)
+        t_pair = time.perf_counter() - t0
+
+        metrics = pairing_metrics(state, df)
+
+        res = []
+        for w, b in zip(df["blancas_id"].astype(str), df["negras_id"].astype(str)):
+            if b == "BYE":
+                res.append("")
+            else:
+                res.append(draw_result(model, rng, {"rating": ratings[w]}, {"rating": ratings[b]},
+                                       draw_rate=draw_rate, forfeit_rate=forfeit_rate))
+        df["resultado"] = res
+
+        t0 = time.perf_counter()
+        state = apply_results(state, df, bye_points=bye_points)
+        t_apply = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        compute_standings(state)
+        t_stand = time.perf_counter() - t0
+
+        games_parts.append(games_from_pairings(df, r, bye_points=bye_points))
+        t0 = time.perf_counter()
+        games = pd.concat(games_parts, ignore_index=True) if games_parts else pd.DataFrame(columns=GAME_COLUMNS)
+        compute_standings_from_games(players_df, games)
+        t_cols = time.perf_counter() - t0
+
+        per_round.append({
+            "engine": engine,
+            "players": n_players,
+            "round": r,
+            "boards": int(len(df)),
+            "t_pair_s": round(t_pair, 5),
+            "t_apply_s": round(t_apply, 5),
+            "t_standings_s": round(t_stand, 5),
+            "t_standings_cols_s": round(t_cols, 5),
+            **metrics,
+        })
+
+    def _sum(k): return sum(x[k] for x in per_round)
+    def _max(k): return max((x[k] for x in per_round), default=0)
+    summary = {
+        "engine": engine,
+        "players": n_players,
+        "rounds": rounds,
+        "t_pair_max_s": _max("t_pair_s"),
+        "t_pair_total_s": round(_sum("t_pair_s"), 5),
+        "t_apply_total_s": round(_sum("t_apply_s"), 5),
+        "t_standings_max_s": _max("t_standings_s"),
+        "t_standings_cols_max_s": _max("t_standings_cols_s"),
+        "rematches": _sum("rematches"),
+        "color_violations": _sum("color_violations"),
+        "floats": _sum("floats"),
+        "score_diff": round(_sum("score_diff"), 2),
+        "repeat_bye": _sum("repeat_bye"),
+    }
+    try:
+        import shutil
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    except Exception:
+        pass
+    return {
+        "params": {"players": n_players, "rounds": rounds, "engine": engine, "model": model,
+                   "draw_rate": draw_rate, "forfeit_rate": forfeit_rate, "seed": seed,
+                   "bye_points": bye_points, "retired_rate": retired_rate},
+        "rounds": per_round,
+        "summary": summary,
+    }
+
+# ============================================================
+# Informes
+# ============================================================
+def write_reports(results: List[dict], json_path: Optional[str] = None, csv_path: Optional[str] = None) -> None:
+    """Vuelca los resultados: JSON completo y/o CSV con una fila por ronda."""
+    if json_path:
+        os.makedirs(os.path.dirname(os.path.abspath(json_path)), exist_ok=True)
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({"created_at": datetime.now().isoformat(timespec="seconds"), "runs": results},
+                      f, ensure_ascii=False, indent=2)
+    if csv_path:
+        rows = [row for res in results for row in res["rounds"]]
+        if not rows:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(csv_path)), exist_ok=True)
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            w = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            w.writeheader()
+            w.writerows(rows)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Simulador de torneo suizo (benchmark de emparejadores)")
+    ap.add_argument("--players", type=int, nargs="+", default=[20, 200, 1000], help="Tamaños de torneo a simular")
+    ap.add_argument("--rounds", type=int, default=None, help="Rondas (por defecto: recomendadas para N)")
+    ap.add_argument("--engines", nargs="+", default=list(PAIRING_ENGINES), choices=list(PAIRING_ENGINES))
+    ap.add_argument("--model", default="aleatorio", choices=list(RESULT_MODELS), help="Modelo de resultados")
+    ap.add_argument("--draw-rate", type=float, default=0.1)
+    ap.add_argument("--forfeit-rate", type=float, default=0.0)
+    ap.add_argument("--retired-rate", type=float, default=0.0)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--json", default=None, help="Ruta del informe JSON (p. ej. reports/sim.json)")
+    ap.add_argument("--csv", default=None, help="Ruta del CSV por ronda (p. ej. reports/sim_rounds.csv)")
+    ap.add_argument("--max-pair-s", type=float, default=0.0, help="Falla (código 1) si alguna ronda tarda más")
+    args = ap.parse_args(argv)
+
+    # Calentar imports perezosos (networkx) para no contarlos en la primera ronda
+    for engine in args.engines:
+        simulate(4, rounds=1, engine=engine, seed=args.seed)
+
+    results = []
+    failed = False
+    hdr = f"{'motor':<8}{'jug.':>6}{'rond.':>6}{'emp. máx s':>12}{'clas. máx s':>12}{'repet.':>8}{'color':>7}{'flot.':>7}{'BYE rep':>8}"
+    print(hdr)
+    for n in args.players:
+        for engine in args.engines:
+            res = simulate(n, rounds=args.rounds, engine=engine, model=args.model, draw_rate=args.draw_rate,
+                           forfeit_rate=args.forfeit_rate, seed=args.seed, retired_rate=args.retired_rate)
+            s = res["summary"]
+            print(f"{engine:<8}{n:>6}{s['rounds']:>6}{s['t_pair_max_s']:>12.3f}{s['t_standings_max_s']:>12.3f}"
+                  f"{s['rematches']:>8}{s['color_violations']:>7}{s['floats']:>7}{s['repeat_bye']:>8}")
+            if args.max_pair_s and s["t_pair_max_s"] > args.max_pair_s:
+                failed = True
+            results.append(res)
+
+    write_reports(results, json_path=args.json, csv_path=args.csv)
+    if args.json:
+        print(f"[OK] JSON: {args.json}")
+    if args.csv:
+        print(f"[OK] CSV: {args.csv}")
+    if failed:
+        print(f"[!] Algún emparejamiento supera {args.max_pair_s:.2f}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,399 @@
+# lib/sqlite_store.py
+# -*- coding: utf-8 -*-
+"""
+Backend opcional SQLite (sqlite3 de la stdlib, modo WAL) para el torneo.
+
+Se activa con `"storage": "sqlite"` en config.json; lib/tournament.py delega
+aquí lectura/escritura de rondas y el estado de publicación. Tablas:
+
+  players(id, pos, nombre, apellido1, apellido2, curso, grupo, estado)
+  rounds(round, published, seed, version, updated_at)
+  games(round, idx, mesa, blancas_id, blancas_nombre, negras_id, negras_nombre, resultado, extra)
+  sources(name, sig)      -> firmas de los CSV importados (puente CSV)
+
+jugadores.csv sigue siendo la vía de carga de jugadores: la tabla `players` se
+reimporta sola cuando cambia la firma del CSV. Las rondas viven en la BD; el
+puente import_csv / export_csv las vuelca desde/hacia pairings_R{i}.csv
+(backups, restauraciones, descargas).
+"""
+from __future__ import annotations
+
+import os
+import re
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+PAIRING_COLUMNS = ["mesa", "blancas_id", "blancas_nombre", "negras_id", "negras_nombre", "resultado"]
+PLAYER_COLUMNS = ["id", "nombre", "apellido1", "apellido2", "curso", "grupo", "estado"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    id        TEXT PRIMARY KEY,
+    pos       INTEGER NOT NULL,
+    nombre    TEXT NOT NULL DEFAULT '',
+    apellido1 TEXT NOT NULL DEFAULT '',
+    apellido2 TEXT NOT NULL DEFAULT '',
+    curso     TEXT NOT NULL DEFAULT '',
+    grupo     TEXT NOT NULL DEFAULT '',
+    estado    TEXT NOT NULL DEFAULT 'activo'
+);
+CREATE TABLE IF NOT EXISTS rounds (
+    round      INTEGER PRIMARY KEY,
+    published  INTEGER NOT NULL DEFAULT 0,
+    seed       TEXT,
+    version    INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_rounds_published ON rounds(published);
+CREATE TABLE IF NOT EXISTS games (
+    round          INTEGER NOT NULL REFERENCES rounds(round) ON DELETE CASCADE,
+    idx            INTEGER NOT NULL,
+    mesa           TEXT NOT NULL DEFAULT '',
+    blancas_id     TEXT NOT NULL DEFAULT '',
+    blancas_nombre TEXT NOT NULL DEFAULT '',
+    negras_id      TEXT NOT NULL DEFAULT '',
+    negras_nombre  TEXT NOT NULL DEFAULT '',
+    resultado      TEXT NOT NULL DEFAULT '',
+    extra          TEXT,
+    PRIMARY KEY (round, idx)
+);
+CREATE INDEX IF NOT EXISTS ix_games_round_mesa ON games(round, mesa);
+CREATE INDEX IF NOT EXISTS ix_games_white ON games(blancas_id);
+CREATE INDEX IF NOT EXISTS ix_games_black ON games(negras_id);
+CREATE TABLE IF NOT EXISTS sources (
+    name TEXT PRIMARY KEY,
+    sig  TEXT
+);
+"""
+
+# ============================================================
+# Conexión (una por hilo y ruta)
+# ============================================================
+_LOCAL = threading.local()
+_INIT_LOCK = threading.Lock()
+_INITIALIZED: set = set()
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """Conexión del hilo actual a `db_path` (WAL, claves foráneas, esquema creado)."""
+    db_path = os.path.abspath(db_path)
+    conns = getattr(_LOCAL, "conns", None)
+    if conns is None:
+        conns = _LOCAL.conns = {}
+    con = conns.get(db_path)
+    if con is not None:
+        return con
+
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    con = sqlite3.connect(db_path, timeout=10)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    con.execute("PRAGMA foreign_keys=ON")
+    with _INIT_LOCK:
+        if db_path not in _INITIALIZED:
+            con.executescript(_SCHEMA)
+            _INITIALIZED.add(db_path)
+    conns[db_path] = con
+    return con
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+def _clean(v) -> str:
+    if v is None:
+        return ""
+    try:
+        if pd.isna(v):
+            return ""
+    except Exception:
+        pass
+    return str(v).strip()
+
+# ============================================================
+# Rondas y partidas
+# ============================================================
+def list_rounds(db_path: str) -> List[int]:
+    """Rondas con partidas guardadas, en orden ascendente."""
+    con = connect(db_path)
+    return [int(r[0]) for r in con.execute("SELECT DISTINCT round FROM games ORDER BY round")]
+
+def round_exists(db_path: str, i: int) -> bool:
+    con = connect(db_path)
+    return con.execute("SELECT 1 FROM games WHERE round=? LIMIT 1", (int(i),)).fetchone() is not None
+
+def round_version(db_path: str, i: int) -> Optional[int]:
+    """Contador de cambios de la ronda; no se reinicia al borrarla (None si nunca existió)."""
+    con = connect(db_path)
+    row = con.execute("SELECT version FROM rounds WHERE round=?", (int(i),)).fetchone()
+    return int(row[0]) if row else None
+
+def round_updated_at(db_path: str, i: int) -> Optional[str]:
+    """Fecha-hora ISO (local) del último cambio de la ronda, o None."""
+    con = connect(db_path)
+    row = con.execute(
+        "SELECT updated_at FROM rounds WHERE round=? AND EXISTS (SELECT 1 FROM games WHERE games.round=rounds.round)",
+        (int(i),),
+    ).fetchone()
+    return str(row[0]) if row and row[0] else None
+
+def read_round(db_path: str, i: int) -> Optional[pd.DataFrame]:
+    """
+    Emparejamientos de la ronda i con las mismas columnas y dtypes que
+    read_csv_safe(pairings_R{i}.csv): texto, vacíos como NaN. None si no existe.
+    """
+    con = connect(db_path)
+    rows = con.execute(
+        "SELECT mesa, blancas_id, blancas_nombre, negras_id, negras_nombre, resultado, extra "
+        "FROM games WHERE round=? ORDER BY idx", (int(i),)
+    ).fetchall()
+    if not rows:
+        return None
+    recs = []
+    extra_cols: List[str] = []
+    for r in rows:
+        rec = dict(zip(PAIRING_COLUMNS, r[:6]))
+        if r[6]:
+            try:
+                ex = json.loads(r[6])
+                for k in ex:
+                    if k not in extra_cols:
+                        extra_cols.append(k)
+                rec.update(ex)
+            except Exception:
+                pass
+        recs.append(rec)
+    df = pd.DataFrame(recs, columns=PAIRING_COLUMNS + extra_cols).fillna("").astype(str)
+    return df.mask(df == "")
+
+def _game_rows(df: pd.DataFrame) -> List[tuple]:
+    extra_cols = [c for c in df.columns if c not in PAIRING_COLUMNS]
+    out = []
+    for idx, rec in enumerate(df.to_dict("records")):
+        base = tuple(_clean(rec.get(c)) for c in PAIRING_COLUMNS)
+        extra = {c: _clean(rec.get(c)) for c in extra_cols}
+        out.append((idx,) + base + (json.dumps(extra, ensure_ascii=False) if extra else None,))
+    return out
+
+def _touch_round(con: sqlite3.Connection, i: int) -> None:
+    con.execute("INSERT OR IGNORE INTO rounds(round) VALUES (?)", (int(i),))
+    con.execute("UPDATE rounds SET version = version + 1, updated_at=? WHERE round=?", (_now(), int(i)))
+
+def save_round(db_path: str, i: int, df: pd.DataFrame) -> int:
+    """
+    Guarda los emparejamientos de la ronda i. Si la estructura (mesas y jugadores)
+    no cambia, solo se actualizan las filas distintas (p. ej. resultados); si cambia,
+    se reescribe la ronda. Devuelve el nº de filas escritas.
+    """
+    i = int(i)
+    new_rows = _game_rows(df if df is not None else pd.DataFrame(columns=PAIRING_COLUMNS))
+    con = connect(db_path)
+    with con:
+        old = con.execute(
+            "SELECT idx, mesa, blancas_id, blancas_nombre, negras_id, negras_nombre, resultado, extra "
+            "FROM games WHERE round=? ORDER BY idx", (i,)
+        ).fetchall()
+        same_shape = len(old) == len(new_rows) and all(
+            (o[0], o[1], o[2], o[4]) == (n[0], n[1], n[2], n[4]) for o, n in zip(old, new_rows)
+        )
+        if same_shape:
+            changed = [n for o, n in zip(old, new_rows) if tuple(o) != tuple(n)]
+            if changed:
+                con.executemany(
+                    "UPDATE games SET blancas_nombre=?, negras_nombre=?, resultado=?, extra=? "
+                    "WHERE round=? AND idx=?",
+                    [(n[3], n[5], n[6], n[7], i, n[0]) for n in changed],
+                )
+                _touch_round(con, i)
+            return len(changed)
+
+        con.execute("INSERT OR IGNORE INTO rounds(round) VALUES (?)", (i,))
+        con.execute("DELETE FROM games WHERE round=?", (i,))
+        con.executemany(
+            "INSERT INTO games(round, idx, mesa, blancas_id, blancas_nombre, negras_id, negras_nombre, resultado, extra) "
+            "VALUES (?,?,?,?,?,?,?,?,?)",
+            [(i,) + n for n in new_rows],
+        )
+        _touch_round(con, i)
+    return len(new_rows)
+
+def delete_round(db_path: str, i: int) -> None:
+    """
+    Elimina la ronda i (partidas y estado de publicación). La fila de `rounds` se
+    conserva con la versión incrementada: si la ronda se vuelve a generar, su
+    versión sigue subiendo y las cachés por firma no confunden una con otra.
+    """
+    con = connect(db_path)
+    with con:
+        con.execute("DELETE FROM games WHERE round=?", (int(i),))
+        _touch_round(con, i)
+        con.execute("UPDATE rounds SET published=0, seed=NULL WHERE round=?", (int(i),))
+
+# ============================================================
+# Publicación
+# ============================================================
+def is_published(db_path: str, i: int) -> bool:
+    con = connect(db_path)
+    row = con.execute("SELECT published FROM rounds WHERE round=?", (int(i),)).fetchone()
+    return bool(row and row[0])
+
+def set_published(db_path: str, i: int, value: bool, seed: Optional[str] = None) -> None:
+    con = connect(db_path)
+    with con:
+        con.execute("INSERT OR IGNORE INTO rounds(round) VALUES (?)", (int(i),))
+        con.execute("UPDATE rounds SET published=?, updated_at=? WHERE round=?", (int(bool(value)), _now(), int(i)))
+        if seed is not None:
+            con.execute("UPDATE rounds SET seed=? WHERE round=?", (str(seed), int(i)))
+
+def published_rounds(db_path: str) -> List[int]:
+    con = connect(db_path)
+    return [int(r[0]) for r in con.execute("SELECT round FROM rounds WHERE published=1 ORDER BY round")]
+
+# ============================================================
+# Jugadores
+# ============================================================
+def _sig_str(path: str) -> Optional[str]:
+    try:
+        st_ = os.stat(path)
+        return f"{st_.st_mtime_ns}:{st_.st_size}"
+    except OSError:
+        return None
+
+def save_players(db_path: str, df: pd.DataFrame) -> int:
+    """Reemplaza la tabla de jugadores (primera posición, últimos datos por id)."""
+    rows: Dict[str, tuple] = {}
+    order: List[str] = []
+    for rec in (df.to_dict("records") if df is not None else []):
+        pid = _clean(rec.get("id"))
+        if not pid:
+            continue
+        if pid not in rows:
+            order.append(pid)
+        estado = _clean(rec.get("estado")).lower() or "activo"
+        rows[pid] = tuple(_clean(rec.get(c)) for c in PLAYER_COLUMNS[1:-1]) + (estado,)
+    con = connect(db_path)
+    with con:
+        con.execute("DELETE FROM players")
+        con.executemany(
+            "INSERT INTO players(id, pos, nombre, apellido1, apellido2, curso, grupo, estado) VALUES (?,?,?,?,?,?,?,?)",
+            [(pid, pos) + rows[pid] for pos, pid in enumerate(order)],
+        )
+    return len(order)
+
+def sync_players_from_csv(db_path: str, csv_path: str) -> bool:
+    """Reimporta jugadores.csv si su firma cambió desde la última importación. True si importó."""
+    sig = _sig_str(csv_path)
+    con = connect(db_path)
+    row = con.execute("SELECT sig FROM sources WHERE name='players'").fetchone()
+    if sig is None or (row and row[0] == sig):
+        return False
+    try:
+        df = pd.read_csv(csv_path, dtype=str, encoding="utf-8", keep_default_na=False)
+    except Exception:
+        return False
+    save_players(db_path, df)
+    with con:
+        con.execute("INSERT OR REPLACE INTO sources(name, sig) VALUES ('players', ?)", (sig,))
+    return True
+
+def read_players_df(db_path: str) -> pd.DataFrame:
+    """Jugadores en orden de carga: id,nombre,apellido1,apellido2,curso,grupo,estado."""
+    con = connect(db_path)
+    rows = con.execute(
+        "SELECT id, nombre, apellido1, apellido2, curso, grupo, estado FROM players ORDER BY pos"
+    ).fetchall()
+    return pd.DataFrame(rows, columns=PLAYER_COLUMNS)
+
+# ============================================================
+# Puente CSV (importación / exportación)
+# ============================================================
+def import_csv(db_path: str, data_dir: str, meta: Optional[dict] = None) -> Dict[str, int]:
+    """
+    Vuelca data/ en la BD: jugadores.csv, pairings_R{i}.csv (rondas que no estén en
+    disco se eliminan) y publicación desde meta['rounds'] + published_R{i}.flag.
+    """
+    meta = meta or {}
+    players_csv = os.path.join(data_dir, "jugadores.csv")
+    con = connect(db_path)
+    with con:
+        con.execute("DELETE FROM sources WHERE name='players'")
+    sync_players_from_csv(db_path, players_csv)
+
+    on_disk: Dict[int, str] = {}
+    try:
+        for fname in os.listdir(data_dir):
+            m = re.fullmatch(r"pairings_R(\d+)\.csv", fname)
+            if m:
+                on_disk[int(m.group(1))] = os.path.join(data_dir, fname)
+    except Exception:
+        pass
+
+    for r in list_rounds(db_path):
+        if r not in on_disk:
+            delete_round(db_path, r)
+    n_games = 0
+    for r, path in sorted(on_disk.items()):
+        try:
+            df = pd.read_csv(path, dtype=str, encoding="utf-8", keep_default_na=False)
+        except Exception:
+            continue
+        save_round(db_path, r, df)
+        n_games += len(df)
+
+    rounds_meta = meta.get("rounds", {}) if isinstance(meta, dict) else {}
+    published = 0
+    for r in sorted(on_disk):
+        rinfo = rounds_meta.get(str(r), {}) or {}
+        pub = bool(rinfo.get("published", False)) or os.path.exists(os.path.join(data_dir, f"published_R{r}.flag"))
+        set_published(db_path, r, pub, seed=rinfo.get("seed"))
+        published += int(pub)
+
+    return {
+        "players": len(read_players_df(db_path)),
+        "rounds": len(on_disk),
+        "games": n_games,
+        "published": published,
+    }
+
+def export_csv(db_path: str, data_dir: str) -> List[str]:
+    """
+    Escribe pairings_R{i}.csv y published_R{i}.flag desde la BD (y jugadores.csv
+    solo si falta). Borra los CSV de rondas que ya no existen. Devuelve las rutas escritas.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    written: List[str] = []
+    rounds = set(list_rounds(db_path))
+    pubs = set(published_rounds(db_path))
+
+    for r in sorted(rounds):
+        df = read_round(db_path, r)
+        path = os.path.join(data_dir, f"pairings_R{r}.csv")
+        tmp = path + ".tmp"
+        df.fillna("").astype(str).to_csv(tmp, index=False, encoding="utf-8")
+        os.replace(tmp, path)
+        written.append(path)
+
+    try:
+        for fname in os.listdir(data_dir):
+            m = re.fullmatch(r"pairings_R(\d+)\.csv", fname)
+            if m and int(m.group(1)) not in rounds:
+                os.remove(os.path.join(data_dir, fname))
+            m = re.fullmatch(r"published_R(\d+)\.flag", fname)
+            if m and int(m.group(1)) not in pubs:
+                os.remove(os.path.join(data_dir, fname))
+    except Exception:
+        pass
+    for r in sorted(pubs):
+        flag = os.path.join(data_dir, f"published_R{r}.flag")
+        if not os.path.exists(flag):
+            open(flag, "w").close()
+        written.append(flag)
+
+    players_csv = os.path.join(data_dir, "jugadores.csv")
+    if not os.path.exists(players_csv):
+        read_players_df(db_path).to_csv(players_csv, index=False, encoding="utf-8")
+        written.append(players_csv)
+    return written
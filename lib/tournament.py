@@ -4,13 +4,17 @@ from __future__ import annotations
 
 import os
 import re
+import copy
 import json
 import random
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 
+from lib.lazy import available
+
 
 # arriba, junto a imports Zona horaria y formatos de fecha
 from zoneinfo import ZoneInfo
@@ -115,36 +119,149 @@ def _sanitize_json_like(text: str) -> str:
 
     return text.strip()
 
+# Esquema de config.json: clave -> (tipos aceptados, valor por defecto o None, comprobación)
+# Las claves que faltan toman el valor por defecto (si lo hay); las inválidas también,
+# y quedan anotadas en config_debug()["issues"]. Las desconocidas se conservan (con aviso).
+def _pos(v) -> bool:
+    return v > 0
+
+CONFIG_SCHEMA: Dict[str, tuple] = {
+    "titulo": ((str,), None, None),
+    "subtitulo": ((str,), None, None),
+    "anio": ((str,), None, None),
+    "nivel": ((str,), None, None),
+    "version": ((str,), None, None),
+    "rondas": ((str, int), "auto", lambda v: v == "auto" or (isinstance(v, int) and v > 0)),
+    "min_rondas": ((int,), None, _pos),
+    "max_rondas": ((int,), None, _pos),
+    "desempates": ((list, str), ["buchholz"], None),
+    "emparejador": ((str,), "mwm", lambda v: v in ("mwm", "greedy")),
+    "storage": ((str,), "csv", lambda v: v in ("csv", "sqlite")),
+    "auto_refresh_seconds": ((int, float), 0, lambda v: v >= 0),
+    "auto_fix_meta": ((bool,), True, None),
+    "data_watcher": ((bool,), False, None),
+    "data_watcher_seconds": ((int, float), 2, _pos),
+    "export_cache_mb": ((int, float), 64, _pos),
+    "export_workers": ((int,), 2, _pos),
+    "crosstable_dense_max": ((int,), 60, lambda v: v >= 2),
+    "genially_url": ((str,), None, None),
+    "bg_color": ((str,), "#F7F5F0", lambda v: bool(v.strip())),
+    "pdf_fecha": ((str,), None, None),
+    "pdf_hora_lugar": ((str,), None, None),
+    "pdf_font": ((str,), None, None),
+    "pdf_title_size": ((int, float), 18, _pos),
+    "pdf_round_size": ((int, float), 18, _pos),
+    "pdf_meta_size": ((int, float), 14, _pos),
+    "pdf_header_bg": ((str,), None, None),
+    "pdf_header_border": ((str,), None, None),
+    "pdf_meta_bg": ((str,), None, None),
+}
+
+def _coerce(value, types: tuple):
+    """Intenta llevar `value` a uno de `types` (números en texto, texto desde números). Lanza ValueError."""
+    if isinstance(value, bool) and bool not in types:
+        raise ValueError("booleano no permitido")
+    if isinstance(value, str):
+        t = value.strip()
+        if int in types and re.fullmatch(r"[+-]?\d+", t):
+            return int(t)
+        if float in types and re.fullmatch(r"[+-]?\d+([.,]\d+)?", t):
+            return float(t.replace(",", "."))
+        if bool in types and t.lower() in ("true", "false", "si", "sí", "no", "1", "0"):
+            return t.lower() in ("true", "si", "sí", "1")
+    if isinstance(value, types):
+        return value
+    if str in types and isinstance(value, (int, float)):
+        return str(value)
+    if float in types and isinstance(value, int):
+        return float(value)
+    raise ValueError(f"se esperaba {'/'.join(t.__name__ for t in types)}")
+
+def validate_config(raw: dict) -> Tuple[dict, List[str]]:
+    """Aplica CONFIG_SCHEMA: devuelve (config limpia con valores por defecto, avisos)."""
+    clean: dict = {}
+    issues: List[str] = []
+    for key, value in (raw or {}).items():
+        spec = CONFIG_SCHEMA.get(key)
+        if spec is None:
+            clean[key] = value
+            issues.append(f"«{key}»: clave desconocida (se conserva)")
+            continue
+        types, default, check = spec
+        try:
+            v = _coerce(value, types)
+            if isinstance(v, str) and key in ("rondas", "emparejador", "storage"):
+                v = v.strip().lower()
+            if check is not None and not check(v):
+                raise ValueError("valor fuera de rango")
+            clean[key] = v
+        except Exception as e:
+            issues.append(f"«{key}» = {value!r}: {e}; " + ("se usa el valor por defecto" if default is not None else "se ignora"))
+    for key, (_, default, _) in CONFIG_SCHEMA.items():
+        if key not in clean and default is not None:
+            clean[key] = copy.deepcopy(default)
+    lo, hi = clean.get("min_rondas"), clean.get("max_rondas")
+    if isinstance(lo, int) and isinstance(hi, int) and lo > hi:
+        issues.append(f"min_rondas ({lo}) > max_rondas ({hi})")
+    return clean, issues
+
+_CONFIG_LOCK = threading.Lock()
+_CONFIG_CACHE: Dict[str, tuple] = {}  # ruta -> (firma, config congelada, error, vista previa, avisos)
+_LAST_CONFIG_ISSUES: List[str] = []
+
 def load_config() -> dict:
-    """Carga config.json desde data/ o raíz. Tolera comentarios/comas colgantes y BOM."""
-    global _LAST_CONFIG_PATH, _LAST_CONFIG_ERROR, _LAST_CONFIG_RAW
-    _LAST_CONFIG_PATH = None
-    _LAST_CONFIG_ERROR = None
-    _LAST_CONFIG_RAW = None
+    """
+    Carga config.json desde data/ o raíz. Tolera comentarios/comas colgantes y BOM.
+    Se parsea y valida una vez por (ruta, mtime, tamaño); devuelve un dict de SOLO LECTURA
+    compartido (para modificarlo, dict(cfg) o cfg.copy()).
+    """
+    global _LAST_CONFIG_PATH, _LAST_CONFIG_ERROR, _LAST_CONFIG_RAW, _LAST_CONFIG_ISSUES
 
     path = find_config_file()
     if not path:
-        return {}
-
+        _LAST_CONFIG_PATH = _LAST_CONFIG_ERROR = _LAST_CONFIG_RAW = None
+        _LAST_CONFIG_ISSUES = []
+        return _freeze(validate_config({})[0])
+
+    sig = file_sig(path)
+    with _CONFIG_LOCK:
+        hit = _CONFIG_CACHE.get(path)
+    if hit is None or hit[0] != sig:
+        hit = (sig,) + _parse_config(path)
+        with _CONFIG_LOCK:
+            _CONFIG_CACHE[path] = hit
+    _, cfg, _LAST_CONFIG_ERROR, _LAST_CONFIG_RAW, _LAST_CONFIG_ISSUES = hit
     _LAST_CONFIG_PATH = path
+    return cfg
+
+def _parse_config(path: str) -> tuple:
+    """(config congelada, error, vista previa, avisos) de un fichero de config."""
+    error = raw = None
+    data: dict = {}
     try:
         raw, enc = _read_text_try_encodings(path)
-        _LAST_CONFIG_RAW = raw[:2000]  # vista previa acotada
-
         # 1º intento: JSON estricto
         try:
-            return json.loads(raw)
+            data = json.loads(raw)
         except Exception as e1:
             # 2º intento: sanitizar comentarios/comas colgantes
             try:
-                clean = _sanitize_json_like(raw)
-                return json.loads(clean)
+                data = json.loads(_sanitize_json_like(raw))
             except Exception as e2:
-                _LAST_CONFIG_ERROR = f"Primero {type(e1).__name__}: {e1}; tras sanitizar {type(e2).__name__}: {e2}"
-                return {}
+                error = f"Primero {type(e1).__name__}: {e1}; tras sanitizar {type(e2).__name__}: {e2}"
+                data = {}
     except Exception as e:
-        _LAST_CONFIG_ERROR = f"{type(e).__name__}: {e}"
-        return {}
+        error = f"{type(e).__name__}: {e}"
+    if not isinstance(data, dict):
+        error = error or f"config.json debe ser un objeto JSON (es {type(data).__name__})"
+        data = {}
+    clean, issues = validate_config(data)
+    return _freeze(clean), error, (raw or "")[:2000], issues
+
+def clear_config_cache() -> None:
+    """Olvida la config cacheada (p. ej. tras restaurar un backup que trae config.json)."""
+    with _CONFIG_LOCK:
+        _CONFIG_CACHE.clear()
 
 def config_path() -> str:
     """Devuelve la ruta efectiva usada para cargar config.json (o '' si no hay)."""
@@ -156,38 +273,129 @@ def config_debug() -> dict:
         "path": _LAST_CONFIG_PATH or "",
         "error": _LAST_CONFIG_ERROR or "",
         "raw_preview": (_LAST_CONFIG_RAW or "")[:500],
+        "issues": list(_LAST_CONFIG_ISSUES or []),
     }
 
-def load_meta() -> dict:
-    """Lee meta.json (o dict vacío si no existe / error)."""
-    if not os.path.exists(META_PATH):
-        return {}
+# ====== META: caché en memoria validada por (mtime_ns, tamaño) ======
+
+_META_LOCK = threading.Lock()
+_META_CACHE: Dict[str, Tuple[Optional[Tuple[int, int]], "_ReadOnlyDict"]] = {}  # ruta -> (firma, documento)
+
+class _ReadOnlyDict(dict):
+    """
+    dict de solo lectura (vista compartida de la caché de meta.json / config.json).
+    Sigue siendo un dict para json.dumps / isinstance; para modificar, usar
+    load_meta() o .copy() (copias editables).
+    """
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("vista de solo lectura: usa load_meta() o .copy() para obtener una copia editable")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def copy(self) -> dict:
+        return _thaw(self)
+
+    def __deepcopy__(self, memo) -> dict:
+        return _thaw(self)
+
+    def __reduce__(self):
+        return (dict, (_thaw(self),))
+
+def _freeze(obj):
+    """Convierte dict/list anidados en _ReadOnlyDict/tuple."""
+    if isinstance(obj, dict):
+        return _ReadOnlyDict((k, _freeze(v)) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+def _thaw(obj):
+    """Inversa de _freeze: copia editable (dict/list)."""
+    if isinstance(obj, dict):
+        return {k: _thaw(v) for k, v in obj.items()}
+    if isinstance(obj, tuple):
+        return [_thaw(v) for v in obj]
+    return obj
+
+_EMPTY_META = _ReadOnlyDict()
+
+def file_sig(path: str) -> Optional[Tuple[int, int]]:
+    """Firma barata de un fichero: (mtime_ns, tamaño) o None si no existe."""
     try:
-        with open(META_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
+        st_ = os.stat(path)
+        return (st_.st_mtime_ns, st_.st_size)
+    except OSError:
+        return None
+
+def meta_view() -> dict:
+    """
+    meta.json como vista de solo lectura, cacheada por (mtime_ns, tamaño).
+    Con la caché caliente, cada llamada cuesta un stat(). No modificar:
+    para editar, load_meta() + save_meta().
+    """
+    path = META_PATH
+    sig = file_sig(path)
+    if sig is None:
+        return _EMPTY_META
+    with _META_LOCK:
+        hit = _META_CACHE.get(path)
+        if hit is not None and hit[0] == sig:
+            return hit[1]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            doc = _freeze(json.load(f))
     except Exception:
-        return {}
+        doc = _EMPTY_META
+    with _META_LOCK:
+        _META_CACHE[path] = (sig, doc)
+    return doc
+
+def clear_meta_cache() -> None:
+    """Vacía la caché de meta.json (p. ej. tras restaurar una copia)."""
+    with _META_LOCK:
+        _META_CACHE.clear()
 
+def load_meta() -> dict:
+    """Lee meta.json (o dict vacío si no existe / error). Devuelve una copia editable."""
+    return _thaw(meta_view())
+
+
+def _write_meta(meta: dict) -> None:
+    """Escribe data/meta.json (fusión + tmp + replace) sin subir la versión del estado."""
+    # merge defensiva: siempre partimos de lo actual en disco
+    current = meta_view()
+    # mezcla superficial (para evitar borrar campos que otro haya escrito)
+    if isinstance(current, dict) and isinstance(meta, dict):
+        merged = {**_thaw(current), **_thaw(meta)}
+        if "rounds" in current and "rounds" in meta:
+            # fusión por ronda
+            merged_rounds = _thaw(current["rounds"])
+            for k, v in meta["rounds"].items():
+                merged_rounds[k] = {**merged_rounds.get(k, {}), **_thaw(v)}
+            merged["rounds"] = merged_rounds
+        meta = merged
+
+    # escritura atómica: tmp + replace
+    path = META_PATH
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+    # refrescar la caché con lo recién escrito (sin volver a parsear)
+    sig = file_sig(path)
+    with _META_LOCK:
+        if sig is None:
+            _META_CACHE.pop(path, None)
+        else:
+            _META_CACHE[path] = (sig, _freeze(copy.deepcopy(meta)))
 
 def save_meta(meta: dict) -> None:
     """Guarda data/meta.json de forma atómica y sin perder campos."""
     try:
-        # merge defensiva: siempre partimos de lo actual en disco
-        current = load_meta()
-        # mezcla superficial (para evitar borrar campos que otro haya escrito)
-        if isinstance(current, dict) and isinstance(meta, dict):
-            merged = {**current, **meta}
-            if "rounds" in current and "rounds" in meta:
-                # fusión por ronda
-                merged_rounds = current["rounds"].copy()
-                for k, v in meta["rounds"].items():
-                    merged_rounds[k] = {**merged_rounds.get(k, {}), **v}
-                merged["rounds"] = merged_rounds
-            meta = merged
-
-        # escritura (mejor si quieres usar un tmp + replace, pero vale así)
-        with open(META_PATH, "w", encoding="utf-8") as f:
-            json.dump(meta, f, ensure_ascii=False, indent=2)
+        _write_meta(meta)
+        bump_state_version()
     except Exception:
         pass
 
@@ -204,7 +412,7 @@ def save_meta(meta: dict) -> None:
 
 def r1_seed() -> Optional[str]:
     """Devuelve la semilla guardada para R1 (si existe)."""
-    m = load_meta()
+    m = meta_view()
     return m.get("rounds", {}).get("1", {}).get("seed")
 
 def add_log(action: str, round_no: Optional[int], actor: str, message: str) -> None:
@@ -244,7 +452,7 @@ def set_round_date(i: int, date_iso: str) -> None:
 def get_round_date(i: int) -> str:
     # Devuelve la fecha ISO 'YYYY-MM-DD' almacenada para la ronda i (o '' si no hay).
     try:
-        meta = load_meta()
+        meta = meta_view()
         return str(meta.get("rounds", {}).get(str(i), {}).get("date", "") or "")
     except Exception:
         return ""
@@ -361,8 +569,15 @@ def is_published(i: int) -> bool:
       1) meta['rounds'][str(i)]['published'] == True
       2) fallback: existe el flag-file data/published_R{i}.flag
     """
+    db = sqlite_db()
+    if db:
+        try:
+            from lib import sqlite_store
+            return sqlite_store.is_published(db, i)
+        except Exception:
+            pass
     try:
-        meta = load_meta()
+        meta = meta_view()
         rinfo = meta.get("rounds", {}).get(str(i), {})
         if bool(rinfo.get("published", False)):
             return True
@@ -377,7 +592,16 @@ def set_published(i: int, value: bool, seed: Optional[str] = None) -> None:
     """
     Marca/deselecciona como publicada la ronda i tanto en meta como en flag-file.
     Si 'seed' viene, se guarda (útil para R1).
+    Con backend SQLite, la BD manda; meta y flag se mantienen como espejo.
     """
+    # 0) BD (si está activa)
+    db = sqlite_db()
+    if db:
+        try:
+            from lib import sqlite_store
+            sqlite_store.set_published(db, i, value, seed=seed)
+        except Exception:
+            pass
     # 1) meta
     try:
         meta = load_meta()
@@ -389,7 +613,7 @@ def set_published(i: int, value: bool, seed: Optional[str] = None) -> None:
     if seed is not None:
         r["seed"] = seed
     try:
-        save_meta(meta)
+        _write_meta(meta)
     except Exception:
         pass
     # 2) flag-file
@@ -402,6 +626,7 @@ def set_published(i: int, value: bool, seed: Optional[str] = None) -> None:
                 os.remove(flag)
     except Exception:
         pass
+    bump_state_version([i])
 
 # ============================================================
 # Helpers de rondas (rutas y listado)
@@ -414,8 +639,17 @@ def list_round_files(max_rounds: int | None = None) -> List[int]:
     """
     Devuelve la lista de números de ronda para los que existe 'data/pairings_R<i>.csv',
     ordenada ascendentemente. Si max_rounds está definido, filtra hasta ese número.
+    Con backend SQLite, las rondas guardadas en la BD.
     """
     rounds = set()
+    db = sqlite_db()
+    if db:
+        try:
+            from lib import sqlite_store
+            out = sqlite_store.list_rounds(db)
+            return [r for r in out if max_rounds is None or r <= max_rounds]
+        except Exception:
+            return []
     try:
         for fname in os.listdir(DATA_DIR):
             m = re.fullmatch(r"pairings_R(\d+)\.csv", fname)
@@ -428,6 +662,221 @@ def list_round_files(max_rounds: int | None = None) -> List[int]:
         out = [r for r in out if r <= max_rounds]
     return out
 
+# ============================================================
+# Almacenamiento: CSV (por defecto) o SQLite opcional
+# ============================================================
+# config.json -> "storage": "sqlite" activa lib/sqlite_store.py (data/torneo.db).
+# Estas funciones son la puerta única para leer/escribir rondas.
+_STORAGE_MODE: Optional[Tuple[str, Optional[Tuple[int, int]], str]] = None  # (ruta config, firma, modo)
+_STORAGE_LOCK = threading.Lock()
+
+def storage_backend() -> str:
+    """'sqlite' si config.json trae "storage": "sqlite"; si no, 'csv'. Cacheado por la firma del config."""
+    global _STORAGE_MODE
+    hit = _STORAGE_MODE
+    if hit is not None and hit[0] and file_sig(hit[0]) == hit[1]:
+        return hit[2]
+    path = find_config_file() or ""
+    mode = "csv"
+    if path:
+        try:
+            cfg = load_config()
+            if str(cfg.get("storage", "csv")).strip().lower() == "sqlite":
+                mode = "sqlite"
+        except Exception:
+            pass
+    _STORAGE_MODE = (path, file_sig(path) if path else None, mode)
+    return mode
+
+def db_path() -> str:
+    """Ruta de la BD SQLite (data/torneo.db)."""
+    return os.path.join(DATA_DIR, "torneo.db")
+
+def sqlite_db() -> Optional[str]:
+    """
+    Ruta de la BD si el backend SQLite está activo, o None.
+    La primera vez crea la BD importando los CSV existentes.
+    """
+    if storage_backend() != "sqlite":
+        return None
+    path = db_path()
+    try:
+        if not os.path.exists(path):
+            with _STORAGE_LOCK:
+                if not os.path.exists(path):
+                    from lib import sqlite_store
+                    sqlite_store.import_csv(path, DATA_DIR, meta=load_meta())
+        return path
+    except Exception:
+        return None
+
+def round_exists(i: int) -> bool:
+    """True si la ronda i tiene emparejamientos guardados."""
+    db = sqlite_db()
+    if db:
+        try:
+            from lib import sqlite_store
+            return sqlite_store.round_exists(db, i)
+        except Exception:
+            return False
+    return os.path.exists(round_file(i))
+
+def read_round(i: int) -> Optional[pd.DataFrame]:
+    """Emparejamientos de la ronda i (como read_csv_safe del CSV) o None."""
+    db = sqlite_db()
+    if db:
+        try:
+            from lib import sqlite_store
+            return sqlite_store.read_round(db, i)
+        except Exception:
+            return None
+    return read_csv_safe(round_file(i))
+
+def save_round(i: int, df: pd.DataFrame) -> None:
+    """Guarda los emparejamientos de la ronda i (en SQLite, solo las filas que cambian)."""
+    db = sqlite_db()
+    if db:
+        from lib import sqlite_store
+        sqlite_store.save_round(db, i, df)
+    else:
+        df.astype(str).to_csv(round_file(i), index=False, encoding="utf-8")
+    bump_state_version([i])
+
+def delete_round(i: int) -> None:
+    """Elimina los emparejamientos de la ronda i."""
+    db = sqlite_db()
+    if db:
+        from lib import sqlite_store
+        sqlite_store.delete_round(db, i)
+    else:
+        p = round_file(i)
+        if os.path.exists(p):
+            os.remove(p)
+    bump_state_version([i])
+
+def round_last_modified(i: int) -> str:
+    """Última modificación de la ronda i (horario Madrid) según el backend activo, o '—'."""
+    db = sqlite_db()
+    if db:
+        try:
+            from lib import sqlite_store
+            ts = sqlite_store.round_updated_at(db, i)
+            return format_ts_madrid(datetime.fromisoformat(ts).timestamp()) if ts else "—"
+        except Exception:
+            return "—"
+    return last_modified(round_file(i))
+
+def round_sig(i: int):
+    """
+    Firma barata de la ronda i para cachés: (mtime_ns, tamaño) del CSV o versión en la BD,
+    más la versión de la ronda en state_version.json (cambia en cada guardado o borrado).
+    """
+    db = sqlite_db()
+    if db:
+        try:
+            from lib import sqlite_store
+            return ("db", sqlite_store.round_version(db, i), round_version(i))
+        except Exception:
+            return None
+    sig = file_sig(round_file(i))
+    return None if sig is None else (sig, round_version(i))
+
+# ============================================================
+# Versión del estado del torneo (contador monótono)
+# ============================================================
+# data/state_version.json = {"version": N, "rounds": {"3": N3, ...}, "players": Nj, "updated": "..."}
+# Toda escritura (publicar, meta, generar/guardar/borrar ronda, jugadores, restaurar)
+# incrementa "version"; si afecta a rondas concretas, también su versión por ronda.
+# Las cachés derivadas se validan con una sola lectura (stat + JSON pequeño) de este fichero.
+STATE_VERSION_PATH = os.path.join(DATA_DIR, "state_version.json")
+
+_STATE_LOCK = threading.RLock()  # reentrante: bump_state_version lee el estado con él tomado
+_STATE_CACHE: Dict[str, tuple] = {}  # ruta -> (firma, estado congelado)
+_STATE_MAX = {"version": 0}          # mayor versión vista en este proceso (nunca retrocede)
+_EMPTY_STATE = {"version": 0, "rounds": {}, "players": 0}
+
+def _read_state() -> dict:
+    path = STATE_VERSION_PATH
+    sig = file_sig(path)
+    with _STATE_LOCK:
+        hit = _STATE_CACHE.get(path)
+        if hit is not None and hit[0] == sig:
+            return hit[1]
+    doc = dict(_EMPTY_STATE)
+    if sig is not None:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            doc["version"] = int(raw.get("version", 0))
+            doc["rounds"] = {str(int(k)): int(v) for k, v in (raw.get("rounds") or {}).items()}
+            doc["players"] = int(raw.get("players", 0))
+            doc["updated"] = str(raw.get("updated", ""))
+        except Exception:
+            doc = dict(_EMPTY_STATE)
+    doc = _freeze(doc)
+    with _STATE_LOCK:
+        _STATE_CACHE[path] = (sig, doc)
+    return doc
+
+def state_version() -> int:
+    """Versión global del estado del torneo (0 si nunca se ha escrito nada)."""
+    return int(_read_state().get("version", 0))
+
+def round_version(i: int) -> int:
+    """Versión de la ronda i: la versión global de su último cambio (0 si no consta)."""
+    return int(_read_state().get("rounds", {}).get(str(int(i)), 0))
+
+def bump_state_version(rounds=(), players: bool = False, all_rounds: bool = False) -> int:
+    """
+    Incrementa la versión global (atómico: tmp + replace) y marca con ella las rondas
+    indicadas (todas si all_rounds, p. ej. tras restaurar) y/o los jugadores.
+    Nunca lanza: si no se puede escribir devuelve la versión vigente.
+    """
+    try:
+        targets = {int(r) for r in (rounds or [])}
+        if all_rounds:
+            targets |= set(list_round_files())
+        with _STATE_LOCK:
+            cur = _read_state()
+            new = max(int(cur.get("version", 0)), _STATE_MAX["version"]) + 1
+            rv = {k: int(v) for k, v in cur.get("rounds", {}).items()}
+            if all_rounds:
+                rv = {k: new for k in rv}
+            for r in targets:
+                rv[str(r)] = new
+            doc = {
+                "version": new,
+                "rounds": dict(sorted(rv.items(), key=lambda kv: int(kv[0]))),
+                "players": new if (players or all_rounds) else int(cur.get("players", 0)),
+                "updated": now_madrid(),
+            }
+            path = STATE_VERSION_PATH
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(doc, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, path)
+            _STATE_MAX["version"] = new
+            _STATE_CACHE[path] = (file_sig(path), _freeze(doc))
+        return new
+    except Exception:
+        return state_version()
+
+def storage_import_csv() -> dict:
+    """Puente CSV -> BD (tras subir/restaurar ficheros). No hace nada con backend CSV."""
+    db = sqlite_db()
+    if not db:
+        return {}
+    from lib import sqlite_store
+    return sqlite_store.import_csv(db, DATA_DIR, meta=load_meta())
+
+def storage_export_csv() -> List[str]:
+    """Puente BD -> CSV (antes de backups/descargas). No hace nada con backend CSV."""
+    db = sqlite_db()
+    if not db:
+        return []
+    from lib import sqlite_store
+    return sqlite_store.export_csv(db, DATA_DIR)
+
 # ============================================================
 # Nombres y jugadores
 # ============================================================
@@ -479,52 +928,13 @@ def read_players_from_csv(path: str) -> Dict[str, dict]:
     return players
 
 # ============================================================
-# Normalización de valores de resultado
+# Resultados: códec compartido (lib/results.py)
 # ============================================================
-def _normalize_result_str(val: Optional[str]) -> str:
-    """
-    Convierte None/nan/'None'/'nan'/'N/A' en '' y recorta espacios.
-    No transforma resultados válidos (1-0, 0-1, 1/2-1/2, +/- , -/+, BYE1.0, BYE0.5, BYE).
-    """
-    if val is None:
-        return ""
-    s = str(val).strip()
-    if s in {"", "NaN"}:
-        return ""
-    sl = s.lower()
-    if sl in {"none", "nan", "n/a"}:
-        return ""
-    return s
+from lib.results import decode_results, empty_count as _results_empty_count
 
 # ============================================================
 # Aplicar resultados y clasificación
 # ============================================================
-def _award_points_for_result(res: str, bye_default: float = 1.0) -> Tuple[float, float, Optional[float]]:
-    """
-    Devuelve (pts_white, pts_black, bye_points_si_hay).
-    - '1-0'      -> (1.0, 0.0, None)
-    - '0-1'      -> (0.0, 1.0, None)
-    - '1/2-1/2'  -> (0.5, 0.5, None)
-    - '+/-'      -> (1.0, 0.0, None)
-    - '-/+'      -> (0.0, 1.0, None)
-    - 'BYE1.0'   -> (1.0, 0.0, 1.0)   (negras es BYE)
-    - 'BYE0.5'   -> (0.5, 0.0, 0.5)
-    - 'BYE'      -> (bye_default, 0.0, bye_default)
-    - ''/None    -> (0.0, 0.0, None)
-    """
-    if not res:
-        return 0.0, 0.0, None
-    res = str(res).strip().upper()
-    if res == "1-0": return 1.0, 0.0, None
-    if res == "0-1": return 0.0, 1.0, None
-    if res in {"1/2-1/2", "1/2–1/2"}: return 0.5, 0.5, None
-    if res == "+/-": return 1.0, 0.0, None
-    if res == "-/+": return 0.0, 1.0, None
-    if res == "BYE1.0": return 1.0, 0.0, 1.0
-    if res == "BYE0.5": return 0.5, 0.0, 0.5
-    if res == "BYE": return bye_default, 0.0, bye_default
-    return 0.0, 0.0, None
-
 def apply_results(players: Dict[str, dict], df_pairs: Optional[pd.DataFrame], bye_points: float = 1.0) -> Dict[str, dict]:
     """
     Aplica los resultados de un CSV de emparejamientos sobre el diccionario de jugadores.
@@ -539,18 +949,15 @@ def apply_results(players: Dict[str, dict], df_pairs: Optional[pd.DataFrame], by
         if c not in df_pairs.columns:
             return players
 
-    for _, row in df_pairs.iterrows():
-        wid = str(row["blancas_id"]).strip()
-        bid = str(row["negras_id"]).strip()
-        # --- NORMALIZAR resultado ---
-        res = _normalize_result_str(row.get("resultado", ""))
-
-        # BYE: negras_id == 'BYE'
-        if bid.upper() == "BYE":
+    g = games_from_pairings(df_pairs, 0, bye_points=bye_points)
+    for wid, bid, w_add, b_add, bye in zip(
+        g["white_id"].values, g["black_id"].values,
+        g["white_pts"].values, g["black_pts"].values, g["is_bye"].values,
+    ):
+        # BYE: negras_id == 'BYE' (resultado vacío -> bye_points)
+        if bye:
             if wid in players:
-                # Si res está vacío, trátalo como 'BYE' con el bye_default indicado
-                wpts, _, bye_pts = _award_points_for_result(res if res else "BYE", bye_default=bye_points)
-                players[wid]["points"] += float(bye_pts if bye_pts is not None else bye_points)
+                players[wid]["points"] += float(w_add)
                 players[wid]["had_bye"] = True
                 # (opcional) contar BYE como 'W' para el control de rachas de color
                 players[wid]["colors"].append("W")
@@ -560,7 +967,6 @@ def apply_results(players: Dict[str, dict], df_pairs: Optional[pd.DataFrame], by
             # Algún id no está en jugadores -> saltamos
             continue
 
-        w_add, b_add, _ = _award_points_for_result(res, bye_default=bye_points)
         players[wid]["points"] += float(w_add)
         players[bid]["points"] += float(b_add)
 
@@ -609,6 +1015,364 @@ def compute_standings(players: Dict[str, dict]) -> pd.DataFrame:
     df.insert(0, "pos", df.index + 1)  # ranking 1..n
     return df
 
+# ============================================================
+# Snapshots incrementales del estado de jugadores (por ronda)
+# ============================================================
+PLAYERS_PATH = os.path.join(DATA_DIR, "jugadores.csv")
+
+from collections import OrderedDict
+
+_SNAP_LOCK = threading.Lock()
+_SNAP_MAX = 64  # snapshots recordados (LRU); cada lista de rondas / jugadores / bye tiene los suyos
+# clave (jugadores + bye + rondas aplicadas con sus firmas) -> estado tras aplicarlas
+_SNAPSHOTS: "OrderedDict[tuple, Dict[str, dict]]" = OrderedDict()
+
+def _clone_players(players: Dict[str, dict]) -> Dict[str, dict]:
+    """Copia del estado de jugadores (duplica las listas acumuladas, no los textos)."""
+    return {
+        pid: {**p, "opponents": list(p.get("opponents", [])), "colors": list(p.get("colors", []))}
+        for pid, p in players.items()
+    }
+
+def players_state_after(rounds: List[int], players_path: Optional[str] = None, bye_points: float = 1.0) -> Dict[str, dict]:
+    """
+    Estado acumulado (points, opponents, colors, had_bye) tras aplicar las rondas `rounds` en orden.
+
+    Guarda un snapshot tras cada ronda. La clave del snapshot k encadena la firma de jugadores.csv,
+    bye_points y (ronda, mtime_ns, tamaño) de los k primeros CSV, así que publicar o editar la
+    ronda N solo vuelve a aplicar desde el snapshot N-1 (y nada si no ha cambiado).
+    Los snapshots se indexan por esa clave (LRU acotado): llamadas con listas de rondas
+    distintas (publicadas en Clasificación, todas en Administración) no se pisan.
+    El candado solo protege buscar/guardar; la lectura y la aplicación van fuera.
+    Devuelve siempre una copia: el llamador puede mutarla sin estropear la caché.
+    """
+    path = players_path or PLAYERS_PATH
+    rounds = [int(r) for r in (rounds or [])]
+
+    base = (os.path.abspath(path), file_sig(path), float(bye_points))
+    sigs = tuple((r, round_sig(r)) for r in rounds)
+    keys = [(base, sigs[:k]) for k in range(len(rounds) + 1)]
+
+    # Snapshot válido más largo
+    start, snap = None, None
+    with _SNAP_LOCK:
+        for k in range(len(rounds), -1, -1):
+            snap = _SNAPSHOTS.get(keys[k])
+            if snap is not None:
+                _SNAPSHOTS.move_to_end(keys[k])
+                start = k
+                break
+
+    if start is None:
+        state = read_players_from_csv(path)
+        _store_snapshot(keys[0], state)
+        start = 0
+    else:
+        state = _clone_players(snap)
+
+    for k in range(start, len(rounds)):
+        dfp = read_round(rounds[k])
+        state = apply_results(state, dfp, bye_points=bye_points)
+        _store_snapshot(keys[k + 1], state)
+
+    return state
+
+def _store_snapshot(key: tuple, state: Dict[str, dict]) -> None:
+    snap = _clone_players(state)
+    with _SNAP_LOCK:
+        _SNAPSHOTS[key] = snap
+        _SNAPSHOTS.move_to_end(key)
+        while len(_SNAPSHOTS) > _SNAP_MAX:
+            _SNAPSHOTS.popitem(last=False)
+
+def clear_snapshots() -> None:
+    """Vacía los snapshots (p. ej. tras restaurar un backup)."""
+    with _SNAP_LOCK:
+        _SNAPSHOTS.clear()
+    with _GAMES_LOCK:
+        _GAMES_CACHE.clear()
+    with _RANK_LOCK:
+        _RANK_CACHE.clear()
+
+# ============================================================
+# Motor columnar: tabla de partidas + clasificación vectorizada
+# ============================================================
+import numpy as np
+
+GAME_COLUMNS = ["round", "white_id", "black_id", "white_pts", "black_pts", "is_bye"]
+STANDINGS_COLUMNS = ["pos", "id", "nombre", "curso", "grupo", "puntos", "buchholz", "pj"]
+
+_GAMES_LOCK = threading.Lock()
+_GAMES_CACHE: Dict[int, Tuple[tuple, pd.DataFrame]] = {}
+
+def read_players_df(path: Optional[str] = None) -> pd.DataFrame:
+    """
+    jugadores.csv como DataFrame limpio (id,nombre,apellido1,apellido2,curso,grupo,estado),
+    sin ids vacíos ni duplicados (gana la última fila, como en read_players_from_csv).
+    """
+    cols = ["id", "nombre", "apellido1", "apellido2", "curso", "grupo", "estado"]
+    path = path or PLAYERS_PATH
+    db = sqlite_db()
+    if db and os.path.abspath(path) == os.path.abspath(PLAYERS_PATH):
+        try:
+            from lib import sqlite_store
+            sqlite_store.sync_players_from_csv(db, path)
+            return sqlite_store.read_players_df(db)[cols]
+        except Exception:
+            pass
+    df = read_csv_safe(path)
+    if df is None or df.empty:
+        return pd.DataFrame(columns=cols)
+    df = df.copy()
+    for c in cols:
+        if c not in df.columns:
+            df[c] = "activo" if c == "estado" else ""
+        df[c] = df[c].fillna("").astype(str).str.strip()
+    df["estado"] = df["estado"].str.lower().replace("", "activo")
+    df = df[df["id"] != ""]
+    # Mantener la posición de la primera aparición y los datos de la última (semántica dict)
+    first_pos = df.drop_duplicates("id", keep="first")["id"]
+    last_rows = df.drop_duplicates("id", keep="last").set_index("id")
+    return last_rows.loc[first_pos.values].reset_index()[cols]
+
+def _formatted_names(players_df: pd.DataFrame) -> pd.Series:
+    """Versión vectorizada de formatted_name_from_parts: 'Nombre Apellido1 A.'."""
+    n = players_df["nombre"].astype(str).str.strip()
+    a1 = players_df["apellido1"].astype(str).str.strip()
+    a2 = players_df["apellido2"].astype(str).str.strip()
+    ini2 = a2.str[0].fillna("") + "."
+    out = n.where(a1 == "", n + " " + a1)
+    out = out.where(a2 == "", out + " " + ini2)
+    return out.str.strip()
+
+def games_from_pairings(df_pairs: Optional[pd.DataFrame], round_no: int, bye_points: float = 1.0) -> pd.DataFrame:
+    """
+    Convierte un CSV de emparejamientos en filas de la tabla de partidas:
+      round, white_id, black_id, white_pts, black_pts, is_bye
+    En los BYE, black_id = 'BYE' y white_pts son los puntos del BYE.
+    """
+    if df_pairs is None or df_pairs.empty:
+        return pd.DataFrame(columns=GAME_COLUMNS)
+    if any(c not in df_pairs.columns for c in ("blancas_id", "negras_id", "resultado")):
+        return pd.DataFrame(columns=GAME_COLUMNS)
+
+    wid = df_pairs["blancas_id"].fillna("").astype(str).str.strip()
+    bid = df_pairs["negras_id"].fillna("").astype(str).str.strip()
+    is_bye = bid.str.upper().eq("BYE")
+    # 'BYE' en partida normal -> puntos de BYE para blancas; en filas BYE, BYE1.0/BYE0.5 o bye_points
+    dec = decode_results(df_pairs["resultado"], is_bye=is_bye, bye_points=bye_points)
+    w_pts = dec["white_pts"]
+    b_pts = dec["black_pts"]
+
+    out = pd.DataFrame({
+        "round": int(round_no),
+        "white_id": wid.values,
+        "black_id": bid.mask(is_bye, "BYE").values,
+        "white_pts": w_pts.values,
+        "black_pts": b_pts.values,
+        "is_bye": is_bye.values,
+    })
+    return out[GAME_COLUMNS]
+
+def build_game_table(rounds: List[int], bye_points: float = 1.0) -> pd.DataFrame:
+    """
+    Tabla única de partidas de las rondas indicadas. Cada ronda se cachea por la firma de su CSV,
+    así que solo se vuelve a leer la que haya cambiado.
+    """
+    parts = []
+    for r in (rounds or []):
+        r = int(r)
+        key = (round_sig(r), float(bye_points))
+        with _GAMES_LOCK:
+            hit = _GAMES_CACHE.get(r)
+        if hit is not None and hit[0] == key:
+            g = hit[1]
+        else:
+            g = games_from_pairings(read_round(r), r, bye_points=bye_points)
+            with _GAMES_LOCK:
+                _GAMES_CACHE[r] = (key, g)
+        if not g.empty:
+            parts.append(g)
+    if not parts:
+        return pd.DataFrame(columns=GAME_COLUMNS)
+    return pd.concat(parts, ignore_index=True)
+
+# ============================================================
+# Desempates (una pasada vectorizada sobre la tabla de partidas)
+# ============================================================
+TIEBREAK_LABELS = {
+    "buchholz": "Buchholz",
+    "buchholz_c1": "Buchholz -1",
+    "buchholz_med": "Buchholz mediano",
+    "sb": "Sonneborn-Berger",
+    "progresivo": "Progresivo",
+    "victorias": "Victorias",
+    "negras": "Partidas con negras",
+    "enfrentamiento": "Enfrentamiento directo",
+}
+DEFAULT_TIEBREAKS = ["buchholz"]
+
+def tiebreak_order(cfg: Optional[dict] = None) -> List[str]:
+    """
+    Orden de desempates desde config.json ("desempates": lista o texto separado por comas).
+    Claves válidas: las de TIEBREAK_LABELS. Las desconocidas se ignoran; por defecto solo Buchholz.
+    """
+    if cfg is None:
+        try:
+            cfg = load_config()
+        except Exception:
+            cfg = {}
+    raw = (cfg or {}).get("desempates", DEFAULT_TIEBREAKS)
+    if isinstance(raw, str):
+        raw = raw.split(",")
+    out: List[str] = []
+    for k in (raw or []):
+        k = str(k).strip().lower()
+        if k in TIEBREAK_LABELS and k not in out:
+            out.append(k)
+    return out or list(DEFAULT_TIEBREAKS)
+
+def _player_games(ids: pd.Index, games: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    (byes, partidas) en formato largo por jugador:
+      byes:     pid, round, pts
+      partidas: pid, opp, round, pts, black
+    Solo partidas entre jugadores de la lista.
+    """
+    g = games if games is not None else pd.DataFrame(columns=GAME_COLUMNS)
+    is_bye = g["is_bye"].astype(bool)
+    byes = g[is_bye & g["white_id"].isin(ids)]
+    normal = g[~is_bye & g["white_id"].isin(ids) & g["black_id"].isin(ids)]
+    long = pd.concat([
+        pd.DataFrame({"pid": normal["white_id"].values, "opp": normal["black_id"].values,
+                      "round": normal["round"].values, "pts": normal["white_pts"].values.astype(float), "black": False}),
+        pd.DataFrame({"pid": normal["black_id"].values, "opp": normal["white_id"].values,
+                      "round": normal["round"].values, "pts": normal["black_pts"].values.astype(float), "black": True}),
+    ], ignore_index=True)
+    bye_long = pd.DataFrame({"pid": byes["white_id"].values, "round": byes["round"].values,
+                             "pts": byes["white_pts"].values.astype(float)})
+    return bye_long, long
+
+def compute_tiebreaks(ids: pd.Index, games: pd.DataFrame, pts: pd.Series) -> pd.DataFrame:
+    """
+    Todos los desempates (salvo enfrentamiento directo, que depende de los empates)
+    a partir de la tabla de partidas y los puntos finales `pts` (indexados por id).
+    Buchholz y sus cortes usan rivales distintos (como la columna buchholz clásica).
+    """
+    bye_long, long = _player_games(ids, games)
+    zero = pd.Series(0.0, index=ids)
+
+    # Buchholz y cortes sobre rivales distintos
+    opp = long[["pid", "opp"]].drop_duplicates()
+    opp = opp.assign(opp_pts=opp["opp"].map(pts).fillna(0.0).values)
+    agg = opp.groupby("pid")["opp_pts"].agg(["sum", "min", "max", "count"]).reindex(ids)
+    agg = agg.fillna({"sum": 0.0, "min": 0.0, "max": 0.0, "count": 0})
+    buch = agg["sum"]
+    c1 = (buch - agg["min"]).where(agg["count"] >= 1, 0.0)
+    med = (buch - agg["min"] - agg["max"]).where(agg["count"] >= 2, 0.0)
+
+    # Sonneborn-Berger: por partida, puntos logrados x puntos finales del rival
+    sb = (long["pts"] * long["opp"].map(pts).fillna(0.0)).groupby(long["pid"]).sum()
+
+    # Progresivo: suma de acumulados tras cada ronda = sum(pts_r * (nº rondas desde r))
+    rounds = sorted(set(long["round"].tolist()) | set(bye_long["round"].tolist()))
+    weight = {r: len(rounds) - k for k, r in enumerate(rounds)}
+    all_pts = pd.concat([long[["pid", "round", "pts"]], bye_long], ignore_index=True)
+    prog = (all_pts["pts"] * all_pts["round"].map(weight).astype(float)).groupby(all_pts["pid"]).sum()
+
+    wins = (long["pts"] >= 1.0).groupby(long["pid"]).sum()
+    blacks = long["black"].astype(bool).groupby(long["pid"]).sum()
+
+    return pd.DataFrame({
+        "buchholz": buch.values,
+        "buchholz_c1": c1.values,
+        "buchholz_med": med.values,
+        "sb": zero.add(sb, fill_value=0.0).reindex(ids).values,
+        "progresivo": zero.add(prog, fill_value=0.0).reindex(ids).values,
+        "victorias": zero.add(wins, fill_value=0).reindex(ids).astype(int).values,
+        "negras": zero.add(blacks, fill_value=0).reindex(ids).astype(int).values,
+    }, index=ids)
+
+def _direct_encounter(keys: pd.DataFrame, games: pd.DataFrame) -> pd.Series:
+    """
+    Enfrentamiento directo: puntos logrados contra los jugadores con los que se empata en
+    todas las claves de `keys` (índice = id). 0 para quien no está empatado.
+    """
+    ids = keys.index
+    group = keys.groupby(list(keys.columns), sort=False, dropna=False).ngroup()
+    sizes = group.map(group.value_counts())
+    _, long = _player_games(ids, games)
+    gp = long["pid"].map(group)
+    go = long["opp"].map(group)
+    m = (gp == go) & long["pid"].map(sizes).gt(1)
+    de = long.loc[m, "pts"].groupby(long.loc[m, "pid"]).sum()
+    return pd.Series(0.0, index=ids).add(de, fill_value=0.0).reindex(ids)
+
+def compute_standings_from_games(players_df: pd.DataFrame, games: pd.DataFrame,
+                                 tiebreaks: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Igual que compute_standings pero con group-bys sobre la tabla de partidas.
+    Devuelve: pos, id, nombre, curso, grupo, puntos, buchholz, pj (+ columnas de los
+    desempates pedidos que no sean buchholz). Orden: puntos, desempates en el orden
+    indicado (por defecto el de config.json) y nombre.
+    """
+    if players_df is None or players_df.empty:
+        return pd.DataFrame(columns=STANDINGS_COLUMNS)
+    order = list(tiebreaks) if tiebreaks is not None else tiebreak_order()
+
+    ids = pd.Index(players_df["id"].astype(str))
+    zero = pd.Series(0.0, index=ids)
+    g = games if games is not None else pd.DataFrame(columns=GAME_COLUMNS)
+
+    byes = g[g["is_bye"].astype(bool) & g["white_id"].isin(ids)]
+    normal = g[~g["is_bye"].astype(bool) & g["white_id"].isin(ids) & g["black_id"].isin(ids)]
+
+    # Puntos
+    pts = zero.add(byes.groupby("white_id")["white_pts"].sum(), fill_value=0.0)
+    pts = pts.add(normal.groupby("white_id")["white_pts"].sum(), fill_value=0.0)
+    pts = pts.add(normal.groupby("black_id")["black_pts"].sum(), fill_value=0.0)
+    pts = pts.reindex(ids)
+
+    # Partidas jugadas: colores (BYE cuenta como 'W') + 1 si tuvo BYE
+    n_bye = byes.groupby("white_id").size().reindex(ids, fill_value=0)
+    n_w = normal.groupby("white_id").size().reindex(ids, fill_value=0)
+    n_b = normal.groupby("black_id").size().reindex(ids, fill_value=0)
+    pj = n_w + n_b + n_bye + (n_bye > 0).astype(int)
+
+    # Desempates (Buchholz: suma de puntos de rivales distintos)
+    tb = compute_tiebreaks(ids, g, pts)
+
+    nombre = _formatted_names(players_df)
+
+    df = pd.DataFrame({
+        "id": ids.values,
+        "nombre": nombre.values,
+        "curso": players_df["curso"].values,
+        "grupo": players_df["grupo"].values,
+        "puntos": pts.round(2).values,
+        "buchholz": tb["buchholz"].round(2).values,
+        "pj": pj.astype(int).values,
+    })
+    extra = [k for k in order if k != "buchholz"]
+    for k in extra:
+        if k == "enfrentamiento":
+            # empate en puntos y en los desempates anteriores a este
+            keys = df.set_index("id")[["puntos"] + order[:order.index(k)]]
+            df[k] = _direct_encounter(keys, g).round(2).values
+        else:
+            df[k] = tb[k].round(2).values if tb[k].dtype.kind == "f" else tb[k].values
+
+    by = ["puntos"] + order + ["nombre"]
+    df = df.sort_values(by=by, ascending=[False] * (len(by) - 1) + [True]).reset_index(drop=True)
+    df.insert(0, "pos", df.index + 1)
+    return df
+
+def standings_from_rounds(rounds: List[int], players_path: Optional[str] = None, bye_points: float = 1.0,
+                          tiebreaks: Optional[List[str]] = None) -> pd.DataFrame:
+    """Clasificación tras las rondas indicadas usando el motor columnar."""
+    return compute_standings_from_games(read_players_df(players_path), build_game_table(rounds, bye_points=bye_points),
+                                        tiebreaks=tiebreaks)
+
 # ============================================================
 # Emparejador Suizo (reglas pragmáticas + “no 3 colores seguidos”)
 # ============================================================
@@ -651,6 +1415,76 @@ def _name_of(players: Dict[str, dict], pid: str) -> str:
     p = players.get(pid, {})
     return formatted_name_from_parts(p.get("nombre",""), p.get("apellido1",""), p.get("apellido2",""))
 
+def _choose_colors(a: str, b: str, players: Dict[str, dict], balance: bool = False) -> Tuple[str, str]:
+    """
+    Devuelve (blancas, negras) para la pareja a-b evitando 3 colores seguidos.
+    Con `balance=True`, si no hay conflicto fuerte se asignan blancas a quien
+    acumula más negras (y, a igualdad, a quien jugó con negras la última ronda).
+    """
+    aW_bad = _has_three_in_a_row(players[a].get("colors", []), "W")
+    aB_bad = _has_three_in_a_row(players[a].get("colors", []), "B")
+    bW_bad = _has_three_in_a_row(players[b].get("colors", []), "W")
+    bB_bad = _has_three_in_a_row(players[b].get("colors", []), "B")
+
+    choice = ("W", "B")  # por defecto: a con blancas
+    if aW_bad and not aB_bad:
+        choice = ("B", "W")
+    elif not aW_bad and aB_bad:
+        choice = ("W", "B")
+    elif aW_bad and aB_bad:
+        # si ambos malos, priorizamos evitar conflicto en b
+        if bW_bad and not bB_bad:
+            choice = ("W", "B")  # b negras
+        elif not bW_bad and bB_bad:
+            choice = ("B", "W")
+    else:
+        # ajustar si b tiene conflicto fuerte
+        if bW_bad and not bB_bad:
+            choice = ("W", "B")
+        elif not bW_bad and bB_bad:
+            choice = ("B", "W")
+        elif balance:
+            # sin conflictos: equilibrar blancas/negras
+            ca = players[a].get("colors", [])
+            cb = players[b].get("colors", [])
+            da = ca.count("W") - ca.count("B")
+            db = cb.count("W") - cb.count("B")
+            if da > db:
+                choice = ("B", "W")
+            elif da == db and ca and cb and ca[-1] == "W" and cb[-1] != "W":
+                choice = ("B", "W")
+
+    return (a, b) if choice == ("W", "B") else (b, a)
+
+def _pairings_dataframe(players: Dict[str, dict], bye_id: Optional[str], pairings: List[Tuple[str, str]]) -> pd.DataFrame:
+    """DataFrame de salida del emparejador (BYE en la mesa 1, luego las parejas en orden)."""
+    rows = []
+    mesa = 1
+    if bye_id:
+        rows.append({
+            "mesa": mesa,
+            "blancas_id": bye_id,
+            "blancas_nombre": _name_of(players, bye_id),
+            "negras_id": "BYE",
+            "negras_nombre": "BYE",
+            "resultado": ""  # luego se podrá marcar BYE1.0 / BYE0.5 / BYE
+        })
+        mesa += 1
+
+    for w, b in pairings:
+        rows.append({
+            "mesa": mesa,
+            "blancas_id": w,
+            "blancas_nombre": _name_of(players, w),
+            "negras_id": b,
+            "negras_nombre": _name_of(players, b),
+            "resultado": ""
+        })
+        mesa += 1
+
+    df = pd.DataFrame(rows, columns=["mesa", "blancas_id", "blancas_nombre", "negras_id", "negras_nombre", "resultado"])
+    return df
+
 def swiss_pair_round(players: Dict[str, dict], round_no: int, forced_bye_id: Optional[str] = None) -> pd.DataFrame:
     """
     Genera emparejamientos de la ronda `round_no` (sistema suizo, heurístico).
@@ -730,91 +1564,268 @@ def swiss_pair_round(players: Dict[str, dict], round_no: int, forced_bye_id: Opt
         b = grouped[best_j]
 
         # Decidir colores evitando 3 seguidas
-        aW_bad = _has_three_in_a_row(players[a].get("colors", []), "W")
-        aB_bad = _has_three_in_a_row(players[a].get("colors", []), "B")
-        bW_bad = _has_three_in_a_row(players[b].get("colors", []), "W")
-        bB_bad = _has_three_in_a_row(players[b].get("colors", []), "B")
-
-        choice = ("W", "B")  # por defecto: a con blancas
-        if aW_bad and not aB_bad:
-            choice = ("B", "W")
-        elif not aW_bad and aB_bad:
-            choice = ("W", "B")
-        elif aW_bad and aB_bad:
-            # si ambos malos, priorizamos evitar conflicto en b
-            if bW_bad and not bB_bad:
-                choice = ("W", "B")  # b negras
-            elif not bW_bad and bB_bad:
-                choice = ("B", "W")
-        else:
-            # ajustar si b tiene conflicto fuerte
-            if bW_bad and not bB_bad:
-                choice = ("W", "B")
-            elif not bW_bad and bB_bad:
-                choice = ("B", "W")
-
-        if choice == ("W", "B"):
-            pairings.append((a, b))
-        else:
-            pairings.append((b, a))
+        pairings.append(_choose_colors(a, b, players))
 
         used.add(a)
         used.add(b)
         i += 1
 
-    # Construir DataFrame salida
-    rows = []
-    mesa = 1
-    if bye_id:
-        rows.append({
-            "mesa": mesa,
-            "blancas_id": bye_id,
-            "blancas_nombre": _name_of(players, bye_id),
-            "negras_id": "BYE",
-            "negras_nombre": "BYE",
-            "resultado": ""  # luego se podrá marcar BYE1.0 / BYE0.5 / BYE
-        })
-        mesa += 1
+    return _pairings_dataframe(players, bye_id, pairings)
 
-    for w, b in pairings:
-        rows.append({
-            "mesa": mesa,
-            "blancas_id": w,
-            "blancas_nombre": _name_of(players, w),
-            "negras_id": b,
-            "negras_nombre": _name_of(players, b),
-            "resultado": ""
-        })
-        mesa += 1
+# ============================================================
+# Emparejador por emparejamiento de peso máximo (blossom)
+# ============================================================
+# Pesos enteros (evitan errores de redondeo en el solver). Cuanto mayor el
+# peso de una arista, más deseable la pareja; las penalizaciones se restan.
+_MWM_BASE = 10_000_000
+_MWM_REMATCH = 1_000_000       # repetir rival
+_MWM_COLOR = 100_000           # ninguna orientación evita 3 colores seguidos
+_MWM_SCORE = 4_000             # por (medios puntos de diferencia)^2
+_MWM_COLOR_SOFT = 100          # ambos vienen del mismo color
+_MWM_BYE_REPEAT = 1_000_000    # BYE a quien ya lo tuvo
+_MWM_BYE_SCORE = 4_000         # BYE: por cada medio punto del receptor
+_MWM_BYE_NODE = "__BYE__"
+MWM_BLOCK_SIZE = 24
+
+PAIRING_ENGINES = ("mwm", "greedy")
+
+def _mwm_edge_weight(a: str, b: str, players: Dict[str, dict]) -> int:
+    """Peso de la arista a-b: diferencia de puntos, no repetir rival y regla de colores."""
+    pa, pb = players[a], players[b]
+    d = abs(float(pa.get("points", 0.0)) - float(pb.get("points", 0.0))) * 2
+    w = _MWM_BASE - _MWM_SCORE * int(round(d * d))
+    if b in set(pa.get("opponents", [])):
+        w -= _MWM_REMATCH
+    ca, cb = pa.get("colors", []), pb.get("colors", [])
+    ok_ab = not _has_three_in_a_row(ca, "W") and not _has_three_in_a_row(cb, "B")
+    ok_ba = not _has_three_in_a_row(cb, "W") and not _has_three_in_a_row(ca, "B")
+    if not (ok_ab or ok_ba):
+        w -= _MWM_COLOR
+    elif ca and cb and ca[-1] == cb[-1]:
+        w -= _MWM_COLOR_SOFT
+    return w
+
+def _mwm_bye_weight(pid: str, players: Dict[str, dict]) -> int:
+    """Peso de la arista jugador-BYE: menos puntos y sin BYE previo es mejor."""
+    p = players[pid]
+    w = _MWM_BASE - _MWM_BYE_SCORE * int(round(float(p.get("points", 0.0)) * 2))
+    if p.get("had_bye", False):
+        w -= _MWM_BYE_REPEAT
+    return w
+
+def _mwm_solve(pool: List[str], players: Dict[str, dict], with_bye: bool) -> List[Tuple[str, Optional[str]]]:
+    """Resuelve un bloque con blossom (networkx). Devuelve parejas; (pid, None) = BYE."""
+    import networkx as nx
+
+    G = nx.Graph()
+    G.add_nodes_from(pool)
+    for i, a in enumerate(pool):
+        for b in pool[i + 1:]:
+            G.add_edge(a, b, weight=_mwm_edge_weight(a, b, players))
+    if with_bye:
+        for a in pool:
+            G.add_edge(a, _MWM_BYE_NODE, weight=_mwm_bye_weight(a, players))
+
+    out: List[Tuple[str, Optional[str]]] = []
+    for a, b in nx.max_weight_matching(G, maxcardinality=True):
+        if a == _MWM_BYE_NODE:
+            out.append((b, None))
+        elif b == _MWM_BYE_NODE:
+            out.append((a, None))
+        else:
+            out.append((a, b))
+    return out
 
-    df = pd.DataFrame(rows, columns=["mesa", "blancas_id", "blancas_nombre", "negras_id", "negras_nombre", "resultado"])
-    return df
+def swiss_pair_round_mwm(players: Dict[str, dict], round_no: int, forced_bye_id: Optional[str] = None,
+                         block_size: Optional[int] = None) -> pd.DataFrame:
+    """
+    Emparejamientos de la ronda `round_no` por emparejamiento de peso máximo.
+    Mismo DataFrame de salida que `swiss_pair_round`.
+
+    Se recorre la clasificación en bloques de ~`block_size` jugadores (cerrando en
+    frontera de grupo de puntos cuando cabe) y cada bloque se resuelve con blossom.
+    Las parejas que repiten rival y el impar de cada bloque bajan al siguiente,
+    salvo en el último, donde además se añade el nodo BYE si el total es impar.
+    Sin networkx instalado, se usa el emparejador heurístico.
+    """
+    if not available("networkx"):
+        return swiss_pair_round(players, round_no, forced_bye_id=forced_bye_id)
+
+    active_ids = _eligible_players(players)
+    active_ids.sort(key=lambda pid: (-players[pid].get("points", 0.0), _name_of(players, pid)))
+
+    def pts(pid): return players[pid].get("points", 0.0)
+    score_groups: Dict[float, List[str]] = {}
+    for pid in active_ids:
+        score_groups.setdefault(pts(pid), []).append(pid)
+
+    # Barajar dentro del grupo (semilla la controla Admin antes)
+    for g in score_groups.values():
+        random.shuffle(g)
+
+    grouped: List[str] = []
+    for s in sorted(score_groups.keys(), reverse=True):
+        grouped.extend(score_groups[s])
+
+    # BYE forzado (solo si impar); si no, lo decide el último bloque
+    bye_id = None
+    if len(grouped) % 2 == 1 and forced_bye_id and forced_bye_id in grouped:
+        bye_id = forced_bye_id
+        grouped.remove(bye_id)
+    need_bye = len(grouped) % 2 == 1
+
+    rank = {pid: i for i, pid in enumerate(grouped)}
+    size = max(4, int(block_size or MWM_BLOCK_SIZE))
+
+    pairs: List[Tuple[str, str]] = []
+    carry: List[str] = []
+    pos = 0
+    n = len(grouped)
+    while True:
+        pool = list(carry)
+        while pos < n and len(pool) < size:
+            pool.append(grouped[pos]); pos += 1
+        # completar el grupo de puntos en curso si no se dispara el tamaño
+        while pos < n and pts(grouped[pos]) == pts(pool[-1]) and len(pool) < size + size // 2:
+            pool.append(grouped[pos]); pos += 1
+        # evitar un último bloque diminuto (sin margen para evitar repeticiones)
+        if n - pos < size // 2:
+            pool.extend(grouped[pos:]); pos = n
+        if not pool:
+            break
+
+        last = pos >= n
+        carry = []
+        if not last and len(pool) % 2 == 1:
+            carry.append(pool.pop())
+
+        for a, b in _mwm_solve(pool, players, with_bye=last and need_bye):
+            if b is None:
+                bye_id = a
+                continue
+            if not last and b in set(players[a].get("opponents", [])) and len(carry) + 2 < size:
+                carry.extend([a, b])
+                continue
+            pairs.append((a, b) if rank[a] < rank[b] else (b, a))
+
+        carry.sort(key=lambda pid: rank[pid])
+        if last:
+            break
+
+    # Mesas por orden de clasificación del mejor de la pareja
+    pairs.sort(key=lambda ab: rank[ab[0]])
+    pairings = [_choose_colors(a, b, players, balance=True) for a, b in pairs]
+    return _pairings_dataframe(players, bye_id, pairings)
+
+def pair_round(players: Dict[str, dict], round_no: int, forced_bye_id: Optional[str] = None,
+               engine: Optional[str] = None) -> pd.DataFrame:
+    """Empareja con el motor indicado o el de config.json ('emparejador': mwm | greedy)."""
+    if engine is None:
+        try:
+            engine = load_config().get("emparejador", "mwm")
+        except Exception:
+            engine = "mwm"
+    if str(engine).strip().lower() == "greedy":
+        return swiss_pair_round(players, round_no, forced_bye_id=forced_bye_id)
+    return swiss_pair_round_mwm(players, round_no, forced_bye_id=forced_bye_id)
 
 # --------------------------
 # NUEVO: Seguimiento de progreso ronda a ronda
 # --------------------------
 
-def get_rank_progress(max_rondas: int = 7) -> dict[str, list[int]]:
+_RANK_LOCK = threading.Lock()
+_RANK_CACHE: Dict[str, Tuple[tuple, pd.DataFrame]] = {}
+
+def rank_history(rounds: List[int], players_path: Optional[str] = None, bye_points: float = 1.0,
+                 tiebreaks: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Posición de cada jugador tras cada ronda de `rounds` (aplicadas en orden), con los
+    mismos criterios que la clasificación (puntos, desempates configurados, nombre).
+
+    Se recorre la tabla de partidas una sola vez: puntos acumulados por ronda (cumsum),
+    Buchholz de cada corte sobre los rivales vistos hasta entonces y una ordenación por ronda.
+    Con otros desempates distintos de Buchholz, se clasifica cada corte con el motor de
+    desempates sobre la misma tabla de partidas.
+    Devuelve DataFrame con índice = id de jugador y una columna por ronda (posiciones int).
+    Cacheado por la huella de los datos (jugadores + firma de cada ronda + bye_points + desempates).
+    """
+    path = players_path or PLAYERS_PATH
+    rounds = list(dict.fromkeys(int(r) for r in (rounds or [])))
+    order = list(tiebreaks) if tiebreaks is not None else tiebreak_order()
+    key = (file_sig(path), tuple((r, round_sig(r)) for r in rounds), float(bye_points), tuple(order))
+    cache_key = os.path.abspath(path)
+    with _RANK_LOCK:
+        hit = _RANK_CACHE.get(cache_key)
+    if hit is not None and hit[0] == key:
+        return hit[1].copy()
+
+    players_df = read_players_df(path)
+    ids = players_df["id"].astype(str).to_numpy()
+    n, R = len(ids), len(rounds)
+    if n == 0 or R == 0:
+        out = pd.DataFrame(index=pd.Index(ids, name="id"), columns=rounds, dtype=int)
+    elif order != ["buchholz"]:
+        g = build_game_table(rounds, bye_points=bye_points)
+        positions = {}
+        for k, r in enumerate(rounds):
+            st_k = compute_standings_from_games(players_df, g[g["round"].isin(rounds[:k + 1])], tiebreaks=order)
+            positions[r] = pd.Series(st_k["pos"].values, index=st_k["id"].astype(str).values).reindex(ids).values
+        out = pd.DataFrame(positions, index=pd.Index(ids, name="id"), columns=rounds).astype(int)
+    else:
+        pos_of = {pid: k for k, pid in enumerate(ids)}
+        col_of = {r: k for k, r in enumerate(rounds)}
+        g = build_game_table(rounds, bye_points=bye_points)
+        wi = g["white_id"].map(pos_of)
+        bi = g["black_id"].map(pos_of)
+        rk = g["round"].map(col_of).to_numpy()
+        bye = g["is_bye"].astype(bool).to_numpy()
+
+        # Puntos por ronda y acumulados
+        pts = np.zeros((n, R))
+        m_bye = bye & wi.notna().to_numpy()
+        m_game = ~bye & wi.notna().to_numpy() & bi.notna().to_numpy()
+        np.add.at(pts, (wi[m_bye].astype(int).to_numpy(), rk[m_bye]), g["white_pts"].to_numpy()[m_bye])
+        w_idx = wi[m_game].astype(int).to_numpy()
+        b_idx = bi[m_game].astype(int).to_numpy()
+        np.add.at(pts, (w_idx, rk[m_game]), g["white_pts"].to_numpy()[m_game])
+        np.add.at(pts, (b_idx, rk[m_game]), g["black_pts"].to_numpy()[m_game])
+        cum = pts.cumsum(axis=1)
+
+        # Rivales distintos, con la primera ronda en que se enfrentaron
+        edges = pd.DataFrame({
+            "p": np.concatenate([w_idx, b_idx]),
+            "o": np.concatenate([b_idx, w_idx]),
+            "k": np.concatenate([rk[m_game], rk[m_game]]),
+        }).sort_values("k", kind="stable").drop_duplicates(["p", "o"], keep="first")
+        ep, eo, ek = edges["p"].to_numpy(), edges["o"].to_numpy(), edges["k"].to_numpy()
+
+        # Orden por nombre (desempate final), estable respecto al orden de carga
+        _, name_rank = np.unique(_formatted_names(players_df).to_numpy(dtype=str), return_inverse=True)
+
+        positions = np.zeros((n, R), dtype=int)
+        for k in range(R):
+            m = ek <= k
+            buch = np.bincount(ep[m], weights=cum[eo[m], k], minlength=n)
+            sort_idx = np.lexsort((name_rank, -np.round(buch, 2), -np.round(cum[:, k], 2)))
+            positions[sort_idx, k] = np.arange(1, n + 1)
+        out = pd.DataFrame(positions, index=pd.Index(ids, name="id"), columns=rounds)
+
+    with _RANK_LOCK:
+        _RANK_CACHE[cache_key] = (key, out)
+    return out.copy()
+
+def get_rank_progress(max_rondas: int = 7, players_path: Optional[str] = None, bye_points: float = 1.0) -> dict[str, list[int]]:
     """
     Devuelve un diccionario:
         { "IDJugador1": [posición R1, R2, ...], ... }
-
-    Si no hay datos suficientes para una ronda, se omite esa posición.
+    con la posición tras cada ronda publicada (hasta `max_rondas`).
     """
-    from lib.tournament import get_standings
-    progress = {}
-    for ronda in range(1, max_rondas + 1):
-        try:
-            standings = get_standings(upto_round=ronda)
-            for pos, row in enumerate(standings.itertuples(), start=1):
-                pid = str(row.id)
-                if pid not in progress:
-                    progress[pid] = []
-                progress[pid].append(pos)
-        except Exception:
-            # Si hay error (ej: no hay datos suficientes), salta
-            continue
-    return progress
+    try:
+        rounds = [r for r in list_round_files(max_rondas) if is_published(r)]
+        hist = rank_history(rounds, players_path, bye_points=bye_points)
+    except Exception:
+        return {}
+    return {str(pid): [int(x) for x in row] for pid, row in zip(hist.index, hist.to_numpy())}
 
 def format_rank_progress(rank_list: list[int]) -> str:
     """
@@ -833,11 +1844,7 @@ import pandas as pd
 def _results_empty_count_core(df: Optional[pd.DataFrame]) -> Optional[int]:
     if df is None or df.empty or "resultado" not in df.columns:
         return None
-    res = (
-        df["resultado"].astype(str).str.strip()
-          .replace({"None":"", "none":"", "NaN":"", "nan":"", "N/A":"", "n/a":""})
-    )
-    return int((res == "").sum())
+    return _results_empty_count(df["resultado"])
 
 class MetaDiag(NamedTuple):
     existing_rounds: list[int]
@@ -849,16 +1856,11 @@ class MetaDiag(NamedTuple):
     summary: dict                # contadores varios
 
 def diagnose_meta() -> MetaDiag:
-    meta = load_meta() or {}
+    meta = meta_view()
     rounds_meta = meta.get("rounds", {}) if isinstance(meta, dict) else {}
 
-    # Rondas con CSV
-    try:
-        existing = [int(re.findall(r"\d+", f)[0]) for f in os.listdir(DATA_DIR)
-                    if re.fullmatch(r"pairings_R\d+\.csv", f)]
-    except Exception:
-        existing = []
-    existing = sorted(existing)
+    # Rondas con emparejamientos (CSV o BD)
+    existing = list_round_files()
 
     # Rondas en meta
     meta_rounds = sorted([int(k) for k in rounds_meta.keys() if str(k).isdigit()])
@@ -879,7 +1881,7 @@ def diagnose_meta() -> MetaDiag:
 
         # 'closed' según realidad operativa (publicada si meta o flag) y sin vacíos
         real_pub_for_closed = bool(meta_pub or has_flag)
-        dfp = read_csv_safe(round_file(i))
+        dfp = read_round(i)
         empties = _results_empty_count_core(dfp)
         real_closed = bool(real_pub_for_closed and (empties == 0))
         if bool(r.get("closed", False)) != real_closed:
@@ -950,7 +1952,7 @@ def repair_meta(
     # 3) closed
     if fix_closed:
         for i in diag.existing_rounds:
-            dfp = read_csv_safe(round_file(i))
+            dfp = read_round(i)
             empties = _results_empty_count_core(dfp)
             real_pub = is_published(i)
             real_closed = bool(real_pub and (empties == 0))
@@ -999,16 +2001,7 @@ def force_sync_flags_with_meta() -> int:
         rounds = {}
 
     changed = 0
-    try:
-        files = os.listdir(DATA_DIR)
-    except Exception:
-        files = []
-
-    for fn in files:
-        m = re.fullmatch(r"pairings_R(\d+)\.csv", fn)
-        if not m:
-            continue
-        i = int(m.group(1))
+    for i in list_round_files():
         pub_meta = bool(rounds.get(str(i), {}).get("published", False))
         flag = _pub_flag_path(i)
         try:
@@ -1020,5 +2013,7 @@ def force_sync_flags_with_meta() -> int:
                 changed += 1
         except Exception:
             pass
+    if changed:
+        bump_state_version(all_rounds=True)
     return changed
 
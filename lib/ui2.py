@@ -3,18 +3,26 @@
 from __future__ import annotations
 
 import os
-from typing import List, Dict, Optional
+import threading
+from typing import Dict, Iterable, List, Optional
 
 import pandas as pd
 
 # Import canonical utilities from the tournament core
 from lib.tournament import (
     DATA_DIR,
-    read_csv_safe,
+    read_round,
     round_file,
+    round_sig,
+    list_round_files,
+    meta_view,
+    storage_backend,
     is_published,
     set_published,
+    state_version,
 )
+from lib.results import empty_count
+from lib.export_jobs import get_job
 
 # -------------------------
 # Publicación robusta (meta + flag) - wrappers
@@ -50,9 +58,10 @@ def set_pub(i: int, val: bool, seed: Optional[str] = None) -> None:
     fp = _pub_flag_path(i)
     try:
         if val:
-            # crear/asegurar flag
+            # crear/asegurar flag (sin tocar uno ya creado: cambiaría su mtime tras la subida de versión)
             os.makedirs(os.path.dirname(fp), exist_ok=True)
-            open(fp, "w").close()
+            if not os.path.exists(fp):
+                open(fp, "w").close()
         else:
             # eliminar flag si existe
             if os.path.exists(fp):
@@ -64,20 +73,65 @@ def set_pub(i: int, val: bool, seed: Optional[str] = None) -> None:
 # -------------------------
 # Estado por ronda
 # -------------------------
-def _normalize_result_series(s: pd.Series) -> pd.Series:
-    """Convierte None/nan/'None'/'nan'/'N/A' en '' y recorta espacios."""
-    return (
-        s.astype(str)
-         .str.strip()
-         .replace({"None": "", "none": "", "NaN": "", "nan": "", "N/A": "", "n/a": ""})
-    )
-
 def results_empty_count(df: Optional[pd.DataFrame]) -> Optional[int]:
     """Cuenta resultados vacíos en un CSV de emparejamientos; None si df inválido."""
     if df is None or df.empty or "resultado" not in df.columns:
         return None
-    res = _normalize_result_series(df["resultado"])
-    return int((res == "").sum())
+    return empty_count(df["resultado"])
+
+# Memo de vacíos por ronda: i -> (firma de la ronda, existe, vacíos)
+_EMPTIES_MEMO: Dict[int, tuple] = {}
+_EMPTIES_LOCK = threading.Lock()
+
+def _round_content(i: int) -> tuple:
+    """(existe, vacíos) de la ronda i, releyendo solo si cambió su firma (mtime/tamaño o versión en BD)."""
+    sig = round_sig(i)
+    with _EMPTIES_LOCK:
+        hit = _EMPTIES_MEMO.get(i)
+    if hit is not None and sig is not None and hit[0] == sig:
+        return hit[1], hit[2]
+    df = read_round(i)
+    exists = df is not None and not df.empty
+    empties = results_empty_count(df) if exists else None
+    with _EMPTIES_LOCK:
+        _EMPTIES_MEMO[i] = (sig, exists, empties)
+    return exists, empties
+
+def scan_round_states(rounds: Iterable[int]) -> List[Dict[str, object]]:
+    """
+    Estado de varias rondas con una sola pasada:
+      - un listado de DATA_DIR (CSV y flag-files)
+      - una lectura de meta (vista cacheada)
+      - vacíos memoizados por firma de cada ronda
+    Cada elemento: { "i", "exists", "published", "empties", "closed", "path" }.
+    """
+    rounds = [int(i) for i in rounds]
+    try:
+        files = set(os.listdir(DATA_DIR))
+    except Exception:
+        files = set()
+
+    sqlite = storage_backend() == "sqlite"
+    if sqlite:
+        on_disk = set(list_round_files())
+        pub_core = {i for i in on_disk if is_published(i)}
+    else:
+        on_disk = {i for i in rounds if f"pairings_R{i}.csv" in files}
+        try:
+            rounds_meta = meta_view().get("rounds", {})
+        except Exception:
+            rounds_meta = {}
+        pub_core = {i for i in rounds if bool((rounds_meta.get(str(i)) or {}).get("published", False))}
+    flags = {i for i in rounds if f"published_R{i}.flag" in files}
+
+    out = []
+    for i in rounds:
+        exists, empties = _round_content(i) if i in on_disk else (False, None)
+        pub = exists and (i in pub_core or i in flags)
+        closed = exists and pub and (empties == 0)
+        out.append({"i": i, "exists": exists, "published": pub, "empties": empties, "closed": closed,
+                    "path": round_file(i)})
+    return out
 
 def round_status(i: int) -> Dict[str, object]:
     """
@@ -85,13 +139,7 @@ def round_status(i: int) -> Dict[str, object]:
       { "i": i, "exists": bool, "published": bool, "empties": int|None, "closed": bool, "path": str }
     Cerrada <=> existe & publicada & sin vacíos.
     """
-    p = round_file(i)
-    df = read_csv_safe(p)
-    exists = df is not None and not df.empty
-    empties = results_empty_count(df) if exists else None
-    pub = is_pub(i) if exists else False
-    closed = exists and pub and (empties == 0)
-    return {"i": i, "exists": exists, "published": pub, "empties": empties, "closed": closed, "path": p}
+    return scan_round_states([i])[0]
 
 def status_label(s: Dict[str, object]) -> str:
     if not s.get("exists"):
@@ -103,8 +151,8 @@ def status_label(s: Dict[str, object]) -> str:
     return "📝 Borrador"
 
 def get_states(n_rounds: int) -> List[Dict[str, object]]:
-    """Estado para todas las rondas 1..n_rounds."""
-    return [round_status(i) for i in range(1, int(n_rounds) + 1)]
+    """Estado para todas las rondas 1..n_rounds (un solo escaneo)."""
+    return scan_round_states(range(1, int(n_rounds) + 1))
 
 
 
@@ -302,3 +350,74 @@ def require_teacher(redirect_to: str | None = None):
             except Exception:
                 pass
         st.stop()
+
+
+# --- Auto-refresco: sondea solo la versión del estado del torneo -------------
+AUTO_REFRESH_MIN_SECONDS = 2.0
+
+def auto_refresh(cfg: Optional[dict] = None, key: str = "page") -> None:
+    """
+    Si config.json trae "auto_refresh_seconds" > 0, un fragmento comprueba cada N s
+    state_version() (un stat + JSON pequeño) y relanza la página SOLO si ha avanzado.
+    Llamar al PRINCIPIO de la página, antes de leer datos: la versión anotada es la
+    que había cuando empezó este render, así un cambio a mitad también se detecta.
+    Sin st.fragment (Streamlit antiguo) no hace nada.
+    """
+    try:
+        secs = float((cfg or {}).get("auto_refresh_seconds", 0) or 0)
+    except Exception:
+        secs = 0.0
+    if secs <= 0:
+        return
+    fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    if fragment is None:
+        return
+    seen_key = f"_state_version_{key}"
+    st.session_state[seen_key] = state_version()
+
+    @fragment(run_every=max(secs, AUTO_REFRESH_MIN_SECONDS))
+    def _poll():
+        v = state_version()
+        if v > st.session_state.get(seen_key, v):
+            st.session_state[seen_key] = v
+            _safe_rerun()
+
+    _poll()
+
+
+# --- Descargas de exportaciones en segundo plano ------------------------------
+EXPORT_POLL_SECONDS = 1.0
+
+def export_download(job, label: str, file_name: str, waiting: str, missing: str,
+                    key: Optional[str] = None, mime: str = "application/pdf") -> None:
+    """
+    Zona de descarga de un trabajo de lib/export_jobs.py.
+    - Listo: botón de descarga. Con error / sin motor PDF: aviso `missing`.
+    - En curso: un fragmento sondea SOLO este trabajo cada EXPORT_POLL_SECONDS
+      (progreso) y relanza la página una única vez cuando termina.
+      Sin st.fragment, un botón para comprobar a mano (sin esperas en el script).
+    """
+    if job is None:
+        return
+    if job.done:
+        if job.ok:
+            st.download_button(label, data=job.data, file_name=file_name, mime=mime,
+                               use_container_width=True, key=key)
+        else:
+            st.caption(missing)
+        return
+
+    fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    if fragment is None:
+        st.caption(f"{waiting} {int(job.progress * 100)} %")
+        st.button("🔄 Comprobar", key=f"{key or file_name}_poll")
+        return
+
+    @fragment(run_every=EXPORT_POLL_SECONDS)
+    def _poll():
+        j = get_job(job.key) or job
+        if j.done:
+            _safe_rerun()
+        st.caption(f"{waiting} {int(j.progress * 100)} %")
+
+    _poll()
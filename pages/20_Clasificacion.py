@@ -1,28 +1,24 @@
 # pages/20_Clasificacion.py
 # -*- coding: utf-8 -*-
 
-import io, os, re
-from datetime import datetime
+import io, os
 
 import pandas as pd
 import streamlit as st
 
-from reportlab.lib.pagesizes import A4, A3, landscape
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle
-from reportlab.lib.units import mm
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-
 from lib.ui import page_header, sidebar_title_and_nav
 from lib.tournament import (
-    DATA_DIR, load_config, read_players_from_csv, read_csv_safe,
-    list_round_files, round_file, apply_results, compute_standings,
-    is_published, format_with_cfg, planned_rounds
+    DATA_DIR, load_config, list_round_files, is_published, format_with_cfg,
+    planned_rounds, format_rank_progress, TIEBREAK_LABELS,
+)
+from lib.shared_cache import shared_crosstable, shared_player_stats, shared_rank_history, shared_standings
+from lib.export_jobs import request_export
+from lib.exports import (
+    slugify, build_standings_pdf, build_crosstable_pdf, crosstable_dense_max,
 )
 
-from lib.ui2 import login_widget, is_teacher
+from lib.ui2 import login_widget, is_teacher, auto_refresh, export_download
+from lib.data_watcher import ensure_data_watcher
 from lib.ui import sidebar_title_and_nav, inject_base_style  # ya lo tendrás
 import streamlit as st
 
@@ -54,336 +50,13 @@ except Exception:
 # Cabecera
 # -----------------------------------------
 cfg = load_config()
+auto_refresh(cfg, key="clasificacion")  # relanza solo si cambia la versión del torneo
+ensure_data_watcher(cfg)                # vigilante de data/ (si config lo activa)
 page_header(
     format_with_cfg("🏆 Clasificación — {nivel}", cfg),
     format_with_cfg("Curso {anio} · Solo tiene en cuenta rondas PUBLICADAS", cfg)
 )
 
-# -----------------------------------------
-# Utilidades locales
-# -----------------------------------------
-def slugify(s: str) -> str:
-    s = re.sub(r"\s+", "_", str(s).strip())
-    s = re.sub(r"[^A-Za-z0-9_\-]+", "", s)
-    return s or "torneo"
-
-
-def _register_fonts():
-    basep = os.path.join("assets", "fonts")
-    ok = False
-    try:
-        if os.path.exists(os.path.join(basep, "OldStandard-Regular.ttf")):
-            pdfmetrics.registerFont(TTFont("OldStd",   os.path.join(basep, "OldStandard-Regular.ttf")))
-            if os.path.exists(os.path.join(basep, "OldStandard-Bold.ttf")):
-                pdfmetrics.registerFont(TTFont("OldStd-B", os.path.join(basep, "OldStandard-Bold.ttf")))
-            ok = True
-        if os.path.exists(os.path.join(basep, "PlayfairDisplay-Regular.ttf")):
-            pdfmetrics.registerFont(TTFont("Playfair",   os.path.join(basep, "PlayfairDisplay-Regular.ttf")))
-            if os.path.exists(os.path.join(basep, "PlayfairDisplay-Bold.ttf")):
-                pdfmetrics.registerFont(TTFont("Playfair-B", os.path.join(basep, "PlayfairDisplay-Bold.ttf")))
-            ok = True
-    except Exception:
-        pass
-    return ok
-
-
-def build_standings_pdf(
-    df_st: pd.DataFrame,
-    cfg: dict,
-    ronda_actual: int | None,
-    show_bh: bool = True,
-    include_stats: bool = False,
-    paper: str = "A4"
-) -> bytes | None:
-    'Genera PDF con tu estética; si include_stats=True añade Progreso/Victorias/Blancas/Negras/Performance. Selector A4/A3.'
-    try:
-        has_custom = _register_fonts()
-        SERIF    = "OldStd"     if has_custom else "Times-Roman"
-        SERIF_B  = "OldStd-B"   if has_custom else "Times-Bold"
-
-        PAPER_RL = {"A4": A4, "A3": A3}
-        page_size = PAPER_RL.get(paper, A4)
-
-        buf = io.BytesIO()
-        doc = SimpleDocTemplate(
-            buf, pagesize=page_size,
-            leftMargin=17*mm, rightMargin=17*mm,
-            topMargin=14*mm, bottomMargin=14*mm
-        )
-
-        def _draw_frame(canvas, d):
-            canvas.saveState()
-            canvas.setStrokeColor(colors.black)
-            canvas.setLineWidth(1.1)
-            x = doc.leftMargin - 5*mm
-            y = doc.bottomMargin - 5*mm
-            w = doc.width + 10*mm
-            h = doc.height + 10*mm
-            canvas.rect(x, y, w, h)
-            canvas.restoreState()
-
-        styles = getSampleStyleSheet()
-        H1 = ParagraphStyle("H1", parent=styles["Normal"], fontName=SERIF_B, fontSize=18, leading=22, alignment=1, spaceAfter=2)
-        H3 = ParagraphStyle("H3", parent=styles["Normal"], fontName=SERIF_B, fontSize=16, leading=20, alignment=1, spaceBefore=2, spaceAfter=4)
-        CELL = ParagraphStyle("CELL", parent=styles["Normal"], fontName=SERIF,   fontSize=10.5, leading=13, alignment=1)
-        CELL_L = ParagraphStyle("CELL_L", parent=styles["Normal"], fontName=SERIF, fontSize=10.5, leading=13, alignment=0)
-
-        titulo = (cfg.get("titulo") or "TORNEO DE AJEDREZ").strip()
-        anio   = (cfg.get("anio") or "").strip()
-        nivel  = (cfg.get("nivel") or "").strip()
-
-        # Bandas cabecera
-        band1 = Table([[Paragraph(f"{titulo} {anio}".strip(), H1)]], colWidths=[doc.width])
-        band1.setStyle(TableStyle([
-            ("BACKGROUND", (0,0), (-1,-1), colors.whitesmoke),
-            ("ALIGN", (0,0), (-1,-1), "CENTER"),
-            ("BOTTOMPADDING", (0,0), (-1,-1), 6),
-            ("TOPPADDING", (0,0), (-1,-1), 6),
-        ]))
-        band2 = Table([[Paragraph(nivel or "", H1)]], colWidths=[doc.width])
-        band2.setStyle(TableStyle([
-            ("BACKGROUND", (0,0), (-1,-1), colors.whitesmoke),
-            ("ALIGN", (0,0), (-1,-1), "CENTER"),
-            ("BOTTOMPADDING", (0,0), (-1,-1), 12),
-            ("TOPPADDING", (0,0), (-1,-1), 12),
-        ]))
-        linea = f"CLASIFICACIÓN DEL TORNEO (tras ronda {ronda_actual})" if ronda_actual else "CLASIFICACIÓN DEL TORNEO"
-        titulo_lista = Table([[Paragraph(linea, H3)]], colWidths=[doc.width])
-        titulo_lista.setStyle(TableStyle([
-            ("ALIGN", (0,0), (-1,-1), "CENTER"),
-            ("BOTTOMPADDING", (0,0), (-1,-1), 6),
-            ("TOPPADDING", (0,0), (-1,-1), 6),
-        ]))
-
-        # --- Cabecera de columnas ---
-        base_cols = ["POS", "JUGADOR/A", "CURSO", "GRUPO", "PTS"]
-        if show_bh and ("buchholz" in df_st.columns):
-            base_cols += ["BUCHHOLZ"]
-        base_cols += ["PJ"]
-
-        stat_cols = []
-        if include_stats:
-            if "Progreso 📈" in df_st.columns: stat_cols.append("PROG.")
-            if "Victorias 🏆" in df_st.columns: stat_cols.append("V")
-            if "⚪ Blancas" in df_st.columns:    stat_cols.append("B")
-            if "⚫ Negras" in df_st.columns:     stat_cols.append("N")
-            if "🎯 Performance" in df_st.columns: stat_cols.append("%")
-
-        head = base_cols + stat_cols
-        data = [head, [""] * len(head)]
-
-        # --- Filas ---
-        for _, r in df_st.iterrows():
-            row = [
-                Paragraph(str(r.get("pos","")), CELL),
-                Paragraph(str(r.get("nombre","")), CELL_L),
-                Paragraph(str(r.get("curso","")), CELL),
-                Paragraph(str(r.get("grupo","")), CELL),
-                Paragraph(str(r.get("puntos","")), CELL),
-            ]
-            if "BUCHHOLZ" in head:
-                row.append(Paragraph(str(r.get("buchholz","")), CELL))
-            row.append(Paragraph(str(r.get("pj","")), CELL))
-
-            if include_stats:
-                if "PROG." in head: row.append(Paragraph(str(r.get("Progreso 📈","")), CELL))
-                if "V" in head:     row.append(Paragraph(str(r.get("Victorias 🏆","")), CELL))
-                if "B" in head:     row.append(Paragraph(str(r.get("⚪ Blancas","")), CELL))
-                if "N" in head:     row.append(Paragraph(str(r.get("⚫ Negras","")), CELL))
-                if "%" in head:     row.append(Paragraph(str(r.get("🎯 Performance","")), CELL))
-
-            data.append(row)
-
-        # --- Anchos ---
-        w_pos, w_jug, w_cur, w_grp, w_pts = 14*mm, 72*mm, 20*mm, 20*mm, 16*mm
-        widths = [w_pos, w_jug, w_cur, w_grp, w_pts]
-        if "BUCHHOLZ" in head:
-            widths.append(26*mm)
-        widths.append(12*mm)  # PJ
-        if include_stats:
-            if "PROG." in head: widths.append(32*mm)
-            if "V" in head:     widths.append(10*mm)
-            if "B" in head:     widths.append(10*mm)
-            if "N" in head:     widths.append(10*mm)
-            if "%" in head:     widths.append(12*mm)
-
-        t = Table(data, colWidths=widths, repeatRows=2)
-        t.setStyle(TableStyle([
-            ("FONT", (0,0), (-1,0), SERIF_B, 11.5),
-            ("BACKGROUND", (0,0), (-1,0), colors.whitesmoke),
-            ("ALIGN", (0,0), (-1,0), "CENTER"),
-            ("VALIGN", (0,0), (-1,0), "MIDDLE"),
-            ("BOTTOMPADDING", (0,0), (-1,0), 6),
-            ("TOPPADDING", (0,0), (-1,0), 6),
-            ("LINEBELOW", (0,0), (-1,0), 1.3, colors.black),
-            ("LINEBELOW", (0,1), (-1,1), 0.6, colors.black),
-            ("TOPPADDING", (0,1), (-1,1), 0),
-            ("BOTTOMPADDING", (0,1), (-1,1), 0),
-            ("FONTSIZE", (0,1), (-1,1), 1),
-            ("ROWHEIGHTS", (0,1), (-1,1), 2),
-            ("LEFTPADDING", (0,2), (-1,-1), 6),
-            ("RIGHTPADDING", (0,2), (-1,-1), 6),
-            ("ALIGN", (0,2), (0,-1), "CENTER"),
-            ("ALIGN", (1,2), (1,-1), "LEFT"),
-            ("ALIGN", (2,2), (-1,-1), "CENTER"),
-            ("VALIGN", (0,2), (-1,-1), "MIDDLE"),
-            ("GRID", (0,2), (-1,-1), 0.4, colors.lightgrey),
-        ]))
-
-        story = [band1, band2, titulo_lista, t]
-        doc.build(story, onFirstPage=_draw_frame, onLaterPages=_draw_frame)
-        return buf.getvalue()
-    except Exception:
-        return None
-
-
-def build_crosstable_df_positions(df_st: pd.DataFrame, publicadas: list[int]) -> pd.DataFrame:
-    'Cuadro doble entrada por POSICIONES.'
-    ids = [str(r.get("id")) for _, r in df_st.iterrows()]
-    pos_map = {str(r.get("id")): int(r.get("pos")) for _, r in df_st.iterrows()}
-    positions = [pos_map[i] for i in ids]
-    mat = pd.DataFrame("", index=positions, columns=positions)
-
-    def parse_res(s: str):
-        if not s:
-            return None, None
-        r = str(s).strip().replace("–", "-").replace("—", "-").replace(" ", "")
-        r = r.replace("½", "0.5").replace(",", ".")
-        if r.upper().startswith("BYE"):
-            return None, None
-        if r == "1-0":
-            return "1", "0"
-        if r == "0-1":
-            return "0", "1"
-        if r in ("0.5-0.5", "0.5-0.5"):
-            return "½", "½"
-        return None, None
-
-    for rnd in (publicadas or []):
-        dfp = read_csv_safe(round_file(rnd))
-        if dfp is None or dfp.empty:
-            continue
-        for _, row in dfp.iterrows():
-            wid = str(row.get("blancas_id", "")).strip()
-            bid = str(row.get("negras_id", "")).strip()
-            res = row.get("resultado", "")
-            if not wid or not bid or wid not in pos_map or bid not in pos_map:
-                continue
-            sw, sb = parse_res(res)
-            if sw is None:
-                continue
-            pw, pb = pos_map[wid], pos_map[bid]
-            prev_wb = mat.at[pw, pb]
-            prev_bw = mat.at[pb, pw]
-            mat.at[pw, pb] = (prev_wb + " / " if prev_wb else "") + sw
-            mat.at[pb, pw] = (prev_bw + " / " if prev_bw else "") + sb
-
-    for pid in ids:
-        p = pos_map[pid]
-        mat.at[p, p] = "—"
-
-    mat = mat.sort_index().reindex(sorted(mat.columns), axis=1)
-    return mat
-
-
-def build_crosstable_pdf(ct_df: pd.DataFrame, cfg: dict, paper: str = "A4") -> bytes | None:
-    'Selector A4/A3.'
-    try:
-        has_custom = _register_fonts()
-        SERIF_B  = "OldStd-B"   if has_custom else "Times-Bold"
-
-        buf = io.BytesIO()
-        PAPER_RL = {"A4": A4, "A3": A3}
-        page_size = landscape(PAPER_RL.get(paper, A4))
-        doc = SimpleDocTemplate(
-            buf, pagesize=page_size,
-            leftMargin=14*mm, rightMargin=14*mm,
-            topMargin=12*mm, bottomMargin=12*mm
-        )
-
-        def _draw_frame(canvas, d):
-            canvas.saveState()
-            canvas.setStrokeColor(colors.black)
-            canvas.setLineWidth(1.1)
-            x = doc.leftMargin - 5*mm
-            y = doc.bottomMargin - 5*mm
-            w = doc.width + 10*mm
-            h = doc.height + 10*mm
-            canvas.rect(x, y, w, h)
-            canvas.restoreState()
-
-        styles = getSampleStyleSheet()
-        H1 = ParagraphStyle("H1", parent=styles["Normal"], fontName=SERIF_B, fontSize=18, leading=22, alignment=1, spaceAfter=2)
-        H3 = ParagraphStyle("H3", parent=styles["Normal"], fontName=SERIF_B, fontSize=16, leading=20, alignment=1, spaceBefore=2, spaceAfter=4)
-
-        titulo = (cfg.get("titulo") or "TORNEO DE AJEDREZ").strip()
-        anio   = (cfg.get("anio") or "").strip()
-        nivel  = (cfg.get("nivel") or "").strip()
-
-        band1 = Table([[Paragraph(f"{titulo} {anio}".strip(), H1)]], colWidths=[doc.width])
-        band1.setStyle(TableStyle([
-            ("BACKGROUND", (0,0), (-1,-1), colors.whitesmoke),
-            ("ALIGN", (0,0), (-1,-1), "CENTER"),
-            ("BOTTOMPADDING", (0,0), (-1,-1), 6),
-            ("TOPPADDING", (0,0), (-1,-1), 6),
-        ]))
-        band2 = Table([[Paragraph(nivel or "", H1)]], colWidths=[doc.width])
-        band2.setStyle(TableStyle([
-            ("BACKGROUND", (0,0), (-1,-1), colors.whitesmoke),
-            ("ALIGN", (0,0), (-1,-1), "CENTER"),
-            ("BOTTOMPADDING", (0,0), (-1,-1), 10),
-            ("TOPPADDING", (0,0), (-1,-1), 10),
-        ]))
-
-        n = len(ct_df.columns)
-        header = ["POS"] + [str(c) for c in ct_df.columns]
-        data = [header, [""] * len(header)]
-        for idx, row in ct_df.iterrows():
-            data.append([str(idx)] + [str(x) if x is not None else "" for x in row.tolist()])
-
-        if n > 0:
-            first_w = 16*mm
-            rest_w  = max(8*mm, min(12*mm, (doc.width - first_w) / n))
-            widths  = [first_w] + [rest_w] * n
-        else:
-            widths = [doc.width]
-
-        t = Table(data, colWidths=widths, repeatRows=2)
-        t.setStyle(TableStyle([
-            ("FONT", (0,0), (-1,0), "Times-Bold", 11.5),
-            ("BACKGROUND", (0,0), (-1,0), colors.whitesmoke),
-            ("ALIGN", (0,0), (-1,0), "CENTER"),
-            ("VALIGN", (0,0), (-1,0), "MIDDLE"),
-            ("BOTTOMPADDING", (0,0), (-1,0), 6),
-            ("TOPPADDING", (0,0), (-1,0), 6),
-            ("LINEBELOW", (0,0), (-1,0), 1.2, colors.black),
-            ("LINEBELOW", (0,1), (-1,1), 0.6, colors.black),
-            ("TOPPADDING", (0,1), (-1,1), 0),
-            ("BOTTOMPADDING", (0,1), (-1,1), 0),
-            ("FONTSIZE", (0,1), (-1,1), 1),
-            ("ROWHEIGHTS", (0,1), (-1,1), 2),
-            ("LEFTPADDING", (0,2), (-1,-1), 4),
-            ("RIGHTPADDING", (0,2), (-1,-1), 4),
-            ("ALIGN", (0,2), (0,-1), "CENTER"),
-            ("ALIGN", (1,2), (-1,-1), "CENTER"),
-            ("VALIGN", (0,2), (-1,-1), "MIDDLE"),
-            ("GRID", (0,2), (-1,-1), 0.35, colors.lightgrey),
-        ]))
-
-        titulo_lista = Table([[Paragraph("CUADRO DEL TORNEO (por posiciones)", H3)]], colWidths=[doc.width])
-        titulo_lista.setStyle(TableStyle([
-            ("ALIGN", (0,0), (-1,-1), "CENTER"),
-            ("BOTTOMPADDING", (0,0), (-1,-1), 6),
-            ("TOPPADDING", (0,0), (-1,-1), 6),
-        ]))
-
-        story = [band1, band2, titulo_lista, t]
-        doc.build(story, onFirstPage=_draw_frame, onLaterPages=_draw_frame)
-        return buf.getvalue()
-    except Exception:
-        return None
-
-
 # -----------------------------------------
 # Cálculo de standings (como tu flujo original)
 # -----------------------------------------
@@ -392,25 +65,21 @@ BYE_DEFAULT = 1.0
 JUG_PATH = os.path.join(DATA_DIR, "jugadores.csv")
 n_plan = planned_rounds(cfg, JUG_PATH)
 
-players = read_players_from_csv(JUG_PATH)
-if not players:
+round_nums = sorted(list_round_files(n_plan))
+publicadas = [i for i in round_nums if is_published(i)]
+ronda_actual = max(publicadas) if publicadas else None
+
+# Clasificación con el motor columnar (tabla de partidas + group-bys),
+# compartida por todas las sesiones mientras no cambie el estado del torneo
+df_st = shared_standings(publicadas, JUG_PATH, bye_points=BYE_DEFAULT)
+if df_st.empty:
     st.info("Aún no hay jugadores cargados.")
     st.stop()
 
-round_nums = sorted(list_round_files(n_plan))
 if not round_nums:
     st.info("Aún no hay rondas generadas.")
     st.stop()
 
-publicadas = [i for i in round_nums if is_published(i)]
-ronda_actual = max(publicadas) if publicadas else None
-
-for i in publicadas:
-    dfp = read_csv_safe(round_file(i))
-    players = apply_results(players, dfp, bye_points=BYE_DEFAULT)
-
-df_st = compute_standings(players)
-
 # -----------------------------------------
 # Chips/resumen superior
 # -----------------------------------------
@@ -446,52 +115,41 @@ show_bh = bool(st.session_state["show_bh"])
 # -----------------------------------------
 show_stats = st.toggle("📊 Mostrar estadísticas avanzadas", value=True)
 
-# Progreso (si existe helper) o cálculo local
+# Progreso: posiciones tras cada ronda publicada (historial precalculado y cacheado)
 try:
-    from lib.tournament import get_rank_progress, format_rank_progress
-    rank_progress = get_rank_progress(max_rondas=10)
-    df_st["Progreso 📈"] = df_st["id"].astype(str).apply(lambda pid: format_rank_progress(rank_progress.get(str(pid), [])))
+    hist = shared_rank_history(publicadas, JUG_PATH, bye_points=BYE_DEFAULT)
+    progreso = {str(pid): format_rank_progress([int(x) for x in row]) for pid, row in zip(hist.index, hist.to_numpy())}
+    df_st["Progreso 📈"] = df_st["id"].astype(str).map(progreso).fillna("")
 except Exception:
     pass
 
+# Estadísticas por jugador (data/player_stats.csv; se calculan solo si están desfasadas)
+pstats = shared_player_stats(publicadas, JUG_PATH, bye_points=BYE_DEFAULT, standings=df_st).set_index("id")
+
 # Stats adicionales
 if show_stats:
-    victorias, blancas, negras = {}, {}, {}
-    for r in publicadas:
-        dfp = read_csv_safe(round_file(r))
-        if dfp is None or dfp.empty:
-            continue
-        for row in dfp.itertuples():
-            b = str(getattr(row, "blancas_id", getattr(row, "blancas", "")))
-            n = str(getattr(row, "negras_id", getattr(row, "negras", "")))
-            res = str(getattr(row, "resultado", "")).strip()
-            if not b or not n or not res or "-" not in res:
-                continue
-            puntos_b, puntos_n = [p.strip() for p in res.replace("–","-").split("-")]
-            blancas[b] = blancas.get(b, 0) + 1
-            negras[n] = negras.get(n, 0) + 1
-            if puntos_b == "1":
-                victorias[b] = victorias.get(b, 0) + 1
-            elif puntos_n == "1":
-                victorias[n] = victorias.get(n, 0) + 1
-
-    df_st["Victorias 🏆"] = df_st["id"].astype(str).map(victorias).fillna(0).astype(int)
-    df_st["⚪ Blancas"]   = df_st["id"].astype(str).map(blancas).fillna(0).astype(int)
-    df_st["⚫ Negras"]    = df_st["id"].astype(str).map(negras).fillna(0).astype(int)
-    df_st["🎯 Performance"] = ((df_st["puntos"] / df_st["pj"]) * 100).round(1).fillna(0).astype(str) + "%"
+    ids_st = df_st["id"].astype(str)
+    df_st["Victorias 🏆"] = ids_st.map(pstats["victorias"]).fillna(0).astype(int)
+    df_st["🤝 Tablas"]    = ids_st.map(pstats["tablas"]).fillna(0).astype(int)
+    df_st["⚪ Blancas"]   = ids_st.map(pstats["blancas"]).fillna(0).astype(int)
+    df_st["⚫ Negras"]    = ids_st.map(pstats["negras"]).fillna(0).astype(int)
+    df_st["🎯 Performance"] = ids_st.map(pstats["performance"]).fillna(0.0).astype(float).round(1).astype(str) + "%"
+    df_st["Media rivales"] = ids_st.map(pstats["media_rivales"]).fillna(0.0).astype(float)
 
 # -----------------------------------------
 # Mostrar tabla
 # -----------------------------------------
 cols = ["pos", "nombre", "curso", "grupo", "puntos", "pj"]
 if show_bh and "buchholz" in df_st.columns:
-    cols = ["pos", "nombre", "curso", "grupo", "puntos", "buchholz", "pj"]
+    # Buchholz + resto de desempates configurados (config.json → "desempates")
+    tb_cols = [k for k in TIEBREAK_LABELS if k != "buchholz" and k in df_st.columns]
+    cols = ["pos", "nombre", "curso", "grupo", "puntos", "buchholz"] + tb_cols + ["pj"]
 
-extra_cols = [c for c in ["Progreso 📈","Victorias 🏆","⚪ Blancas","⚫ Negras","🎯 Performance"] if c in df_st.columns]
+extra_cols = [c for c in ["Progreso 📈","Victorias 🏆","🤝 Tablas","⚪ Blancas","⚫ Negras","🎯 Performance","Media rivales"] if c in df_st.columns]
 cols_final = cols + (extra_cols if show_stats else ["Progreso 📈"] if "Progreso 📈" in df_st.columns else [])
 
 st.dataframe(
-    df_st[cols_final],
+    df_st[cols_final].rename(columns={k: v for k, v in TIEBREAK_LABELS.items() if k != "buchholz"}),
     use_container_width=True, hide_index=True,
 )
 
@@ -526,20 +184,22 @@ with c_csv:
 with c_pdf:
     # Para el PDF con estadísticas, pasamos el DF con extra cols si el toggle está activo
     pdf_source_df = df_st[cols_final].copy() if show_stats else df_st[cols].copy()
-    pdf_bytes = build_standings_pdf(
-        pdf_source_df,
-        cfg, ronda_actual, show_bh=show_bh, include_stats=show_stats, paper=st.session_state["cls_pdf_paper"]
+    cls_paper = st.session_state["cls_pdf_paper"]
+    job_cls = request_export(
+        "clasificacion", pdf_source_df, cfg,
+        lambda: build_standings_pdf(
+            pdf_source_df,
+            cfg, ronda_actual, show_bh=show_bh, include_stats=show_stats, paper=cls_paper
+        ),
+        paper=cls_paper,
+        extra={"ronda": ronda_actual, "bh": bool(show_bh), "stats": bool(show_stats)},
+    )
+    export_download(
+        job_cls, "📄 Descargar clasificación (PDF)",
+        f"clasificacion_{slugify(cfg.get('nivel',''))}_{slugify(cfg.get('anio',''))}_{st.session_state['cls_pdf_paper']}.pdf",
+        waiting="⏳ Generando PDF de la clasificación…",
+        missing="📄 PDF no disponible (instala reportlab).",
     )
-    if isinstance(pdf_bytes, (bytes, bytearray)) and len(pdf_bytes) > 0:
-        st.download_button(
-            "📄 Descargar clasificación (PDF)",
-            data=pdf_bytes,
-            file_name=f"clasificacion_{slugify(cfg.get('nivel',''))}_{slugify(cfg.get('anio',''))}_{st.session_state['cls_pdf_paper']}.pdf",
-            mime="application/pdf",
-            use_container_width=True,
-        )
-    else:
-        st.caption("📄 PDF no disponible (instala reportlab).")
 
 st.divider()
 
@@ -557,11 +217,40 @@ def build_crosstable_full_section(df_st, publicadas, cfg):
         st.session_state["show_ct"] = not st.session_state["show_ct"]
 
     if st.session_state["show_ct"]:
-        with st.expander("Cuadro del torneo (doble entrada por posiciones)", expanded=True):
+        with st.expander("Cuadro del torneo (por posiciones)", expanded=True):
             try:
-                ct_df = build_crosstable_df_positions(df_st, publicadas)
-                col_config_ct = {c: st.column_config.TextColumn(str(c), width=30) for c in ct_df.columns}
-                st.dataframe(ct_df, use_container_width=False, column_config=col_config_ct)
+                # Vista: doble entrada (N×N) o rivales por ronda (N×R) para torneos grandes
+                big = len(df_st) > crosstable_dense_max(cfg)
+                vistas = ["Doble entrada", "Rivales por ronda"]
+                vista = st.radio(
+                    "Vista del cuadro", vistas, horizontal=True,
+                    index=1 if big else 0, key=f"ct_view_{int(big)}",
+                )
+                if vista == vistas[1]:
+                    ct_df = shared_crosstable(df_st, publicadas, sparse=True, players_path=JUG_PATH, bye_points=BYE_DEFAULT)
+                    col_config_ct = {"Jugador": st.column_config.TextColumn("Jugador", width="medium")}
+                    col_config_ct.update({c: st.column_config.TextColumn(str(c), width=60) for c in ct_df.columns if c != "Jugador"})
+                    st.caption("Cada celda: posición del rival + color (b = blancas, n = negras) + resultado. Ej.: 12b1.")
+                else:
+                    if big:
+                        st.caption(f"⚠️ {len(df_st)} jugadores: la vista de doble entrada es muy grande; mejor «Rivales por ronda».")
+                    ct_df = shared_crosstable(df_st, publicadas, players_path=JUG_PATH, bye_points=BYE_DEFAULT)
+                    col_config_ct = {c: st.column_config.TextColumn(str(c), width=30) for c in ct_df.columns}
+
+                # Paginación: solo se envía al navegador la página visible
+                pc1, pc2 = st.columns([1, 1])
+                with pc1:
+                    page_size = st.selectbox("Filas por página", [25, 50, 100, 200], index=1, key="ct_page_size")
+                n_pages = max(1, -(-len(ct_df) // int(page_size)))
+                st.session_state.setdefault("ct_page", 1)
+                if int(st.session_state["ct_page"]) > n_pages:
+                    st.session_state["ct_page"] = n_pages
+                with pc2:
+                    page = st.number_input("Página", min_value=1, max_value=n_pages, step=1, key="ct_page")
+                page = min(int(page), n_pages)
+                a, b = (page - 1) * int(page_size), min(len(ct_df), page * int(page_size))
+                st.dataframe(ct_df.iloc[a:b], use_container_width=False, column_config=col_config_ct)
+                st.caption(f"Posiciones {a + 1}–{b} de {len(ct_df)} · página {page}/{n_pages}")
 
                 # Selector de papel con radio (un click)
                 ct_choice = st.radio(
@@ -590,18 +279,16 @@ def build_crosstable_full_section(df_st, publicadas, cfg):
 
                 with c2:
                     paper = st.session_state["ct_pdf_paper"]
-                    pdf_ct = build_crosstable_pdf(ct_df, cfg, paper=paper)
-                    if isinstance(pdf_ct, (bytes, bytearray)) and len(pdf_ct) > 0:
-                        st.download_button(
-                            "📄 Descargar cuadro (PDF)",
-                            data=pdf_ct,
-                            file_name=f"cuadro_{slugify(cfg.get('nivel',''))}_{slugify(cfg.get('anio',''))}_{paper}.pdf",
-                            mime="application/pdf",
-                            use_container_width=True,
-                            key="dl_ct_pdf",
-                        )
-                    else:
-                        st.caption("📄 PDF del cuadro no disponible (instala reportlab).")
+                    job_ct = request_export(
+                        "cuadro", ct_df, cfg, lambda: build_crosstable_pdf(ct_df, cfg, paper=paper), paper=paper,
+                    )
+                    export_download(
+                        job_ct, "📄 Descargar cuadro (PDF)",
+                        f"cuadro_{slugify(cfg.get('nivel',''))}_{slugify(cfg.get('anio',''))}_{paper}.pdf",
+                        waiting="⏳ Generando PDF del cuadro…",
+                        missing="📄 PDF del cuadro no disponible (instala reportlab).",
+                        key="dl_ct_pdf",
+                    )
             except Exception as e:
                 st.error(f"No se pudo construir el cuadro: {e}")
 
@@ -622,18 +309,14 @@ if st.session_state.get("show_bh", True):
         sel_label = st.selectbox("Jugador", list(_opts.keys()), index=0, key="bh_player_select")
 
         if st.button("📈  Ver desglose de Buchholz", use_container_width=True, key="btn_bh_breakdown"):
-            pid = _opts.get(sel_label)
-            if pid and pid in players:
-                pts_map = {p: float(info.get("points", 0.0)) for p, info in players.items()}
-                opos = players[pid].get("opponents", []) or []
-                rows = []
-                total = 0.0
-                for oid in opos:
-                    info_o = players.get(oid, {})
-                    nombre_o = info_o.get("nombre", oid)
-                    p = float(pts_map.get(oid, 0.0))
-                    total += p
-                    rows.append({"Rival": nombre_o, "Puntos actuales": p})
+            pid = str(_opts.get(sel_label) or "")
+            # Rivales ya materializados en player_stats; puntos actuales de la clasificación
+            if pid and pid in pstats.index:
+                pts_map = dict(zip(df_st["id"].astype(str), df_st["puntos"].astype(float)))
+                name_map = dict(zip(df_st["id"].astype(str), df_st["nombre"].astype(str)))
+                opos = [o for o in str(pstats.at[pid, "rivales"] or "").split(";") if o]
+                rows = [{"Rival": name_map.get(oid, oid), "Puntos actuales": float(pts_map.get(oid, 0.0))} for oid in opos]
+                total = sum(r["Puntos actuales"] for r in rows)
                 df_bh = pd.DataFrame(rows)
                 if df_bh.empty:
                     st.info("Este jugador todavía no tiene rivales para calcular Buchholz.")
@@ -8,20 +8,25 @@ import streamlit as st
 from zoneinfo import ZoneInfo
 from lib.ui import sidebar_title_and_nav, page_header
 
-from lib.ui2 import is_pub, set_pub, results_empty_count, round_status, status_label, get_states
+from lib.ui2 import is_pub, set_pub, results_empty_count, status_label, get_states
 from lib.tournament import (
     DATA_DIR,
-    load_config, load_meta, save_meta,
+    load_config, load_meta, save_meta, clear_meta_cache,
     read_csv_safe, last_modified,
-    read_players_from_csv, apply_results, compute_standings,
-    swiss_pair_round, formatted_name_from_parts,
-    is_published, set_published, r1_seed, add_log,
+    read_round, save_round, delete_round, storage_import_csv, storage_export_csv,
+    read_players_from_csv,
+    players_state_after, standings_from_rounds, pair_round, formatted_name_from_parts,
+    is_published, set_published, r1_seed, add_log, bump_state_version, clear_snapshots,
     planned_rounds, format_with_cfg,  # ya estaban
     set_round_date, get_round_date, format_date_es,
-    config_path, config_debug,        # <- añadidos
+    config_path, config_debug, clear_config_cache,  # <- añadidos
 )
 
 from lib.ui import page_header
+from lib.data_watcher import ensure_data_watcher, watcher_status
+from lib.export_cache import clear_export_cache, export_cache_stats
+from lib.export_jobs import EN_CURSO, PENDIENTE, export_jobs_status
+from lib.shared_cache import clear_shared_cache, shared_cache_stats
 
 import datetime as _dt
 
@@ -50,13 +55,10 @@ def _log_msg(msg: str) -> str:
     except Exception:
         return str(msg)
 
-# Normaliza la serie de resultados para que None/nan/espacios queden como vacío ""
-def _normalize_result_series(s):
-    return (
-        s.astype(str)
-         .str.strip()
-         .replace({"None": "", "none": "", "NaN": "", "nan": "", "N/A": "", "n/a": ""})
-    )
+# Resultados: códec compartido (vacíos, variantes ½-½ / 0,5-0,5 / guiones largos...)
+from lib.results import RESULT_CODES, canonical_results, clean_results
+from lib.player_search import player_search
+from lib.player_stats import save_player_stats
 
 
 # Lista de rondas publicadas existentes (según flags/meta)
@@ -66,29 +68,25 @@ def published_rounds_list() -> list[int]:
         n = get_n_rounds()
     except Exception:
         n = 0
-
-    # Leer meta una sola vez (si está)
+    # Una sola pasada (meta + flags + CSV/BD) con la tabla de estados compartida
     try:
-        meta = load_meta() or {}
-        rounds_meta = meta.get("rounds", {}) if isinstance(meta, dict) else {}
+        return [s["i"] for s in get_states(n) if s["published"]]
     except Exception:
-        rounds_meta = {}
-
-    res = []
-    for i in range(1, n + 1):
-        try:
-            # debe existir el CSV
-            if not os.path.exists(round_file(i)):
-                continue
+        return []
 
-            pub_meta = bool(rounds_meta.get(str(i), {}).get("published", False))
-            pub_flag = os.path.exists(os.path.join(DATA_DIR, f"published_R{i}.flag"))
 
-            if pub_meta or pub_flag:
-                res.append(i)
-        except Exception:
-            pass
-    return res
+def _recalc_standings_and_stats(pubs: list[int], bye_points: float = 1.0) -> str:
+    """Recalcula la clasificación con las rondas `pubs`, la guarda en data/standings.csv
+    junto con data/player_stats.csv y devuelve la ruta del CSV de clasificación."""
+    jug_path = os.path.join(DATA_DIR, "jugadores.csv")
+    standings = standings_from_rounds(pubs, jug_path, bye_points=bye_points)
+    out_csv = os.path.join(DATA_DIR, "standings.csv")
+    try:
+        standings.to_csv(out_csv, index=False, encoding="utf-8-sig")
+    except Exception:
+        standings.to_csv(out_csv, index=False)
+    save_player_stats(pubs, jug_path, bye_points=bye_points, standings=standings)
+    return out_csv
 
 
 # Salvaguarda: si por orden de carga no existiera is_pub, define un fallback mínimo
@@ -192,6 +190,11 @@ def _manifest(make: bool, label: str = "", note: str = "", extra: dict | None =
     return m
 
 def _collect_paths_for_backup(n_rounds: int | None = None) -> list[str]:
+    # Backend SQLite: refrescar los CSV desde la BD antes de empaquetar
+    try:
+        storage_export_csv()
+    except Exception:
+        pass
     # Ficheros clave a incluir; rounds dinámicas
     paths = [
         os.path.join(BASE_DIR, "config.json"),
@@ -403,13 +406,19 @@ def _restore_zip(
             except Exception:
                 pass
 
+        # 3b) Backend SQLite: volcar los CSV restaurados a la BD
+        try:
+            storage_import_csv()
+        except Exception:
+            pass
+
         # 4) Recalcular 'closed' para que cuadre con (published + sin vacíos)
         if recalc_closed:
             cambios = 0
             for i in existing_pairings:
                 pub = bool(rounds_meta.get(str(i), {}).get("published", False))
                 try:
-                    dfp = read_csv_safe(round_file(i))
+                    dfp = read_round(i)
                     vacios = results_empty_count(dfp) if dfp is not None else None
                 except Exception:
                     vacios = None
@@ -434,6 +443,12 @@ def _restore_zip(
             shutil.rmtree(tmpdir, ignore_errors=True)
         except Exception:
             pass
+        # los ficheros ya se han sustituido (total o parcialmente): todo el estado es nuevo,
+        # así que se descartan los snapshots de rondas y se sube la versión
+        clear_config_cache()
+        clear_meta_cache()
+        clear_snapshots()
+        bump_state_version(all_rounds=True)
 
 
 def _make_backup_local(label: str = "", note: str = "") -> str:
@@ -496,6 +511,7 @@ with st.sidebar:
 
 # Guardia: si NO eres profe, te manda a Inicio y corta la ejecución
 require_teacher(redirect_to="app.py")
+ensure_data_watcher(load_config())  # vigilante de data/ (si config lo activa)
 
 st.session_state.setdefault("_meta_autofixed", False)
 
@@ -590,7 +606,8 @@ def set_pub_safe(i: int, val: bool, seed=None):
     try:
         fp = _pub_flag_path(i)
         if val:
-            open(fp, "w").close()
+            if not os.path.exists(fp):
+                open(fp, "w").close()
         else:
             if os.path.exists(fp):
                 os.remove(fp)
@@ -712,6 +729,59 @@ def _show_config():
     except Exception:
         st.write(cfg)
 
+    # Problemas detectados al validar config.json (se calculan una vez por versión del fichero)
+    dbg = config_debug()
+    st.caption(f"Fichero: `{dbg.get('path') or '—'}`")
+    if dbg.get("error"):
+        st.error(f"config.json no se pudo leer: {dbg['error']}")
+    issues = dbg.get("issues") or []
+    if issues:
+        with st.expander(f"⚠️ {len(issues)} aviso(s) de configuración", expanded=True):
+            for it in issues:
+                st.markdown(f"- {it}")
+
+    # Vigilante de data/ (config "data_watcher")
+    ws = watcher_status()
+    if ws["activo"]:
+        with st.expander(f"👀 Vigilante de data/ activo (cada {ws['segundos']:g} s)", expanded=False):
+            if ws["eventos"]:
+                st.dataframe(pd.DataFrame(ws["eventos"]), use_container_width=True, hide_index=True)
+            else:
+                st.caption("Sin cambios externos detectados.")
+
+    # Caché de PDFs exportados (data/cache/exports)
+    cs = export_cache_stats()
+    with st.expander(f"🗂️ Caché de exportaciones: {cs['files']} fichero(s), {cs['bytes'] / 1024:.0f} KB", expanded=False):
+        st.caption(f"Carpeta: `{cs['dir']}`")
+        if st.button("🧹 Vaciar caché de exportaciones", key="btn_clear_export_cache", disabled=not cs["files"]):
+            st.toast(f"🧹 {clear_export_cache()} fichero(s) borrados")
+            st.rerun()
+
+    # Trabajos de exportación en segundo plano (lib/export_jobs.py)
+    jobs = export_jobs_status()
+    if jobs:
+        en_marcha = sum(1 for j in jobs if j["estado"] in (PENDIENTE, EN_CURSO))
+        with st.expander(f"⚙️ Exportaciones en segundo plano: {len(jobs)} trabajo(s), {en_marcha} en marcha", expanded=False):
+            st.dataframe(pd.DataFrame(jobs), use_container_width=True, hide_index=True)
+
+    # Caché compartida entre sesiones (clasificación, estadísticas, cuadro, partidas)
+    sc = shared_cache_stats()
+    items = sc.pop("items", {})
+    with st.expander(f"🧠 Caché compartida: {len(items)} artefacto(s) en memoria", expanded=False):
+        st.dataframe(pd.DataFrame([{
+            "aciertos": sc.get("hits", 0), "cálculos": sc.get("misses", 0),
+            "esperas": sc.get("waits", 0), "versiones anteriores": sc.get("stale", 0),
+        }]), use_container_width=True, hide_index=True)
+        if items:
+            st.dataframe(
+                pd.DataFrame([{"artefacto": n, "calculado": _fmt_es_from_ts(at)} for n, at in sorted(items.items())]),
+                use_container_width=True, hide_index=True,
+            )
+        if st.button("🧹 Vaciar caché compartida", key="btn_clear_shared_cache", disabled=not items):
+            clear_shared_cache()
+            st.toast("🧹 Caché compartida vaciada: se recalculará en la próxima visita")
+            st.rerun()
+
     # Resumen práctico
     df_j = read_csv_safe(JUG_PATH)
     activos = 0
@@ -764,6 +834,7 @@ def _show_jugadores():
     if jug_up is not None:
         with open(JUG_PATH, "wb") as f:
             f.write(jug_up.read())
+        bump_state_version(players=True)
         st.success("`data/jugadores.csv` actualizado.")
         dfprev = read_csv_safe(JUG_PATH)
         if dfprev is not None and not dfprev.empty:
@@ -781,7 +852,6 @@ def _show_resumen():
     # Asegurar estados locales
     states = get_states(get_n_rounds())
     st.markdown("### 📋 Estado de rondas")
-    states = [round_status(i) for i in range(1, get_n_rounds() + 1)]
     diag = pd.DataFrame([
         {"Ronda": s["i"],
          "Estado": status_label(s),
@@ -794,8 +864,8 @@ def _show_resumen():
     ])
     st.dataframe(diag, use_container_width=True, hide_index=True)
 
-    existing_rounds = [i for i in range(1, get_n_rounds() + 1) if os.path.exists(round_file(i))]
-    published_cnt = len([i for i in existing_rounds if is_pub(i)])
+    existing_rounds = [s["i"] for s in states if s["exists"]]
+    published_cnt = len([s["i"] for s in states if s["published"]])
     closed_rounds = [s["i"] for s in states if s["closed"]]
 
     st.info(f"📣 Publicadas: **{published_cnt} / {get_n_rounds()}**  ·  🗂️ Generadas: **{len(existing_rounds)}**  ·  🧭 Plan: **{get_n_rounds()}**")
@@ -827,8 +897,9 @@ def _show_semilla():
 
     with col_b:
         # Condiciones para permitir regenerar
-        r1_published = is_pub(1)
-        later_exist = any(os.path.exists(round_file(i)) for i in range(2, get_n_rounds() + 1))
+        states = get_states(get_n_rounds())
+        r1_published = bool(states and states[0]["published"])
+        later_exist = any(s["exists"] for s in states[1:])
         can_regen = (not r1_published) and (not later_exist)
 
         if st.button("🔁 Regenerar R1 con esta semilla", use_container_width=True, disabled=not can_regen):
@@ -846,9 +917,8 @@ def _show_semilla():
                     st.error("No se pudo leer `data/jugadores.csv`.")
                 else:
                     # Emparejar R1 de cero con la semilla indicada
-                    df_pairs = swiss_pair_round(players, 1, forced_bye_id=None)
-                    outp = round_file(1)
-                    df_pairs.astype(str).to_csv(outp, index=False, encoding="utf-8")
+                    df_pairs = pair_round(players, 1, forced_bye_id=None)
+                    save_round(1, df_pairs)
 
                     # Guardar semilla en meta
                     meta = load_meta()
@@ -868,6 +938,25 @@ def _show_semilla():
     st.divider()
 
 
+# =========================
+# Selector de jugador (búsqueda sin tildes / con erratas)
+# =========================
+def _player_picker(label: str, key: str, active_only: bool = True, k: int = 15) -> str | None:
+    """Caja de búsqueda + selectbox con las mejores coincidencias. Devuelve el id o None."""
+    q = st.text_input(f"{label} — buscar", value="", key=f"{key}_q", placeholder="Nombre o apellidos (o id)")
+    if not q.strip():
+        return None
+    matches = player_search(get_jug_path()).search(q, k=k, active_only=active_only)
+    if matches.empty:
+        st.caption("Sin coincidencias.")
+        return None
+    opciones = ["—"] + matches["etiqueta"].tolist()
+    sel = st.selectbox(label, opciones, index=1 if len(opciones) == 2 else 0, key=f"{key}_sel")
+    if not sel or sel == "—":
+        return None
+    return matches["id"].iloc[opciones.index(sel) - 1]
+
+
 # =========================
 # Generar ronda siguiente (Suizo)
 # =========================
@@ -932,6 +1021,12 @@ def _show_generar():
 
         st.write(f"Siguiente ronda candidata: **Ronda {next_round}**")
 
+        # Bye forzado (solo se aplica si el número de jugadores es impar)
+        with st.expander("🛌 Bye forzado (opcional)", expanded=False):
+            forced_bye_id = _player_picker("Jugador que descansa", key=f"forced_bye_R{next_round}")
+            if forced_bye_id:
+                st.caption(f"Se intentará dar el bye a **{forced_bye_id}** si hay un número impar de jugadores.")
+
         if allow_generate:
             if is_pub(next_round):
                 st.warning(f"La **Ronda {next_round}** ya está **PUBLICADA**. Despublícala para rehacerla.")
@@ -943,18 +1038,15 @@ def _show_generar():
                         random.seed(seed_used)
 
                     # Construir estado previo de jugadores aplicando R1..R(next_round-1) publicadas
-                    players = read_players_from_csv(JUG_PATH)
+                    # (reutiliza el snapshot de la ronda anterior si no ha cambiado)
+                    players = players_state_after(list(range(1, next_round)), JUG_PATH, bye_points=1.0)
                     if not players:
                         st.error("No se pudo leer `data/jugadores.csv`.")
                     else:
-                        for rno in range(1, next_round):
-                            dfp = read_csv_safe(round_file(rno))
-                            players = apply_results(players, dfp, bye_points=1.0)
-
                         # Emparejar
-                        df_pairs = swiss_pair_round(players, next_round, forced_bye_id=None)
+                        df_pairs = pair_round(players, next_round, forced_bye_id=forced_bye_id)
                         outp = round_file(next_round)
-                        df_pairs.astype(str).to_csv(outp, index=False, encoding="utf-8")
+                        save_round(next_round, df_pairs)
                         # Guardar fecha de celebración en meta.json
                         try:
                             set_round_date(next_round, fecha_ronda.isoformat())
@@ -968,7 +1060,9 @@ def _show_generar():
                             meta.setdefault("rounds", {}).setdefault("1", {})["seed"] = seed_used
                             _save_meta_preserving_dates(meta)
 
-                        add_log("generate_round", next_round, actor, _log_msg(f"pairings guardado en {outp}"))
+                        add_log("generate_round", next_round, actor, _log_msg(
+                            f"pairings guardado en {outp}" + (f" (bye forzado: {forced_bye_id})" if forced_bye_id else "")
+                        ))
 
                         # Reset del “solo esta vez”
                         try:
@@ -992,10 +1086,9 @@ def _show_publicar():
     # Estados locales
     n = get_n_rounds()
     states = get_states(n)
-    existing_rounds = [i for i in range(1, n + 1) if os.path.exists(round_file(i))]
 
-    unpublished = [i for i in existing_rounds if not is_pub(i)]
-    published   = [i for i in existing_rounds if is_pub(i)]
+    unpublished = [s["i"] for s in states if s["exists"] and not s["published"]]
+    published   = [s["i"] for s in states if s["exists"] and s["published"]]
 
     # Tabla de estado rápida
     if states:
@@ -1019,20 +1112,9 @@ def _show_publicar():
             try:
                 with st.spinner("Publicando y recalculando clasificación..."):
                     set_pub_safe(sel, True)
-                    # Recalcular clasificación tras publicar
-                    from lib.tournament import read_players_from_csv, read_csv_safe, apply_results, compute_standings
-                    players = read_players_from_csv(os.path.join(DATA_DIR, "jugadores.csv"))
-                    pubs = [i for i in existing_rounds if is_pub(i)]
-                    for r in pubs:
-                        dfp = read_csv_safe(round_file(r))
-                        if dfp is not None:
-                            players = apply_results(players, dfp, bye_points=1.0)
-                    standings = compute_standings(players)
-                    out_csv = os.path.join(DATA_DIR, "standings.csv")
-                    try:
-                        standings.to_csv(out_csv, index=False, encoding="utf-8-sig")
-                    except Exception:
-                        standings.to_csv(out_csv, index=False)
+                    # Recalcular clasificación tras publicar (estados leídos antes + la recién publicada)
+                    pubs = sorted(set(published) | {sel})
+                    _recalc_standings_and_stats(pubs)
                 st.toast(f"✅ Publicada Ronda {sel}")
                 st.rerun()
             except Exception as e:
@@ -1050,19 +1132,8 @@ def _show_publicar():
                 with st.spinner("Despublicando y recalculando clasificación..."):
                     set_pub_safe(ultima_pub, False)
                     # Tras despublicar, recalcular clasificación con las restantes publicadas
-                    from lib.tournament import read_players_from_csv, read_csv_safe, apply_results, compute_standings
-                    players = read_players_from_csv(os.path.join(DATA_DIR, "jugadores.csv"))
-                    pubs = [i for i in existing_rounds if is_pub(i)]
-                    for r in pubs:
-                        dfp = read_csv_safe(round_file(r))
-                        if dfp is not None:
-                            players = apply_results(players, dfp, bye_points=1.0)
-                    standings = compute_standings(players)
-                    out_csv = os.path.join(DATA_DIR, "standings.csv")
-                    try:
-                        standings.to_csv(out_csv, index=False, encoding="utf-8-sig")
-                    except Exception:
-                        standings.to_csv(out_csv, index=False)
+                    pubs = [i for i in published if i != ultima_pub]
+                    _recalc_standings_and_stats(pubs)
                 st.toast(f"↩️ Despublicada Ronda {ultima_pub}")
                 st.rerun()
             except Exception as e:
@@ -1086,17 +1157,16 @@ def _resumen_fechas_panel():
         st.info("No hay rondas generadas todavía.")
         return
 
-    existing_rounds = [i for i in range(1, n + 1) if os.path.exists(round_file(i))]
+    # Estado de todas las rondas en un solo escaneo
+    states = {s["i"]: s for s in get_states(n)}
+    existing_rounds = [i for i, s in states.items() if s["exists"]]
     if not existing_rounds:
         st.info("No hay rondas generadas todavía.")
         return
 
     # Helpers
     def _is_pub_safe(i: int) -> bool:
-        try:
-            return is_pub(i)
-        except Exception:
-            return False
+        return bool(states.get(i, {}).get("published", False))
 
     def _get_date_safe(i: int) -> str:
         try:
@@ -1204,17 +1274,16 @@ def _show_fechas():
         st.info("No hay rondas generadas todavía.")
         return
 
-    existing_rounds = [i for i in range(1, n + 1) if os.path.exists(round_file(i))]
+    # Estado de todas las rondas en un solo escaneo
+    states = {s["i"]: s for s in get_states(n)}
+    existing_rounds = [i for i, s in states.items() if s["exists"]]
     if not existing_rounds:
         st.info("No hay rondas generadas todavía.")
         return
 
     # Helpers seguros
     def _is_pub_safe(i: int) -> bool:
-        try:
-            return is_pub(i)
-        except Exception:
-            return False
+        return bool(states.get(i, {}).get("published", False))
 
     def _get_date_safe(i: int) -> str:
         try:
@@ -1357,7 +1426,6 @@ def _show_fechas():
 # Resultados y clasificación (solo PUBLICADAS)
 # =========================
 def _show_resultados():
-    import os
     st.markdown("### ✏️ Resultados y clasificación (solo PUBLICADAS)")
 
     # Contexto local necesario para evitar NameError
@@ -1375,7 +1443,7 @@ def _show_resultados():
     pubs = published_rounds_list()
     if pubs:
         sel_r = st.selectbox("Ronda publicada a editar", pubs, index=len(pubs) - 1, key="res_round")
-        dfp = read_csv_safe(round_file(sel_r))
+        dfp = read_round(sel_r)
         if dfp is not None:
             st.caption("Valores permitidos: 1-0, 0-1, 1/2-1/2, +/- , -/+, BYE1.0, BYE0.5, BYE")
 
@@ -1383,6 +1451,8 @@ def _show_resultados():
             buf_key = f"res_buf_R{sel_r}"
             if buf_key not in st.session_state:
                 base_df = dfp.copy()
+                if "resultado" in base_df.columns:
+                    base_df["resultado"] = canonical_results(base_df["resultado"])
                 if "seleccionar" not in base_df.columns:
                     base_df["seleccionar"] = False
                 st.session_state[buf_key] = base_df
@@ -1402,7 +1472,7 @@ def _show_resultados():
                     "seleccionar": st.column_config.CheckboxColumn("seleccionar", help="Marca filas para acciones masivas"),
                     "resultado": st.column_config.SelectboxColumn(
                         "resultado",
-                        options=["", "1-0", "0-1", "1/2-1/2", "+/-", "-/+", "BYE1.0", "BYE0.5", "BYE"],
+                        options=[c for c in RESULT_CODES if c != "?"],
                         required=False
                     )
                 },
@@ -1444,8 +1514,7 @@ def _show_resultados():
             def _is_empty_res(df: pd.DataFrame) -> pd.Series:
                 if "resultado" not in df.columns:
                     return pd.Series([True] * len(df), index=df.index)
-                res = _normalize_result_series(df["resultado"])
-                return res == ""
+                return clean_results(df["resultado"]) == ""
 
             # Botones de acciones masivas
             a1, a2, a3, a4, a5 = st.columns(5)
@@ -1511,7 +1580,6 @@ def _show_resultados():
 
             # Guardar resultados (normalizados) y recalcular
             if st.button("💾 Guardar resultados de la ronda", use_container_width=True):
-                outp = round_file(sel_r)
                 df_to_save = st.session_state[buf_key].copy()
 
                 # No guardar columna interna
@@ -1521,12 +1589,12 @@ def _show_resultados():
                 # Normalizar columna resultado
                 if "resultado" not in df_to_save.columns:
                     df_to_save["resultado"] = ""
-                df_to_save["resultado"] = _normalize_result_series(df_to_save["resultado"])
+                df_to_save["resultado"] = canonical_results(df_to_save["resultado"])
 
                 try:
                     with st.spinner("Guardando resultados y recalculando clasificación..."):
-                        # Guardar CSV
-                        df_to_save.to_csv(outp, index=False, encoding="utf-8")
+                        # Guardar ronda (CSV o BD)
+                        save_round(sel_r, df_to_save)
 
                         # Log (no debe romper)
                         try:
@@ -1535,21 +1603,11 @@ def _show_resultados():
                             pass
 
                         # Recalcular standings (mismo patrón que en 📣 Publicar)
-                        players = read_players_from_csv(os.path.join(DATA_DIR, "jugadores.csv"))
                         pubs = published_rounds_list()
-                        for r in pubs:
-                            dfp_pub = read_csv_safe(round_file(r))
-                            if dfp_pub is not None:
-                                players = apply_results(players, dfp_pub, bye_points=1.0)
-                        standings = compute_standings(players)
-                        out_csv = os.path.join(DATA_DIR, "standings.csv")
-                        try:
-                            standings.to_csv(out_csv, index=False, encoding="utf-8-sig")
-                        except Exception:
-                            standings.to_csv(out_csv, index=False)
+                        out_csv = _recalc_standings_and_stats(pubs)
 
                     # Reset de selección en el buffer tras guardar
-                    df_after = read_csv_safe(outp)
+                    df_after = read_round(sel_r)
                     if df_after is None:
                         df_after = df_to_save.copy()
                     df_after["seleccionar"] = False
@@ -1584,64 +1642,9 @@ def _show_eliminar():
         def _log_msg(x):
             return str(x)
 
-    # Fallback local si no existe `recalc_and_save_standings`
-    try:
-        _ = recalc_and_save_standings  # noqa: F401
-    except NameError:
-        def recalc_and_save_standings(bye_points: float = 1.0):
-            """Recalcula standings con las rondas PUBLICADAS y guarda en data/standings.csv.
-            Devuelve (ok: bool, path_csv: str | None).
-            """
-            try:
-                import os
-                from lib.tournament import (
-                    DATA_DIR, round_file, read_csv_safe,
-                    read_players_from_csv, apply_results, compute_standings,
-                )
-                from lib.ui2 import is_pub
-            except Exception:
-                pass
-
-            try:
-                players = read_players_from_csv(os.path.join(DATA_DIR, "jugadores.csv"))
-            except Exception:
-                return (False, None)
-
-            try:
-                n = get_n_rounds()
-            except Exception:
-                n = 0
-
-            pubs = []
-            for i in range(1, n + 1):
-                try:
-                    if os.path.exists(round_file(i)) and is_pub(i):
-                        pubs.append(i)
-                except Exception:
-                    continue
-
-            for r in pubs:
-                try:
-                    dfp = read_csv_safe(round_file(r))
-                    if dfp is not None and not getattr(dfp, "empty", True):
-                        players = apply_results(players, dfp, bye_points=bye_points)
-                except Exception:
-                    pass
-
-            try:
-                standings = compute_standings(players)
-                out_csv = os.path.join(DATA_DIR, "standings.csv")
-                try:
-                    standings.to_csv(out_csv, index=False, encoding="utf-8-sig")
-                except Exception:
-                    standings.to_csv(out_csv, index=False)
-                return (True, out_csv)
-            except Exception:
-                return (False, None)
-
     # Asegurar lista de rondas existentes (solo las que tienen CSV en data/)
     n = get_n_rounds()
-    existing_rounds = [i for i in range(1, n + 1) if os.path.exists(round_file(i))]
+    existing_rounds = [s["i"] for s in get_states(n) if s["exists"]]
 
     if not existing_rounds:
         st.info("No hay rondas para eliminar.")
@@ -1659,9 +1662,8 @@ def _show_eliminar():
             path = round_file(last_exist)
             try:
                 with st.spinner("Eliminando ronda y recalculando clasificación..."):
-                    # Borrar CSV de la ronda
-                    if os.path.exists(path):
-                        os.remove(path)
+                    # Borrar CSV de la ronda (o sus filas en la BD)
+                    delete_round(last_exist)
 
                     # Limpiar meta (si existe)
                     try:
@@ -1678,8 +1680,11 @@ def _show_eliminar():
                     except Exception:
                         pass
 
-                    # Recalcular clasificación
-                    ok, path2 = recalc_and_save_standings(bye_points=1.0)
+                    # Recalcular clasificación y estadísticas con las publicadas que quedan
+                    try:
+                        path2, ok = _recalc_standings_and_stats(published_rounds_list()), True
+                    except Exception:
+                        path2, ok = None, False
 
                 if ok:
                     st.success(f"Ronda R{last_exist} eliminada. Clasificación recalculada en `{path2}`.")
@@ -1867,7 +1872,8 @@ def _show_archivos():
                 except Exception:
                     n_max = 0
 
-                existing = [i for i in range(1, n_max + 1) if os.path.exists(round_file(i))]
+                states = {s["i"]: s for s in get_states(n_max)}
+                existing = [i for i, s in states.items() if s["exists"]]
                 for i in existing:
                     v = rounds_meta.get(str(i), {})
 
@@ -1876,17 +1882,9 @@ def _show_archivos():
                     date_meta   = v.get("date") or ""
                     closed_meta = bool(v.get("closed", False))
 
-                    # Estado real
-                    try:
-                        pub_real = is_pub(i)
-                    except Exception:
-                        pub_real = False
-                    try:
-                        dfp = read_csv_safe(round_file(i))
-                        vac  = results_empty_count(dfp) if dfp is not None else None
-                    except Exception:
-                        vac  = None
-                    closed_real = bool(pub_real and (vac == 0))
+                    # Estado real (tabla de estados: publicada = meta o flag; vacíos memoizados)
+                    pub_real = bool(states[i]["published"])
+                    closed_real = bool(states[i]["closed"])
 
                     # Fecha "real": lo más fideligno que tenemos es get_round_date (guarda en meta)
                     try:
@@ -2207,6 +2205,41 @@ def _show_backups():
 
     st.divider()
 
+    # --- Dossier del torneo (todas las exportaciones en un ZIP) ---
+    st.subheader("📦 Dossier del torneo")
+    st.caption("Rondas publicadas (con y sin resultados), clasificación, cuadro y fichas por jugador, en un solo ZIP.")
+    dcol1, dcol2 = st.columns([1, 2])
+    with dcol1:
+        dossier_paper = st.radio("Papel (clasificación y cuadro)", ["A4", "A3"], horizontal=True, key="dossier_paper")
+    with dcol2:
+        if st.button("📦 Generar dossier", use_container_width=True, key="btn_dossier"):
+            pubs = published_rounds_list()
+            if not pubs:
+                st.warning("No hay rondas publicadas.")
+            else:
+                from lib.exports import build_dossier_zip, slugify
+                bar = st.progress(0.0, text="Preparando…")
+
+                def _on_progress(done: int, total: int, name: str):
+                    bar.progress(done / max(1, total), text=f"{done}/{total} · {name}")
+
+                try:
+                    cfg = get_cfg()
+                    data = build_dossier_zip(pubs, cfg, paper=dossier_paper, players_path=get_jug_path(),
+                                             progress=_on_progress)
+                    st.session_state["dossier_zip"] = (
+                        f"dossier_{slugify(cfg.get('nivel', ''))}_{slugify(cfg.get('anio', ''))}_{_now_tag()}.zip", data
+                    )
+                    bar.progress(1.0, text="Dossier listo ✅")
+                except Exception as e:
+                    st.error(f"No se pudo generar el dossier: {e}")
+    if st.session_state.get("dossier_zip"):
+        fname, data = st.session_state["dossier_zip"]
+        st.download_button("⬇️ Descargar dossier", data=data, file_name=fname,
+                           mime="application/zip", use_container_width=True, key="dl_dossier")
+
+    st.divider()
+
     # --- Restaurar desde backup existente ---
     st.subheader("Restaurar desde backup existente")
     bdir = _bk_dir()